@@ -0,0 +1,60 @@
+import argparse
+import os
+import statistics
+import time
+
+from office_system.db import DatabaseManager
+from benchmarks.common import make_database
+
+PERIODS = [("7 дней", 7), ("30 дней", 30), ("год", 365), ("все время", None)]
+
+
+def timed_ms(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время запросов аналитики по дневным агрегатам")
+    parser.add_argument('--requests', type=int, default=1_000_000)
+    parser.add_argument('--db', help="использовать существующую базу вместо синтетической")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    path = args.db or make_database(requests=args.requests, users=max(args.requests // 500, 1))
+    print(f"база готова за {time.perf_counter() - started:.1f} с")
+    db = DatabaseManager(path)
+    try:
+        conn = db.pool.connection()
+        total = conn.execute("SELECT MAX(id) FROM requests").fetchone()[0] or 0
+        rollups = conn.execute("SELECT COUNT(*) FROM daily_request_stats").fetchone()[0]
+        print(f"заявок: {total:,}, строк в daily_request_stats: {rollups:,}")
+        # Аналитика считается от сегодняшнего дня, а синтетическая история заканчивается раньше.
+        last_day = conn.execute("SELECT MAX(day) FROM daily_request_stats").fetchone()[0]
+        offset = (time.time() - time.mktime(time.strptime(last_day, "%Y-%m-%d"))) // 86400 if last_day else 0
+
+        print(f"{'период':<12} {'время решения, мс':>18} {'очередь, мс':>12} {'техники, мс':>12} {'summary, мс':>12}")
+        worst = 0.0
+        for title, days in PERIODS:
+            days = None if days is None else int(days + offset)
+            row = [timed_ms(lambda: db.analytics.resolution_times(days)),
+                   timed_ms(lambda: db.analytics.backlog(days)),
+                   timed_ms(lambda: db.analytics.technician_throughput(days)),
+                   timed_ms(lambda: db.analytics.summary(days))]
+            worst = max(worst, *row)
+            print(f"{title:<12} {row[0]:>18.2f} {row[1]:>12.2f} {row[2]:>12.2f} {row[3]:>12.2f}")
+        print(f"худший запрос: {worst:.2f} мс")
+    finally:
+        db.close()
+        if not args.db:
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import multiprocessing
+import os
+import time
+from collections import Counter
+
+from office_system.db import DatabaseManager
+from benchmarks.common import make_database
+
+STATUSES = ['Завершена'] * 80 + ['Отклонена'] * 5 + ['В ожидании'] * 15
+
+
+def claimer(path, technician_id, seconds, results):
+    db = DatabaseManager(path)
+    claimed = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        row = db.claim_next_request(technician_id)
+        if row is None:
+            break
+        claimed.append(row[0])
+    db.close()
+    results.put((technician_id, claimed))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Распределение заявок между техниками и одновременный захват «следующей заявки»")
+    parser.add_argument('--requests', type=int, default=1_000_000)
+    parser.add_argument('--technicians', type=int, default=10)
+    parser.add_argument('--claimers', type=int, default=8, help="процессов, одновременно берущих заявки")
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    path = make_database(requests=args.requests, users=max(args.requests // 50, 1), statuses=STATUSES,
+                         technicians=args.technicians)
+    try:
+        db = DatabaseManager(path)
+        technician_ids = [row[0] for row in db.get_all_technicians()]
+        started = time.perf_counter()
+        assigned = db.schedule_requests()
+        elapsed = time.perf_counter() - started
+        print(f"распределено заявок: {assigned:,} за {elapsed * 1000:,.1f} мс")
+        loads = db.technician_loads(db.pool.connection(), technician_ids)
+        print(f"нагрузка на техника: от {min(loads.values())} до {max(loads.values())}")
+        db.close()
+
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=claimer, args=(path, technician_ids[n % len(technician_ids)],
+                                                                     args.seconds, results))
+                     for n in range(args.claimers)]
+        for process in processes:
+            process.start()
+        claims = Counter()
+        total = 0
+        for _ in processes:
+            _, claimed = results.get(timeout=args.seconds + 60)
+            claims.update(claimed)
+            total += len(claimed)
+        for process in processes:
+            process.join()
+        duplicates = [request_id for request_id, count in claims.items() if count > 1]
+        print(f"{args.claimers} процессов: {total / args.seconds:,.0f} захватов/с, "
+              f"заявок взято дважды: {len(duplicates)}")
+        if duplicates:
+            raise SystemExit(1)
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+import argparse
+import os
+import time
+
+from office_system.db import DatabaseManager
+from benchmarks.common import make_database
+
+
+def timed(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Утренний разбор очереди: по одной заявке против пакетных операций")
+    parser.add_argument('--backlog', type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'вариант':<36} {'принять, с':>11} {'завершить, с':>13}")
+    for title, batched in [("по одной (update/resolve_request)", False), ("пакетом, одна транзакция", True)]:
+        path = make_database(requests=args.backlog, users=max(args.backlog // 5, 1), statuses=['В ожидании'])
+        db = DatabaseManager(path)
+        ids = [row[0] for row in db.get_all_active_requests()]
+        resolutions = [(request_id, 10 ** 6 + request_id) for request_id in ids]
+        if batched:
+            accept = timed(lambda: db.update_request_statuses(ids, 'Принята'))
+            complete = timed(lambda: db.resolve_requests(resolutions))
+        else:
+            accept = timed(lambda: [db.update_request_status(request_id, 'Принята') for request_id in ids])
+            complete = timed(lambda: [db.resolve_request(*resolution) for resolution in resolutions])
+        assert not db.get_all_active_requests()
+        db.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        print(f"{title:<36} {accept:>11.3f} {complete:>13.3f}")
+
+
+if __name__ == '__main__':
+    main()
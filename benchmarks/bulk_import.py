@@ -0,0 +1,53 @@
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+
+from office_system.db import DatabaseManager, EQUIPMENT_TYPES, read_equipment_file
+
+
+def write_file(path, rows, duplicates):
+    records = [{'equipment_type': EQUIPMENT_TYPES[i % len(EQUIPMENT_TYPES)], 'inventory_id': i} for i in range(rows)]
+    records += records[:duplicates]
+    if path.endswith('.jsonl'):
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    else:
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['equipment_type', 'inventory_id'])
+            writer.writeheader()
+            writer.writerows(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Скорость массового импорта оборудования (цель: 100k строк/с)")
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--duplicates', type=int, default=1_000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    for fmt in ('csv', 'jsonl'):
+        source = os.path.join(workdir, f'equipment.{fmt}')
+        db_path = os.path.join(workdir, f'{fmt}.db')
+        write_file(source, args.rows, args.duplicates)
+        db = DatabaseManager(db_path)
+        user_id = db.create_user('bulk', 'bulk', 'Импорт', 'bulk@example.com')
+        started = time.perf_counter()
+        imported, errors = db.import_equipment(user_id, read_equipment_file(source))
+        elapsed = time.perf_counter() - started
+        # close() waits for the search index to cover the imported rows.
+        started = time.perf_counter()
+        db.close()
+        indexed = time.perf_counter() - started
+        print(f"{fmt:<6} {imported:>10,} строк  {len(errors):>6,} конфликтов  {elapsed:6.2f} с  "
+              f"{(imported + len(errors)) / elapsed:>10,.0f} строк/с  индекс поиска еще {indexed:.2f} с")
+        for name in os.listdir(workdir):
+            os.remove(os.path.join(workdir, name))
+    os.rmdir(workdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import multiprocessing
+import os
+import statistics
+import time
+
+from office_system.db import DatabaseManager
+from benchmarks.common import free_equipment, make_database
+
+
+def employee(path, count, pause, equipment, committed):
+    db = DatabaseManager(path)
+    for user_id, equipment_id in equipment[:count]:
+        time.sleep(pause)
+        db.create_replacement_request(user_id, equipment_id)
+        committed.put(time.time())
+    db.close()
+
+
+def watch(db, interval, deadline, expected, committed=None):
+    """Повторяет цикл ChangeWatcher без Qt: data_version каждые interval секунд, затем changes_since."""
+    version, seq = db.data_version(), db.latest_change()
+    latencies, polls = [], 0
+    while len(latencies) < expected and time.perf_counter() < deadline:
+        time.sleep(interval)
+        polls += 1
+        current = db.data_version()
+        if current == version:
+            continue
+        version = current
+        seq, changes = db.changes_since(seq)
+        for _, table, _, _, operation in changes or []:
+            if table == 'requests' and operation == 'insert':
+                latencies.append(time.time() - committed.get(timeout=5))
+    return latencies, polls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Задержка появления новой заявки у техника из другого процесса")
+    parser.add_argument('--requests', type=int, default=20)
+    parser.add_argument('--pause', type=float, default=0.5)
+    parser.add_argument('--interval', type=float, default=0.25)
+    parser.add_argument('--idle', type=float, default=5.0, help="секунд простоя для замера стоимости опроса")
+    args = parser.parse_args()
+
+    path = make_database(requests=10_000, users=500)
+    db = DatabaseManager(path)
+    try:
+        started_cpu, started = time.process_time(), time.perf_counter()
+        _, idle_polls = watch(db, args.interval, started + args.idle, expected=1)
+        idle_cpu = time.process_time() - started_cpu
+
+        equipment = [(user_id, equipment_id) for equipment_id, user_id in free_equipment(db)]
+        committed = multiprocessing.Queue()
+        writer = multiprocessing.Process(target=employee, args=(path, args.requests, args.pause, equipment, committed))
+        writer.start()
+        latencies, _ = watch(db, args.interval, time.perf_counter() + args.requests * args.pause + 10, args.requests,
+                             committed)
+        writer.join()
+    finally:
+        db.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    print(f"простой: {idle_polls} опросов за {args.idle:.0f} с, CPU {idle_cpu * 1000:.1f} мс")
+    if latencies:
+        print(f"получено {len(latencies)}/{args.requests} заявок, задержка: "
+              f"медиана {statistics.median(latencies) * 1000:.0f} мс, максимум {max(latencies) * 1000:.0f} мс")
+    else:
+        print("ни одной заявки не получено")
+
+
+if __name__ == '__main__':
+    main()
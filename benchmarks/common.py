@@ -0,0 +1,114 @@
+import os
+import random
+import tempfile
+import time
+from collections import deque
+from datetime import datetime
+
+from office_system.db import (
+    ACTIVE_STATUS_CODES, STATUS_CODES, DatabaseManager, index_equipment, rebuild_request_analytics,
+)
+
+EQUIPMENT_TYPES = ["Монитор", "ПК", "Ноутбук", "Принтер", "Телефон"]
+
+
+DEFAULT_STATUSES = ['Завершена'] * 90 + ['Отклонена'] * 8 + ['В ожидании', 'Принята']
+
+
+def make_database(requests=100_000, users=2_000, equipment_per_user=3, seed=1, path=None,
+                  statuses=DEFAULT_STATUSES, technicians=10):
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+    db = DatabaseManager(path)
+    rnd = random.Random(seed)
+    start = int(datetime(2024, 1, 1).timestamp())
+    with db.transaction() as conn:
+        conn.executemany(
+            'INSERT INTO users (username, password, full_name, email) VALUES (?, ?, ?, ?)',
+            ((f'user{i}', f'user{i}', f'Сотрудник {i}', f'user{i}@example.com') for i in range(users))
+        )
+        conn.executemany(
+            "INSERT INTO users (username, password, full_name, email, role) VALUES (?, ?, ?, ?, 'Техник')",
+            ((f'tech{i}', f'tech{i}', f'Техник {i}', f'tech{i}@example.com') for i in range(technicians))
+        )
+        user_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE role = 'Сотрудник'")]
+        technician_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE role = 'Техник'")]
+        conn.executemany(
+            "INSERT INTO equipment (user_id, equipment_type, inventory_id) VALUES (?, ?, ?)",
+            ((user_id, rnd.choice(EQUIPMENT_TYPES), n) for user_id in user_ids for n in range(equipment_per_user))
+        )
+        index_equipment(conn, "1")
+        equipment = conn.execute("SELECT id, user_id FROM equipment").fetchall()
+
+        def request(i, equipment_id, user_id):
+            status = rnd.choice(statuses)
+            created = start + i * 60
+            resolved = handled_by = None
+            if status != 'В ожидании':
+                resolved = created + int(rnd.expovariate(1 / 36) * 3600)
+                handled_by = rnd.choice(technician_ids)
+            return user_id, equipment_id, STATUS_CODES[status], created, resolved, handled_by
+
+        conn.executemany(
+            "INSERT INTO requests (user_id, equipment_id, status, request_date, resolution_date, handled_by) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (request(i, equipment_id, user_id)
+             for i, (equipment_id, user_id) in enumerate(rnd.choice(equipment) for _ in range(requests)))
+        )
+        conn.execute("UPDATE requests SET assigned_to = handled_by WHERE status = ?", (STATUS_CODES['Принята'],))
+        rebuild_request_analytics(conn)
+    db.close()
+    return path
+
+
+def free_equipment(db, seed=1):
+    """(equipment id, owner id) of every item without an active request, the only ones a request can be filed for,
+    in random order."""
+    rows = db.pool.connection().execute(
+        f"SELECT id, user_id FROM equipment WHERE current_status IS NULL OR current_status NOT IN {ACTIVE_STATUS_CODES}"
+    ).fetchall()
+    random.Random(seed).shuffle(rows)
+    return rows
+
+
+def request_traffic(db, seed=1):
+    """Returns write(n) for workloads that write as long as they run: even calls file a request for free equipment,
+    odd ones reject the oldest request filed, which frees its equipment again."""
+    free = deque(free_equipment(db, seed))
+    filed = deque()
+
+    def write(n):
+        if filed and (n % 2 or not free):
+            request_id, item = filed.popleft()
+            db.update_request_status(request_id, 'Отклонена')
+            free.append(item)
+        else:
+            item = free.popleft()
+            db.create_replacement_request(item[1], item[0])
+            request_id = db.pool.connection().execute(
+                "SELECT current_request_id FROM equipment WHERE id = ?", (item[0],)).fetchone()[0]
+            filed.append((request_id, item))
+    return write
+
+
+def ops_per_sec(fn, seconds=2.0):
+    count = 0
+    deadline = time.perf_counter() + seconds
+    started = time.perf_counter()
+    while time.perf_counter() < deadline:
+        fn(count)
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+
+def report(title, rows):
+    print(title)
+    width = max(len(name) for name, _ in rows)
+    for name, value in rows:
+        print(f"  {name:<{width}}  {value:>12,.0f}")
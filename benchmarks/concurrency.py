@@ -0,0 +1,114 @@
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import time
+
+from office_system.db import DatabaseManager, is_busy_error
+from benchmarks.common import make_database
+
+MODES = {
+    'legacy': dict(journal_mode=None, synchronous='FULL', busy_timeout=0.0, retry_attempts=1),
+    'wal': dict(journal_mode='WAL', synchronous='NORMAL', busy_timeout=5.0),
+}
+
+
+def work(role, path, options, seconds, step, results):
+    ops = errors = 0
+    db = None
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        try:
+            if db is None:
+                db = DatabaseManager(path, **options)
+            ops += step(db)
+        except sqlite3.OperationalError as e:
+            if not is_busy_error(e):
+                raise
+            errors += 1
+    if db is not None:
+        db.close()
+    results.put((role, ops, errors))
+
+
+def employee(path, options, seconds, equipment, results):
+    queue = iter(equipment * 1000)
+
+    def step(db):
+        user_id, equipment_id = next(queue)
+        try:
+            db.create_replacement_request(user_id, equipment_id)
+        except ValueError:
+            # The item's last request is still open; a technician has to get to it first.
+            return 0
+        return 1
+
+    work('employee', path, options, seconds, step, results)
+
+
+def technician(path, options, seconds, worker, results):
+    def step(db):
+        done = 0
+        for row in db.get_active_requests_page(limit=20)[worker::4]:
+            try:
+                if row[4] == 'Принята':
+                    db.resolve_request(row[0], row[3])
+                else:
+                    db.update_request_status(row[0], 'Принята')
+            except ValueError:
+                # Another technician moved it since the page was read.
+                continue
+            done += 1
+        return done
+
+    work('technician', path, options, seconds, step, results)
+
+
+def run(mode, employees, technicians, seconds):
+    # Enough equipment that employees rarely wait for their last request to be handled.
+    path = make_database(requests=10_000, users=5_000)
+    options = MODES[mode]
+    with sqlite3.connect(path) as conn:
+        conn.execute(f"PRAGMA journal_mode = {options['journal_mode'] or 'DELETE'}")
+    setup = DatabaseManager(path, **options)
+    equipment = setup.pool.connection().execute("SELECT user_id, id FROM equipment").fetchall()
+    setup.close()
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=employee, args=(path, options, seconds, equipment[n::employees], results))
+                 for n in range(employees)]
+    processes += [multiprocessing.Process(target=technician, args=(path, options, seconds, n, results))
+                  for n in range(technicians)]
+    for process in processes:
+        process.start()
+    totals = {'employee': [0, 0], 'technician': [0, 0]}
+    for _ in processes:
+        role, ops, errors = results.get(timeout=seconds + 60)
+        totals[role][0] += ops
+        totals[role][1] += errors
+    for process in processes:
+        process.join()
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Нагрузочный тест: N сотрудников создают заявки, M техников их обрабатывают")
+    parser.add_argument('--employees', type=int, default=4)
+    parser.add_argument('--technicians', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+    args = parser.parse_args()
+
+    print(f"{'режим':<8} {'роль':<11} {'операций/с':>11} {'ошибок блокировки':>18} {'доля ошибок':>12}")
+    for mode in args.modes:
+        totals = run(mode, args.employees, args.technicians, args.seconds)
+        for role, (ops, errors) in totals.items():
+            share = errors / (ops + errors) if ops + errors else 0
+            print(f"{mode:<8} {role:<11} {ops / args.seconds:>11,.0f} {errors:>18,} {share:>12.1%}")
+
+
+if __name__ == '__main__':
+    main()
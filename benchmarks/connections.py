@@ -0,0 +1,82 @@
+import argparse
+import os
+import sqlite3
+import time
+
+from office_system.db import STATUS_CODES, DatabaseManager
+from benchmarks.common import make_database, ops_per_sec, report
+
+
+def legacy_get_user_equipment(db_name, user_id):
+    conn = sqlite3.connect(db_name)
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT eq.id, eq.equipment_type, eq.inventory_id,
+               (SELECT r.status FROM requests r
+                WHERE r.equipment_id = eq.id
+                ORDER BY r.id DESC LIMIT 1) as status
+        FROM equipment eq
+        WHERE eq.user_id = ?
+        ORDER BY eq.equipment_type
+    """, (user_id,))
+    items = cursor.fetchall()
+    conn.close()
+    return items
+
+
+def legacy_authenticate_user(db_name, username, password):
+    conn = sqlite3.connect(db_name)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    cursor.execute('SELECT * FROM users WHERE username = ? AND password = ?', (username, password))
+    user = cursor.fetchone()
+    conn.close()
+    return user
+
+
+def legacy_update_request_status(db_name, request_id, new_status):
+    date = int(time.time())
+    conn = sqlite3.connect(db_name)
+    cursor = conn.cursor()
+    cursor.execute("UPDATE requests SET status = ?, resolution_date = ? WHERE id = ?",
+                   (STATUS_CODES[new_status], date, request_id))
+    conn.commit()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Операции в секунду: соединение на каждый вызов против пула")
+    parser.add_argument('--requests', type=int, default=100_000)
+    parser.add_argument('--seconds', type=float, default=2.0)
+    args = parser.parse_args()
+
+    # Only pending requests, as a request can be rejected once: each variant rejects its own half of them, so
+    # --requests has to cover twice what the pool variant gets through in --seconds.
+    path = make_database(requests=args.requests, statuses=['В ожидании'])
+    db = DatabaseManager(path)
+    users = db.pool.connection().execute("SELECT id, username FROM users LIMIT 1000").fetchall()
+    half = args.requests // 2
+    try:
+        scenarios = [
+            ("get_user_equipment",
+             lambda i: legacy_get_user_equipment(path, users[i % len(users)][0]),
+             lambda i: db.get_user_equipment(users[i % len(users)][0])),
+            ("authenticate_user",
+             lambda i: legacy_authenticate_user(path, users[i % len(users)][1], users[i % len(users)][1]),
+             lambda i: db.authenticate_user(users[i % len(users)][1], users[i % len(users)][1])),
+            ("update_request_status",
+             lambda i: legacy_update_request_status(path, i % half + 1, 'Отклонена'),
+             lambda i: db.update_request_status(half + i % half + 1, 'Отклонена')),
+        ]
+        for name, before, after in scenarios:
+            report(f"{name} (ops/sec, {args.requests:,} заявок)", [
+                ("до (connect/close)", ops_per_sec(before, args.seconds)),
+                ("после (пул)", ops_per_sec(after, args.seconds)),
+            ])
+    finally:
+        db.close()
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
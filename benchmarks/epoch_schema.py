@@ -0,0 +1,136 @@
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from office_system.db import MIGRATIONS, DatabaseManager, rebuild_request_analytics, TEXT_SCHEMA_SQL
+from benchmarks.common import DEFAULT_STATUSES, EQUIPMENT_TYPES
+
+LEGACY_VERSION = 6
+LEGACY_ACTIVE_INDEX = (
+    "CREATE INDEX idx_requests_active ON requests (request_date, id, user_id, equipment_id, status) "
+    "WHERE status IN ('В ожидании', 'Принята')"
+)
+LEGACY_ACTIVE_PAGE = """
+    SELECT r.id, u.username, eq.equipment_type, eq.inventory_id, r.status, r.request_date
+    FROM requests r
+    JOIN users u ON r.user_id = u.id
+    JOIN equipment eq ON r.equipment_id = eq.id
+    WHERE r.status IN ('В ожидании', 'Принята') AND (r.request_date, r.id) > (?, ?)
+    ORDER BY r.request_date, r.id
+    LIMIT ?
+"""
+
+
+def make_legacy_database(requests, users, equipment_per_user=3, seed=1):
+    """База в схеме версии 6: даты текстом, статусы строками."""
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    rnd = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("BEGIN")
+    for migration in MIGRATIONS[:LEGACY_VERSION]:
+        migration(conn)
+    conn.execute("DROP INDEX idx_requests_active")
+    conn.execute(LEGACY_ACTIVE_INDEX)
+    conn.executemany(
+        'INSERT INTO users (username, password, full_name, email) VALUES (?, ?, ?, ?)',
+        ((f'user{i}', f'user{i}', f'Сотрудник {i}', f'user{i}@example.com') for i in range(users))
+    )
+    user_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE role = 'Сотрудник'")]
+    conn.executemany(
+        "INSERT INTO equipment (user_id, equipment_type, inventory_id) VALUES (?, ?, ?)",
+        ((user_id, rnd.choice(EQUIPMENT_TYPES), n) for user_id in user_ids for n in range(equipment_per_user))
+    )
+    equipment = conn.execute("SELECT id, user_id FROM equipment").fetchall()
+
+    def request(i, equipment_id, user_id):
+        status = rnd.choice(DEFAULT_STATUSES)
+        created = start + timedelta(minutes=i)
+        resolved = None
+        if status != 'В ожидании':
+            resolved = (created + timedelta(hours=rnd.expovariate(1 / 36))).strftime("%Y-%m-%d %H:%M:%S")
+        return user_id, equipment_id, status, created.strftime("%Y-%m-%d %H:%M:%S"), resolved
+
+    conn.executemany(
+        "INSERT INTO requests (user_id, equipment_id, status, request_date, resolution_date) VALUES (?, ?, ?, ?, ?)",
+        (request(i, equipment_id, user_id)
+         for i, (equipment_id, user_id) in enumerate(rnd.choice(equipment) for _ in range(requests)))
+    )
+    rebuild_request_analytics(conn, TEXT_SCHEMA_SQL)
+    # Рабочая база обрезает журнал изменений при открытии, а не хранит всю историю вставок.
+    conn.execute("DELETE FROM change_log")
+    conn.execute(f"PRAGMA user_version = {LEGACY_VERSION}")
+    conn.execute("COMMIT")
+    conn.close()
+    return path
+
+
+def sizes(path):
+    conn = sqlite3.connect(path)
+    conn.execute("VACUUM")
+    pages = dict(conn.execute("""
+        SELECT CASE WHEN name LIKE 'equipment_search%' THEN 'equipment_search' ELSE name END AS part, SUM(pgsize)
+        FROM dbstat
+        WHERE name IN ('requests', 'equipment', 'idx_requests_active') OR name LIKE 'equipment_search%'
+        GROUP BY part
+    """).fetchall())
+    conn.close()
+    return os.path.getsize(path), pages
+
+
+def page_walk_ms(fetch_page, repeat=5):
+    """Полный проход очереди страницами по 200: так её читает вкладка техника."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows, after = fetch_page(None), None
+        while rows:
+            after = (rows[-1][5], rows[-1][0])
+            rows = fetch_page(after)
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Схема 6 против 7: размер базы и чтение очереди до и после миграции на месте")
+    parser.add_argument('--requests', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    path = make_legacy_database(args.requests, users=max(args.requests // 50, 1))
+    try:
+        before_file, before = sizes(path)
+        conn = sqlite3.connect(path)
+        legacy_ms = page_walk_ms(lambda after: conn.execute(LEGACY_ACTIVE_PAGE, (*(after or ('', 0)), 200)).fetchall())
+        conn.close()
+
+        started = time.perf_counter()
+        db = DatabaseManager(path, query_cache_size=0)
+        migrate_s = time.perf_counter() - started
+        assert db.schema_version() == len(MIGRATIONS)
+        epoch_ms = page_walk_ms(lambda after: db.get_active_requests_page(after))
+        db.close()
+        after_file, after = sizes(path)
+
+        print(f"миграция {args.requests:,} заявок: {migrate_s:.1f} с")
+        print(f"{'':<22} {'версия 6':>12} {'версия 7':>12}")
+        print(f"{'файл, КБ':<22} {before_file // 1024:>12,} {after_file // 1024:>12,}")
+        # The file after migrating also holds the search index of schema 8, shown on its own line.
+        for name in ('requests', 'equipment', 'idx_requests_active', 'equipment_search'):
+            print(f"{name + ', КБ':<22} {before.get(name, 0) // 1024:>12,} {after.get(name, 0) // 1024:>12,}")
+        print(f"{'очередь целиком, мс':<22} {legacy_ms:>12.1f} {epoch_ms:>12.1f}")
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+import argparse
+import os
+import tempfile
+import time
+
+from office_system.db import DatabaseManager
+from benchmarks.common import make_database, rss_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Выгрузка истории заявок: скорость и память при росте объема")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 400_000, 1_000_000])
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'заявок':>10} {'формат':>7} {'строк/с':>10} {'файл, МБ':>9} {'прирост RSS, МБ':>16}")
+    for size in args.sizes:
+        path = make_database(requests=size, users=max(size // 50, 1))
+        db = DatabaseManager(path)
+        for extension in ('.csv', '.xlsx'):
+            fd, target = tempfile.mkstemp(suffix=extension)
+            os.close(fd)
+            baseline = peak = rss_mb()
+
+            def progress(exported):
+                nonlocal peak
+                peak = max(peak, rss_mb())
+
+            started = time.perf_counter()
+            exported = db.export_request_history(target, chunk_size=args.chunk_size, progress=progress)
+            elapsed = time.perf_counter() - started
+            assert exported == size
+            print(f"{size:>10,} {extension[1:]:>7} {exported / elapsed:>10,.0f} "
+                  f"{os.path.getsize(target) / 2 ** 20:>9.1f} {peak - baseline:>16.1f}")
+            os.remove(target)
+        db.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == '__main__':
+    main()
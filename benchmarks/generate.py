@@ -0,0 +1,205 @@
+import argparse
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from office_system.db import (ASSIGNMENT_INDEXES, INDEXES, STATUS_ACCEPTED, STATUS_DONE, STATUS_PENDING,
+                              STATUS_REJECTED, DatabaseManager, add_change_log, create_current_status_triggers,
+                              create_request_stats_triggers, index_equipment, rebuild_request_analytics)
+
+MALE_NAMES = [("Александр", "aleksandr"), ("Дмитрий", "dmitry"), ("Иван", "ivan"), ("Сергей", "sergey"),
+              ("Андрей", "andrey"), ("Алексей", "aleksey"), ("Михаил", "mikhail"), ("Николай", "nikolay"),
+              ("Павел", "pavel"), ("Владимир", "vladimir"), ("Егор", "egor"), ("Артем", "artem")]
+FEMALE_NAMES = [("Анна", "anna"), ("Елена", "elena"), ("Ольга", "olga"), ("Мария", "maria"), ("Наталья", "natalia"),
+                ("Татьяна", "tatiana"), ("Ирина", "irina"), ("Екатерина", "ekaterina"), ("Светлана", "svetlana"),
+                ("Юлия", "yulia"), ("Дарья", "daria"), ("Ксения", "ksenia")]
+SURNAMES = [("Иванов", "ivanov"), ("Смирнов", "smirnov"), ("Кузнецов", "kuznetsov"), ("Попов", "popov"),
+            ("Васильев", "vasiliev"), ("Петров", "petrov"), ("Соколов", "sokolov"), ("Михайлов", "mikhailov"),
+            ("Новиков", "novikov"), ("Федоров", "fedorov"), ("Морозов", "morozov"), ("Волков", "volkov"),
+            ("Алексеев", "alekseev"), ("Лебедев", "lebedev"), ("Семенов", "semenov"), ("Егоров", "egorov"),
+            ("Павлов", "pavlov"), ("Козлов", "kozlov"), ("Степанов", "stepanov"), ("Николаев", "nikolaev")]
+# Share of the fleet and median hours from acceptance to replacement, per equipment type.
+EQUIPMENT_MIX = {"ПК": (30, 30), "Монитор": (30, 12), "Ноутбук": (20, 40), "Принтер": (8, 20), "Телефон": (12, 8)}
+ACCEPT_HOURS = 4
+REJECT_HOURS = 1
+REJECT_SHARE = 0.07
+SPECIALIST_SHARE = 0.6
+WORKDAY_START, WORKDAY_SECONDS = 9 * 3600, 9 * 3600
+PASSWORD = 'password'
+# Requests are inserted without these; the triggers' tables are rebuilt and the indexes built once at the end.
+REQUEST_TRIGGERS = [f"trg_requests_{kind}_{event}" for kind in ('current', 'log', 'stats')
+                    for event in ('insert', 'update', 'delete')]
+REQUEST_INDEXES = {name: sql for name, sql in {**INDEXES, **ASSIGNMENT_INDEXES}.items() if ' ON requests ' in sql}
+
+
+def count(text):
+    """Parses a row count such as 50000, 10k or 2.5M."""
+    multiplier = {'k': 10 ** 3, 'm': 10 ** 6}.get(text[-1:].lower(), 1)
+    return int(float(text[:-1] if multiplier > 1 else text) * multiplier)
+
+
+def person(rnd, i):
+    first_names, suffix = (MALE_NAMES, '') if rnd.random() < 0.5 else (FEMALE_NAMES, 'а')
+    first, first_latin = rnd.choice(first_names)
+    surname, surname_latin = rnd.choice(SURNAMES)
+    username = f"{surname_latin}{'a' if suffix else ''}.{first_latin[0]}{i}"
+    return username, f"{surname}{suffix} {first}", f"{username}@example.com"
+
+
+def workday_starts(days, today):
+    starts = []
+    for offset in range(days, 0, -1):
+        day = today - timedelta(days=offset)
+        if day.weekday() < 5:
+            starts.append(int(time.mktime(day.timetuple())) + WORKDAY_START)
+    return starts
+
+
+def request_rows(rnd, count, equipment, technicians, days, now):
+    """Yields requests in creation order, spread over working hours of the last `days` days.
+
+    A request's status follows from its age: it is accepted after a lognormal wait and replaced after a
+    lognormal repair time of its equipment type, so the pending and accepted ones are the most recent.
+    """
+    starts = workday_starts(days, date.fromtimestamp(now))
+    work_seconds = len(starts) * WORKDAY_SECONDS
+    specialists = {}
+    for i, technician_id in enumerate(technicians):
+        specialists.setdefault(list(EQUIPMENT_MIX)[i % len(EQUIPMENT_MIX)], []).append(technician_id)
+    for i in range(count):
+        offset = (i + rnd.random()) * work_seconds / count
+        created = starts[int(offset // WORKDAY_SECONDS)] + int(offset % WORKDAY_SECONDS)
+        # Some equipment breaks far more often than the rest.
+        equipment_id, user_id, equipment_type = equipment[int(len(equipment) * rnd.random() ** 2)]
+        candidates = specialists.get(equipment_type)
+        if not candidates or rnd.random() >= SPECIALIST_SHARE:
+            candidates = technicians
+        technician_id = rnd.choice(candidates)
+        status, resolved, handled_by, assigned_to = STATUS_PENDING, None, None, None
+        if rnd.random() < REJECT_SHARE:
+            decided = created + int(rnd.lognormvariate(math.log(REJECT_HOURS), 1.0) * 3600)
+            if decided <= now:
+                status, resolved, handled_by = STATUS_REJECTED, decided, technician_id
+        else:
+            accepted = created + int(rnd.lognormvariate(math.log(ACCEPT_HOURS), 1.0) * 3600)
+            done = accepted + int(rnd.lognormvariate(math.log(EQUIPMENT_MIX[equipment_type][1]), 0.8) * 3600)
+            if done <= now:
+                status, resolved, handled_by, assigned_to = STATUS_DONE, done, technician_id, technician_id
+            elif accepted <= now:
+                status, resolved, handled_by, assigned_to = STATUS_ACCEPTED, accepted, technician_id, technician_id
+        yield user_id, equipment_id, status, created, resolved, handled_by, assigned_to
+
+
+def generate_database(path, requests, users=None, technicians=None, equipment_per_user=3, days=730, seed=1,
+                      chunk_size=100_000, now=None, progress=None):
+    """Fills a new database at path with users, equipment and requests; the same seed gives the same rows.
+
+    `now` defaults to the start of today, so two runs on the same day produce the same rows; only the
+    password salt differs.
+    """
+    users = users or max(requests // 50, 10)
+    technicians = technicians or max(users // 250, 3)
+    now = now or int(time.mktime(date.today().timetuple()))
+    rnd = random.Random(seed)
+    db = DatabaseManager(path)
+    try:
+        password_hash = db.hasher.hash(PASSWORD)
+        with db.transaction() as conn:
+            for trigger in REQUEST_TRIGGERS:
+                conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            for index in REQUEST_INDEXES:
+                conn.execute(f"DROP INDEX IF EXISTS {index}")
+            conn.executemany(
+                "INSERT INTO users (username, full_name, email, role, password) VALUES (?, ?, ?, ?, ?)",
+                ((*person(rnd, i), role, password_hash)
+                 for i, role in enumerate(['Техник'] * technicians + ['Сотрудник'] * users))
+            )
+            user_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE role = 'Сотрудник'")]
+            technician_ids = [row[0] for row in conn.execute(
+                "SELECT id FROM users WHERE role = 'Техник' AND username != 'admin' ORDER BY id")]
+            types, weights = list(EQUIPMENT_MIX), [share for share, _ in EQUIPMENT_MIX.values()]
+            inventory_ids = itertools.count(100_000)
+
+            def user_equipment(user_id):
+                for equipment_type in rnd.choices(types, weights, k=max(1, round(rnd.gauss(equipment_per_user, 1)))):
+                    yield user_id, equipment_type, next(inventory_ids)
+
+            conn.executemany("INSERT INTO equipment (user_id, equipment_type, inventory_id) VALUES (?, ?, ?)",
+                             itertools.chain.from_iterable(map(user_equipment, user_ids)))
+            equipment = conn.execute("SELECT id, user_id, equipment_type FROM equipment").fetchall()
+        rnd.shuffle(equipment)
+
+        rows = request_rows(rnd, requests, equipment, technician_ids, days, now)
+        written = 0
+        while written < requests:
+            chunk = [row for _, row in zip(range(chunk_size), rows)]
+            with db.transaction() as conn:
+                conn.executemany(
+                    "INSERT INTO requests (user_id, equipment_id, status, request_date, resolution_date, handled_by, "
+                    "assigned_to) VALUES (?, ?, ?, ?, ?, ?, ?)", chunk
+                )
+            written += len(chunk)
+            if progress:
+                progress(written)
+
+        with db.transaction() as conn:
+            for sql in REQUEST_INDEXES.values():
+                conn.execute(sql)
+            create_current_status_triggers(conn)
+            add_change_log(conn)
+            create_request_stats_triggers(conn)
+            db.repair_current_status()
+            rebuild_request_analytics(conn)
+            index_equipment(conn, "1")
+            # A new database has no history for a running client to catch up on.
+            conn.execute("DELETE FROM change_log")
+        return {'users': users, 'technicians': technicians, 'equipment': len(equipment), 'requests': requests}
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Генератор синтетической базы: пользователи, оборудование и заявки с реалистичными статусами")
+    parser.add_argument('path', help="файл новой базы")
+    parser.add_argument('--requests', type=count, default=count('100k'), help="число заявок: 10k ... 10M")
+    parser.add_argument('--users', type=count, help="сотрудников; по умолчанию заявок / 50")
+    parser.add_argument('--technicians', type=int, help="техников; по умолчанию сотрудников / 250, не меньше 3")
+    parser.add_argument('--equipment-per-user', type=float, default=3)
+    parser.add_argument('--days', type=int, default=730, help="за сколько дней до сегодняшнего создаются заявки")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument('--force', action='store_true', help="перезаписать существующий файл")
+    args = parser.parse_args()
+
+    if os.path.exists(args.path):
+        if not args.force:
+            parser.error(f"{args.path} уже существует, укажите --force")
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(args.path + suffix):
+                os.remove(args.path + suffix)
+    started = time.perf_counter()
+
+    def progress(written):
+        print(f"\rЗаявок записано: {written:,}", end='', file=sys.stderr)
+
+    try:
+        sizes = generate_database(args.path, args.requests, args.users, args.technicians, args.equipment_per_user,
+                                  args.days, args.seed, args.chunk_size, progress=progress)
+    except BaseException:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(args.path + suffix):
+                os.remove(args.path + suffix)
+        raise
+    print(file=sys.stderr)
+    print(f"{args.path}: {sizes['users']:,} сотрудников, {sizes['technicians']} техников, "
+          f"{sizes['equipment']:,} единиц оборудования, {sizes['requests']:,} заявок "
+          f"за {time.perf_counter() - started:,.0f} с; пароль всех пользователей: {PASSWORD}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import make_database, rss_mb
+
+ACTIVE = ['В ожидании', 'Принята']
+
+
+def legacy_list(db):
+    from PyQt6.QtCore import QSize
+    from PyQt6.QtWidgets import QHBoxLayout, QLabel, QLineEdit, QListWidget, QListWidgetItem, QPushButton, \
+        QVBoxLayout, QWidget
+    view = QListWidget()
+    for req_data in db.get_all_active_requests():
+        row = QWidget()
+        main_layout, info_layout, action_layout = QVBoxLayout(row), QHBoxLayout(), QHBoxLayout()
+        info_label = QLabel(f"<b>{req_data[1]}</b>: {req_data[2]} (ID: {req_data[3]})")
+        info_label.setStyleSheet("color: #000000; background-color: transparent; font-size: 11pt;")
+        info_layout.addWidget(info_label)
+        for text, color in [("Принять", "#27ae60"), ("Отклонить", "#c0392b"), ("Завершить", "#2980b9")]:
+            button = QPushButton(text)
+            button.setStyleSheet(f"background-color: {color}; color: white; padding: 5px; border-radius: 3px;")
+            action_layout.addWidget(button)
+        new_id_input = QLineEdit()
+        new_id_input.setStyleSheet("background-color: #ffffff; color: #000000; padding: 5px; border-radius: 3px;")
+        new_id_input.hide()
+        action_layout.addWidget(new_id_input)
+        main_layout.addLayout(info_layout)
+        main_layout.addLayout(action_layout)
+        item = QListWidgetItem()
+        item.setSizeHint(QSize(0, 70))
+        view.addItem(item)
+        view.setItemWidget(item, row)
+    return view
+
+
+def model_view_list(db):
+    from PyQt6.QtWidgets import QApplication
+    from office_system.ui.tasks import DbExecutor
+    from office_system.ui.tech_support import TechSupportWidget
+    executor = DbExecutor()
+    widget = TechSupportWidget(db, executor)
+    widget.load_content()
+    while widget.pending:
+        executor.thread_pool.waitForDone(5)
+        QApplication.processEvents()
+    return widget
+
+
+def run_case(case, path):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    from office_system.db import DatabaseManager
+    from office_system.ui.theme import apply_theme
+    app = QApplication([])
+    apply_theme(app)
+    db = DatabaseManager(path)
+    rss_before = rss_mb()
+    started = time.perf_counter()
+    widget = (legacy_list if case == 'legacy' else model_view_list)(db)
+    widget.resize(700, 600)
+    widget.show()
+    app.processEvents()
+    elapsed = time.perf_counter() - started
+    print(json.dumps({'seconds': elapsed, 'rss_mb': rss_mb() - rss_before}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время отрисовки и RSS списка заявок техника")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--legacy-max', type=int, default=10_000,
+                        help="не запускать QListWidget + setItemWidget на списках длиннее")
+    parser.add_argument('--case', choices=['legacy', 'model'], help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.case:
+        run_case(args.case, args.db)
+        return
+
+    print(f"{'строк':>8}  {'вариант':<24}  {'время, с':>9}  {'RSS, МБ':>8}")
+    for rows in args.rows:
+        path = make_database(requests=rows, users=max(rows // 20, 1), statuses=ACTIVE)
+        try:
+            for case, title in [('legacy', 'QListWidget + виджеты'), ('model', 'QListView + делегат')]:
+                if case == 'legacy' and rows > args.legacy_max:
+                    continue
+                output = subprocess.run([sys.executable, '-m', 'benchmarks.list_views', '--case', case, '--db', path],
+                                        check=True, capture_output=True, text=True).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                print(f"{rows:>8,}  {title:<24}  {result['seconds']:>9.2f}  {result['rss_mb']:>8.1f}")
+        finally:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from office_system.db import DatabaseManager
+
+SCREEN_MODULES = ['office_system.ui.employee', 'office_system.ui.tech_support', 'office_system.ui.tech_admin']
+
+
+def run_case(case, path, spawned):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    from office_system.ui.main_window import SCREENS, MainWindow
+    from office_system.ui.tasks import DbExecutor
+    from office_system.ui.theme import apply_theme
+    app = QApplication([])
+    apply_theme(app)
+    window = MainWindow(DatabaseManager(path), DbExecutor())
+    if case == 'eager':
+        # Как было до ленивых экранов: все экраны строятся до показа формы входа.
+        for name in SCREENS:
+            window.screen(name)
+    window.show()
+    app.processEvents()
+    print(json.dumps({'seconds': time.time() - spawned,
+                      'screens_imported': [name for name in SCREEN_MODULES if name in sys.modules]}))
+
+
+def import_times(stderr):
+    """Собственное время импорта по пакетам из вывода -X importtime, мс."""
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, _, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        totals[package] = totals.get(package, 0) + int(own) / 1000
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время до появления формы входа и импорт модулей по -X importtime")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--case', choices=['lazy', 'eager'], help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    parser.add_argument('--spawned', type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.case:
+        run_case(args.case, args.db, args.spawned)
+        return
+
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    DatabaseManager(path).close()
+    print(f"{'вариант':<26} {'до формы входа, мс':>19} {'импорт, мс':>11} {'PyQt6, мс':>10} {'office_system, мс':>18}")
+    try:
+        for case, title in [('eager', 'все экраны сразу'), ('lazy', 'экраны по требованию')]:
+            runs = []
+            for _ in range(args.repeat):
+                command = [sys.executable, '-X', 'importtime', '-m', 'benchmarks.login_window',
+                           '--case', case, '--db', path, '--spawned', str(time.time())]
+                done = subprocess.run(command, check=True, capture_output=True, text=True)
+                result = json.loads(done.stdout.strip().splitlines()[-1])
+                runs.append((result['seconds'], import_times(done.stderr), result['screens_imported']))
+            seconds, imports, screens = min(runs, key=lambda run: run[0])
+            print(f"{title:<26} {seconds * 1000:>19.0f} {sum(imports.values()):>11.0f} "
+                  f"{imports.get('PyQt6', 0):>10.0f} {imports.get('office_system', 0):>18.0f}")
+            if case == 'lazy' and screens:
+                print(f"  форма входа импортировала экраны: {', '.join(screens)}")
+                sys.exit(1)
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from office_system.db import DatabaseManager, PasswordHasher
+
+SETTINGS = [
+    ('pbkdf2_sha256', 50_000),
+    ('pbkdf2_sha256', 200_000),
+    ('pbkdf2_sha256', 600_000),
+    ('scrypt', 2 ** 14),
+    ('scrypt', 2 ** 15),
+]
+
+
+def logins_per_sec(db, users, seconds, threads):
+    deadline = time.perf_counter() + seconds
+
+    def worker(offset):
+        count = 0
+        while time.perf_counter() < deadline:
+            username = users[(offset + count) % len(users)]
+            assert db.authenticate_user(username, username) is not None
+            count += 1
+        return count
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        total = sum(pool.map(worker, range(threads)))
+    return total / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Входов в секунду при разной стоимости KDF")
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'алгоритм':<15} {'стоимость':>10} {'хеш, мс':>8} {'входов/с без кэша':>18} {'с кэшем':>10}")
+    for algorithm, cost in SETTINGS:
+        hasher = PasswordHasher(algorithm, cost)
+        started = time.perf_counter()
+        hasher.hash('probe')
+        hash_ms = (time.perf_counter() - started) * 1000
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        users = [f'user{i}' for i in range(args.users)]
+        rates = []
+        for cache_size in (0, 256):
+            db = DatabaseManager(path, password_hasher=hasher, auth_cache_size=cache_size)
+            for username in users:
+                db.create_user(username, username, username, f'{username}@example.com')
+                if cache_size:
+                    db.authenticate_user(username, username)
+            rates.append(logins_per_sec(db, users, args.seconds, args.threads))
+            db.pool.connection().execute("DELETE FROM users WHERE username != 'admin'")
+            db.close()
+        os.remove(path)
+        print(f"{algorithm:<15} {cost:>10,} {hash_ms:>8.1f} {rates[0]:>18,.0f} {rates[1]:>10,.0f}")
+
+
+if __name__ == '__main__':
+    main()
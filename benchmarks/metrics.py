@@ -0,0 +1,84 @@
+import argparse
+import os
+import random
+import shutil
+import time
+
+from office_system.db import DatabaseManager
+from office_system.metrics import Metrics
+from benchmarks.common import make_database, report, request_traffic
+
+
+def workload(db, args):
+    user_ids = [row[0] for row in db.pool.connection().execute("SELECT id FROM users WHERE role = 'Сотрудник'")]
+    technician_id = db.get_all_technicians()[0][0]
+    write = request_traffic(db)
+    rnd = random.Random(1)
+
+    def switch(n):
+        if n % args.write_every == 0:
+            write(n // args.write_every)
+        db.get_user_equipment(rnd.choice(user_ids))
+        db.get_all_technicians()
+        db.get_active_requests_page()
+        db.get_assigned_requests(technician_id)
+        db.latest_change()
+    return switch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Цена включённых метрик на типичной смене экранов")
+    parser.add_argument('--requests', type=int, default=100_000)
+    parser.add_argument('--users', type=int, default=2_000)
+    parser.add_argument('--write-every', type=int, default=20, help="одна запись на N чтений")
+    parser.add_argument('--seconds', type=float, default=20.0, help="на каждый вариант")
+    parser.add_argument('--slice', type=float, default=0.1,
+                        help="варианты сменяют друг друга так часто, чтобы помехи машины делились между ними поровну")
+    args = parser.parse_args()
+
+    path = make_database(requests=args.requests, users=args.users)
+    copies = [f"{path}.{enabled}" for enabled in (False, True)]
+    rows = []
+    try:
+        for title, cache_size in [("без кэша запросов", 0), ("с кэшем запросов", 512)]:
+            # The workload writes, so each variant runs on its own fresh copy of the same database.
+            runs = []
+            for copy, enabled in zip(copies, (False, True)):
+                shutil.copyfile(path, copy)
+                db = DatabaseManager(copy, query_cache_size=cache_size, metrics=Metrics() if enabled else None)
+                runs.append((db, workload(db, args)))
+            # Counted in CPU time of this thread: metrics cost CPU, and the checkpoints' fsync waits only add noise.
+            done, spent = [0, 0], [0.0, 0.0]
+            for n in range(int(args.seconds / args.slice)):
+                for i in (0, 1) if n % 2 else (1, 0):
+                    switch = runs[i][1]
+                    started = time.thread_time()
+                    deadline = time.perf_counter() + args.slice
+                    while time.perf_counter() < deadline:
+                        switch(done[i])
+                        done[i] += 1
+                    spent[i] += time.thread_time() - started
+            for db, _ in runs:
+                db.close()
+            plain, measured = done[0] / spent[0], done[1] / spent[1]
+            rows.append((f"{title}, без метрик, переключений/с", plain))
+            rows.append((f"{title}, с метриками, переключений/с", measured))
+            rows.append((f"{title}, накладные расходы, %", (plain / measured - 1) * 100))
+
+        metrics = Metrics()
+        timed = metrics.timed('noop', lambda: None)
+        calls = 200_000
+        started = time.perf_counter()
+        for _ in range(calls):
+            timed()
+        rows.append(("обёртка на один вызов, мкс", (time.perf_counter() - started) / calls * 1e6))
+    finally:
+        for name in (path, *copies):
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(name + suffix):
+                    os.remove(name + suffix)
+    report(f"{args.requests:,} заявок, {args.users} пользователей, запись раз в {args.write_every} чтений", rows)
+
+
+if __name__ == '__main__':
+    main()
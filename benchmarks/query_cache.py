@@ -0,0 +1,47 @@
+import argparse
+import os
+import random
+
+from office_system.db import DatabaseManager
+from benchmarks.common import make_database, ops_per_sec, report, request_traffic
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Переключения экранов с кэшем результатов запросов и без него")
+    parser.add_argument('--requests', type=int, default=100_000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--write-every', type=int, default=20, help="одна запись на N чтений")
+    parser.add_argument('--seconds', type=float, default=2.0)
+    args = parser.parse_args()
+
+    path = make_database(requests=args.requests, users=args.users)
+    rows = []
+    try:
+        for title, size in [("без кэша", 0), ("с кэшем", 512)]:
+            db = DatabaseManager(path, query_cache_size=size)
+            user_ids = [row[0] for row in db.pool.connection().execute("SELECT id FROM users WHERE username != 'admin'")]
+            write = request_traffic(db)
+            rnd = random.Random(1)
+
+            def switch(n):
+                if n % args.write_every == 0:
+                    write(n // args.write_every)
+                db.get_user_equipment(rnd.choice(user_ids))
+                db.get_all_technicians()
+                db.get_active_requests_page()
+
+            rows.append((f"{title}, переключений/с", ops_per_sec(switch, args.seconds)))
+            if size:
+                stats = db.cache_stats()
+                rows.append(("попаданий, %", stats['hit_rate'] * 100))
+                rows.append(("инвалидаций", stats['invalidations']))
+            db.close()
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    report(f"{args.requests:,} заявок, {args.users} пользователей, запись раз в {args.write_every} чтений", rows)
+
+
+if __name__ == '__main__':
+    main()
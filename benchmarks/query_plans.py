@@ -0,0 +1,155 @@
+import argparse
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+from datetime import date, datetime
+
+from office_system.db import STATUS_PENDING, DatabaseManager
+from benchmarks.common import free_equipment, make_database
+
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+# Tables that stay small whatever the amount of data, so reading them whole is the cheapest plan: the bucket bounds,
+# the queue of import ranges still to index and one rollup row per month and equipment type.
+SMALL_TABLES = {'resolution_buckets', 'search_backlog', 'monthly_request_stats'}
+
+
+# Methods left unchecked, each for a reason; every other public DatabaseManager method needs a case below.
+NOT_CHECKED = {
+    'transaction', 'close', 'cache_stats', 'forget_changes', 'data_version',  # no query of their own
+    'batch',  # runs other methods
+    'migrate',  # schema changes, once per version
+    'rebuild_analytics', 'check_current_status', 'repair_current_status',  # maintenance that reads every row
+}
+
+
+def exercise(db, workdir):
+    conn = db.pool.connection()
+    equipment_id, user_id = free_equipment(db)[0]
+    username, password = conn.execute("SELECT username, password FROM users WHERE id = ?", (user_id,)).fetchone()
+    request_id, *batch_ids = [row[0] for row in conn.execute(
+        "SELECT id FROM requests WHERE status = ? ORDER BY id DESC LIMIT 3", (STATUS_PENDING,))]
+    technician_id = conn.execute("SELECT id FROM users WHERE role = 'Техник' AND username != 'admin' LIMIT 1").fetchone()[0]
+    technician = 'tech_plan_check'
+    equipment_ids = [row[0] for row in conn.execute("SELECT id FROM equipment WHERE user_id = ?", (user_id,))]
+    latest = db.latest_change()
+    start, end = date(2024, 6, 1), date(2024, 6, 7)
+    return [
+        ("schema_version", lambda: db.schema_version()),
+        ("create_user", lambda: db.create_user(technician, 'x', 'Техник', 'tech_plan@example.com', role='Техник')),
+        ("insert_user", lambda: db.insert_user('user_plan_check', 'x', 'Сотрудник', 'user_plan@example.com', 'Сотрудник')),
+        ("get_user_by_username", lambda: db.get_user_by_username(username)),
+        ("authenticate_user", lambda: db.authenticate_user(username, password)),
+        ("update_password_hash", lambda: db.update_password_hash(user_id, password, password)),
+        ("add_equipment", lambda: db.add_equipment(user_id, 'ПК', 10 ** 9)),
+        ("import_equipment", lambda: db.import_equipment(user_id, enumerate([('ПК', 10 ** 9 + 10)]))),
+        ("insert_equipment_chunk", lambda: db.insert_equipment_chunk(user_id, [(1, 'ПК', 10 ** 9 + 11)])),
+        # The indexer thread's work after an import, run here so that its statements are traced.
+        ("index_search_slice", lambda: db._index_search_slice()),
+        ("get_equipment", lambda: db.get_equipment(equipment_id)),
+        ("get_equipment_rows", lambda: db.get_equipment_rows(equipment_ids)),
+        ("get_user_equipment", lambda: db.get_user_equipment(user_id)),
+        ("equipment_owners", lambda: db.equipment_owners(conn, equipment_ids)),
+        ("create_replacement_request", lambda: db.create_replacement_request(user_id, equipment_id)),
+        ("get_request", lambda: db.get_request(request_id)),
+        ("get_requests", lambda: db.get_requests([request_id, *batch_ids])),
+        ("request_owners", lambda: db.request_owners(conn, "r.id = ?", (request_id,))),
+        ("get_all_active_requests", lambda: db.get_all_active_requests()),
+        ("get_active_requests_page", lambda: db.get_active_requests_page((int(datetime(2024, 6, 1).timestamp()), 0))),
+        ("search_equipment", lambda: db.search_equipment(user_id, 'мон')),
+        ("search_equipment:words", lambda: db.search_equipment(user_id, 'пк 1')),
+        ("search_active_requests", lambda: db.search_active_requests(username)),
+        ("search_active_requests:words", lambda: db.search_active_requests(f'пк {username}')),
+        ("technician_loads", lambda: db.technician_loads(conn, [technician_id])),
+        ("technician_affinity", lambda: db.technician_affinity(conn, [technician_id], 0)),
+        ("schedule_requests", lambda: db.schedule_requests()),
+        ("get_assigned_requests", lambda: db.get_assigned_requests(technician_id)),
+        ("claim_next_request", lambda: db.claim_next_request(technician_id)),
+        ("update_request_status", lambda: db.update_request_status(request_id, 'Принята')),
+        ("resolve_request", lambda: db.resolve_request(request_id, 10 ** 9 + 1)),
+        ("update_request_statuses", lambda: db.update_request_statuses(batch_ids, 'Принята')),
+        ("resolve_requests", lambda: db.resolve_requests([(i, 10 ** 9 + 2 + n) for n, i in enumerate(batch_ids)])),
+        ("latest_change", lambda: db.latest_change()),
+        ("changes_since", lambda: db.changes_since(latest)),
+        ("prune_changes", lambda: db.prune_changes()),
+        ("iter_request_history", lambda: sum(len(chunk) for chunk in db.iter_request_history(start, end))),
+        ("export_request_history", lambda: db.export_request_history(os.path.join(workdir, 'history.csv'), start, end)),
+        ("analytics.summary", lambda: db.analytics.summary(30)),
+        ("analytics.summary:all", lambda: db.analytics.summary()),
+        ("get_all_technicians", lambda: db.get_all_technicians()),
+        ("delete_equipment", lambda: db.delete_equipment(equipment_id)),
+        ("delete_user", lambda: db.delete_user(user_id)),
+    ]
+
+
+def capture_statements(db, fn):
+    statements = []
+    conn = db.pool.connection()
+    conn.set_trace_callback(statements.append)
+    try:
+        fn()
+    finally:
+        conn.set_trace_callback(None)
+    return [sql for sql in dict.fromkeys(statements)
+            if not re.match(r'\s*(--|BEGIN|COMMIT|ROLLBACK|PRAGMA|SAVEPOINT|RELEASE)', sql, re.I)]
+
+
+def check(db, cases):
+    conn = db.pool.connection()
+    failures = []
+    for name, fn in cases:
+        for sql in capture_statements(db, fn):
+            plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+            # A subquery is read whole by the query around it; its own tables have lines of their own.
+            subqueries = {line.split()[-1] for line in plan if line.startswith(('CO-ROUTINE ', 'MATERIALIZE '))}
+            scans = [line for line in plan
+                     if (match := FULL_SCAN.match(line)) and match.group(1) not in subqueries | SMALL_TABLES]
+            status = "FAIL" if scans else "ok"
+            print(f"[{status}] {name}: {' | '.join(plan) or '-'}")
+            if scans:
+                failures.append((name, sql, scans))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Проверка EXPLAIN QUERY PLAN: ни один запрос DatabaseManager не должен сканировать таблицу целиком")
+    parser.add_argument('--requests', type=int, default=1_000_000)
+    parser.add_argument('--db', help="проверить копию существующей базы вместо синтетической")
+    args = parser.parse_args()
+
+    if args.db:
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        with sqlite3.connect(args.db) as source, sqlite3.connect(path) as target:
+            source.backup(target)
+    else:
+        path = make_database(requests=args.requests, users=args.requests // 50)
+    db = DatabaseManager(path)
+    workdir = tempfile.mkdtemp()
+    try:
+        cases = exercise(db, workdir)
+        covered = {name.split(':')[0] for name, _ in cases}
+        public = {name for name, value in vars(DatabaseManager).items() if callable(value) and not name.startswith('_')}
+        missing = sorted(public - covered - NOT_CHECKED)
+        if missing:
+            parser.error(f"не проверены планы методов DatabaseManager: {', '.join(missing)}")
+        failures = check(db, cases)
+    finally:
+        db.close()
+        shutil.rmtree(workdir)
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    if failures:
+        print(f"\n{len(failures)} запрос(ов) с полным сканированием таблицы:")
+        for name, sql, scans in failures:
+            print(f"  {name}: {', '.join(scans)}\n    {' '.join(sql.split())}")
+        sys.exit(1)
+    print("\nПолных сканирований нет.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import os
+import random
+import statistics
+import time
+
+from office_system.db import DatabaseManager
+from benchmarks.common import make_database
+
+QUERIES = ['мон', 'ноут user1', 'п', 'user{n}', 'Сотрудник {n}', 'user{n}@example', '{n}', 'example.com']
+
+
+def timings(fn, queries, repeat):
+    samples = []
+    for _ in range(repeat):
+        for query in queries:
+            started = time.perf_counter()
+            fn(query)
+            samples.append(((time.perf_counter() - started) * 1000, query))
+    samples.sort()
+    return statistics.median(ms for ms, _ in samples), samples[int(len(samples) * 0.95)][0], samples[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Полнотекстовый поиск: задержка type-ahead запросов на большой базе")
+    parser.add_argument('--equipment', type=int, default=1_000_000)
+    parser.add_argument('--requests', type=int, default=1_000_000)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    users = max(args.equipment // 3, 1)
+    path = make_database(requests=args.requests, users=users)
+    db = DatabaseManager(path)
+    rnd = random.Random(1)
+    user_ids = [row[0] for row in db.pool.connection().execute("SELECT id FROM users WHERE username != 'admin'")]
+    # Every prefix of a query, as it arrives while the user types it.
+    queries = [query.format(n=rnd.randrange(users)) for query in QUERIES]
+    typed = [query[:i] for query in queries for i in range(1, len(query) + 1) if query[:i].strip()]
+    try:
+        print(f"{args.equipment:,} единиц оборудования, {args.requests:,} заявок, "
+              f"{len(typed)} запросов по мере ввода, лимит {args.limit}")
+        print(f"{'запрос':<28} {'медиана, мс':>12} {'p95, мс':>9} {'макс, мс':>9}  самый медленный ввод")
+        for title, fn in [
+            ("search_active_requests", lambda text: db.search_active_requests(text, args.limit)),
+            ("search_equipment", lambda text: db.search_equipment(rnd.choice(user_ids), text, args.limit)),
+        ]:
+            median, p95, (worst, slowest) = timings(fn, typed, args.repeat)
+            print(f"{title:<28} {median:>12.2f} {p95:>9.2f} {worst:>9.2f}  {slowest!r}")
+    finally:
+        db.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+import argparse
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from office_system.db import DatabaseManager
+from office_system.remote import RemoteDatabase
+from benchmarks.common import make_database, ops_per_sec, report
+
+STATUSES = ['Завершена'] * 80 + ['Отклонена'] * 5 + ['В ожидании'] * 15
+
+
+def start_server(path, readers):
+    process = subprocess.Popen([sys.executable, '-m', 'office_system.server', '--db', path, '--port', '0',
+                                '--readers', str(readers)], stderr=subprocess.PIPE, text=True)
+    line = process.stderr.readline()
+    if not line:
+        raise SystemExit("сервер не запустился")
+    return process, f"http://{line.split()[2].rstrip(',')}"
+
+
+def reader(url, user_ids, seconds, results):
+    db = RemoteDatabase(url)
+    rnd = random.Random(os.getpid())
+    calls = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        db.get_user_equipment(rnd.choice(user_ids))
+        db.get_active_requests_page()
+        calls += 2
+    db.close()
+    results.put(calls)
+
+
+def claimer(url, technician_id, seconds, results):
+    db = RemoteDatabase(url)
+    claimed = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        row = db.claim_next_request(technician_id)
+        if row is None:
+            break
+        claimed.append(row[0])
+    db.close()
+    results.put(claimed)
+
+
+def run_clients(target, args_list, seconds):
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=target, args=(*args, seconds, results)) for args in args_list]
+    for process in processes:
+        process.start()
+    collected = [results.get(timeout=seconds + 60) for _ in processes]
+    for process in processes:
+        process.join()
+    return collected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сервер базы: задержка вызова, пакеты, одновременные клиенты")
+    parser.add_argument('--requests', type=int, default=100_000)
+    parser.add_argument('--users', type=int, default=2_000)
+    parser.add_argument('--readers', type=int, default=4, help="потоков чтения на сервере")
+    parser.add_argument('--clients', type=int, default=8, help="процессов-клиентов")
+    parser.add_argument('--seconds', type=float, default=2.0)
+    args = parser.parse_args()
+
+    path = make_database(requests=args.requests, users=args.users, statuses=STATUSES)
+    server = None
+    rows = []
+    try:
+        local = DatabaseManager(path)
+        user_ids = [row[0] for row in local.pool.connection().execute("SELECT id FROM users WHERE username != 'admin'")]
+        technician_ids = [row[0] for row in local.get_all_technicians()]
+        server, url = start_server(path, args.readers)
+        remote = RemoteDatabase(url)
+        rnd = random.Random(1)
+
+        rows.append(("локально, вызовов/с", ops_per_sec(lambda n: local.get_user_equipment(rnd.choice(user_ids)),
+                                                        args.seconds)))
+        rows.append(("через сервер, вызовов/с", ops_per_sec(lambda n: remote.get_user_equipment(rnd.choice(user_ids)),
+                                                            args.seconds)))
+
+        def reconnecting(n):
+            remote.get_user_equipment(rnd.choice(user_ids))
+            remote.close()
+        rows.append(("через сервер без keep-alive, вызовов/с", ops_per_sec(reconnecting, args.seconds)))
+
+        calls = [('get_user_equipment', (user_id,)) for user_id in user_ids[:10]]
+        rows.append(("10 вызовов по одному, раз/с", ops_per_sec(
+            lambda n: [remote.get_user_equipment(*call_args) for _, call_args in calls], args.seconds)))
+        rows.append(("10 вызовов одним пакетом, раз/с", ops_per_sec(lambda n: remote.batch(calls), args.seconds)))
+        remote.close()
+        local.close()
+
+        counts = run_clients(reader, [(url, user_ids)] * args.clients, args.seconds)
+        rows.append((f"{args.clients} клиентов читают, вызовов/с", sum(counts) / args.seconds))
+        claimed = run_clients(claimer, [(url, technician_ids[n % len(technician_ids)]) for n in range(args.clients)],
+                              args.seconds)
+        claims = Counter(request_id for batch in claimed for request_id in batch)
+        duplicates = [request_id for request_id, count in claims.items() if count > 1]
+        rows.append((f"{args.clients} клиентов берут заявки, захватов/с", sum(claims.values()) / args.seconds))
+        rows.append(("заявок взято дважды", len(duplicates)))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    report(f"{args.requests:,} заявок, {args.users} пользователей, {args.readers} потоков чтения", rows)
+    if duplicates:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
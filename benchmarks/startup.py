@@ -0,0 +1,93 @@
+import argparse
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+from office_system.db import DatabaseManager, create_base_schema
+
+
+def legacy_database_manager(db_name):
+    conn = sqlite3.connect(db_name)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    create_base_schema(conn)
+    conn.commit()
+    conn.close()
+    conn = sqlite3.connect(db_name)
+    conn.execute("SELECT id FROM users WHERE username = 'admin'").fetchone()
+    conn.close()
+
+
+def measure(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def measure_window(path, repeat):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    from office_system.ui.main_window import MainWindow
+    from office_system.ui.tasks import DbExecutor
+    app = QApplication.instance() or QApplication([])
+
+    def build():
+        db = DatabaseManager(path)
+        window = MainWindow(db, DbExecutor())
+        window.show()
+        app.processEvents()
+        window.close()
+        db.close()
+
+    return measure(build, repeat)
+
+
+CLI_CHECK = """
+import sys
+from office_system.cli import main
+main(['--db', sys.argv[1], 'request', 'list'])
+assert not any(name.startswith('PyQt6') for name in sys.modules), "CLI импортировал Qt"
+assert not {'asyncio', 'http.client'} & sys.modules.keys(), "CLI импортировал сетевые модули"
+"""
+
+
+def measure_cli(path, repeat):
+    """Полный запуск процесса с интерпретатором: так CLI вызывают cron и скрипты."""
+    # With bytecode caching on, as in a normal installation.
+    env = {name: value for name, value in os.environ.items() if name != 'PYTHONDONTWRITEBYTECODE'}
+    return measure(lambda: subprocess.run([sys.executable, '-c', CLI_CHECK, path], check=True, env=env,
+                                          stdout=subprocess.DEVNULL), repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время запуска: настройка схемы и построение главного окна")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--window', action='store_true', help="также измерить MainWindow (offscreen)")
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        DatabaseManager(path).close()
+        rows = [
+            ("до: 5 x init_database + seed_admin_user", measure(lambda: [legacy_database_manager(path) for _ in range(5)], args.repeat)),
+            ("после: один DatabaseManager, схема актуальна", measure(lambda: DatabaseManager(path).close(), args.repeat)),
+            ("python -m office_system.cli request list", measure_cli(path, args.repeat)),
+        ]
+        if args.window:
+            rows.append(("MainWindow + show()", measure_window(path, args.repeat)))
+        print("Запуск, мс (лучшее из %d)" % args.repeat)
+        width = max(len(name) for name, _ in rows)
+        for name, value in rows:
+            print(f"  {name:<{width}}  {value:8.2f}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
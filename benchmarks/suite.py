@@ -0,0 +1,351 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from office_system.db import DatabaseManager, read_equipment_file
+from benchmarks.common import free_equipment
+from benchmarks.generate import PASSWORD, count, generate_database
+
+# Methods the suite deliberately leaves out; every other public DatabaseManager method needs a case below.
+NOT_TIMED = {'transaction'}
+
+
+def case(name, run, setup=None, runs=None):
+    """A timed call: run(arg) is measured, setup() is not and returns arg. runs overrides --repeat."""
+    return name, run, setup or (lambda: None), runs
+
+
+def db_cases(db, path, workdir):
+    conn = db.pool.connection()
+    rnd = random.Random(1)
+    employees = [row[0] for row in conn.execute("SELECT id FROM users WHERE role = 'Сотрудник' LIMIT 10000")]
+    technicians = [row[0] for row in db.get_all_technicians()]
+    equipment = conn.execute("SELECT id, user_id FROM equipment LIMIT 10000").fetchall()
+    free = free_equipment(db)
+    username = conn.execute("SELECT username FROM users WHERE id = ?", (employees[0],)).fetchone()[0]
+    requests = [row[0] for row in conn.execute("SELECT id FROM requests ORDER BY id DESC LIMIT 1000")]
+    page = db.get_active_requests_page(limit=400)
+    deep_page = (page[-1][5], page[-1][0]) if page else None
+    latest = db.latest_change()
+    today = date.today()
+    import_file = os.path.join(workdir, 'import.csv')
+    with open(import_file, 'w', encoding='utf-8') as f:
+        f.write("equipment_type,inventory_id\n" + "".join(f"ПК,{n}\n" for n in range(1000)))
+    counter = iter(range(10 ** 9))
+
+    def cold(load):
+        # The query cache would otherwise answer every run after the first.
+        return lambda arg: (db.cache.clear(), load(arg))
+
+    def new_request():
+        equipment_id, user_id = free.pop()
+        db.create_replacement_request(user_id, equipment_id)
+        return conn.execute("SELECT MAX(id) FROM requests").fetchone()[0]
+
+    def accepted_request():
+        request_id = new_request()
+        db.update_request_status(request_id, 'Принята')
+        return request_id
+
+    def new_equipment():
+        return db.add_equipment(rnd.choice(employees), 'ПК', 10 ** 9 + next(counter))[0]
+
+    def new_user():
+        n = next(counter)
+        user_id = db.insert_user(f'suite_user{n}', 'x', 'Удаляемый Сотрудник', f'suite_user{n}@example.com', 'Сотрудник')
+        db.add_equipment(user_id, 'ПК', 10 ** 12 + n)
+        return user_id
+
+    def user_with_hash():
+        user = db.get_user_by_username(username)
+        return user['id'], user['password']
+
+    return [
+        case('open', lambda _: DatabaseManager(path).close(), runs=5),
+        case('close', lambda manager: manager.close(), setup=lambda: DatabaseManager(path), runs=5),
+        case('migrate', lambda _: db.migrate()),
+        case('schema_version', lambda _: db.schema_version()),
+        case('cache_stats', lambda _: db.cache_stats()),
+        case('batch', lambda _: db.batch([('latest_change', ()), ('get_all_technicians', ())])),
+        case('data_version', lambda _: db.data_version()),
+        case('latest_change', lambda _: db.latest_change()),
+        case('changes_since', lambda _: db.changes_since(max(latest - 100, 0))),
+        case('forget_changes', lambda changes: db.forget_changes(changes),
+             setup=lambda: db.changes_since(max(db.latest_change() - 100, 0))[1]),
+        case('prune_changes', lambda _: db.prune_changes()),
+        case('equipment_owners', lambda _: db.equipment_owners(conn, [row[0] for row in equipment[:100]])),
+        case('request_owners', lambda _: db.request_owners(conn, "r.id IN (SELECT value FROM json_each(?))",
+                                                            (json.dumps(requests[:100]),))),
+        case('create_user', lambda n: db.create_user(f'suite_new{n}', PASSWORD, 'Новый Сотрудник',
+                                                     f'suite_new{n}@example.com'), setup=lambda: next(counter), runs=5),
+        case('insert_user', lambda n: db.insert_user(f'suite_ins{n}', 'x', 'Новый Сотрудник',
+                                                     f'suite_ins{n}@example.com', 'Сотрудник'),
+             setup=lambda: next(counter)),
+        case('get_user_by_username', lambda _: db.get_user_by_username(username)),
+        case('authenticate_user:cached', lambda _: db.authenticate_user(username, PASSWORD),
+             setup=lambda: db.authenticate_user(username, PASSWORD)),
+        case('authenticate_user:kdf', lambda _: db.authenticate_user(username, PASSWORD),
+             setup=db.auth_cache.entries.clear, runs=5),
+        case('update_password_hash', lambda user: db.update_password_hash(user[0], user[1], user[1]),
+             setup=user_with_hash),
+        case('add_equipment', lambda n: db.add_equipment(rnd.choice(employees), 'Монитор', 10 ** 10 + n),
+             setup=lambda: next(counter)),
+        case('get_equipment', lambda _: db.get_equipment(rnd.choice(equipment)[0])),
+        case('get_equipment_rows', lambda _: db.get_equipment_rows([row[0] for row in equipment[:100]])),
+        case('get_user_equipment', cold(lambda _: db.get_user_equipment(rnd.choice(employees)))),
+        case('get_user_equipment:cached', lambda _: db.get_user_equipment(employees[0])),
+        case('create_replacement_request', lambda row: db.create_replacement_request(row[1], row[0]),
+             setup=free.pop),
+        case('get_request', lambda _: db.get_request(rnd.choice(requests))),
+        case('get_all_active_requests', cold(lambda _: db.get_all_active_requests()), runs=5),
+        case('get_active_requests_page', cold(lambda _: db.get_active_requests_page())),
+        case('get_active_requests_page:deep', cold(lambda _: db.get_active_requests_page(deep_page))),
+        case('search_equipment', lambda _: db.search_equipment(employees[0], 'пк')),
+        case('search_active_requests', lambda _: db.search_active_requests(username[:4])),
+        case('get_assigned_requests', cold(lambda _: db.get_assigned_requests(rnd.choice(technicians)))),
+        case('technician_loads', lambda _: db.technician_loads(conn, technicians)),
+        case('technician_affinity', lambda _: db.technician_affinity(conn, technicians, time.time() - 90 * 86400),
+             runs=5),
+        case('schedule_requests', lambda _: db.schedule_requests(), setup=new_request, runs=5),
+        case('claim_next_request', lambda _: db.claim_next_request(rnd.choice(technicians)), setup=new_request),
+        case('get_requests', lambda _: db.get_requests(requests[:100])),
+        case('update_request_status', lambda request_id: db.update_request_status(request_id, 'Принята'),
+             setup=new_request),
+        case('update_request_statuses', lambda ids: db.update_request_statuses(ids, 'Отклонена'),
+             setup=lambda: [new_request() for _ in range(20)], runs=5),
+        case('resolve_request', lambda request_id: db.resolve_request(request_id, 10 ** 11 + next(counter)),
+             setup=accepted_request),
+        case('resolve_requests', lambda ids: db.resolve_requests([(i, 10 ** 11 + next(counter)) for i in ids]),
+             setup=lambda: [accepted_request() for _ in range(20)], runs=5),
+        case('import_equipment', lambda user_id: db.import_equipment(user_id, read_equipment_file(import_file)),
+             setup=new_user, runs=5),
+        case('insert_equipment_chunk', lambda user_id: db.insert_equipment_chunk(
+             user_id, [(n, 'ПК', n) for n in range(1000)]), setup=new_user, runs=5),
+        case('iter_request_history', lambda _: sum(len(chunk) for chunk in db.iter_request_history(
+             today - timedelta(days=30), today)), runs=3),
+        case('export_request_history', lambda _: db.export_request_history(
+             os.path.join(workdir, 'history.csv'), today - timedelta(days=30), today), runs=3),
+        case('check_current_status', lambda _: db.check_current_status(), runs=3),
+        case('repair_current_status', lambda _: db.repair_current_status(), runs=3),
+        case('get_all_technicians', cold(lambda _: db.get_all_technicians())),
+        case('rebuild_analytics', lambda _: db.rebuild_analytics(), runs=1),
+        case('analytics.summary', lambda _: db.analytics.summary(30), runs=5),
+        case('delete_equipment', lambda equipment_id: db.delete_equipment(equipment_id), setup=new_equipment),
+        case('delete_user', lambda user_id: db.delete_user(user_id), setup=new_user),
+    ]
+
+
+def ui_cases(db):
+    """Every load_content path of the screens, each timed until its queries are back and shown."""
+    from PyQt6.QtWidgets import QApplication
+    from office_system.ui.employee import EmployeeWidget
+    from office_system.ui.tasks import DbExecutor
+    from office_system.ui.tech_admin import TechAdminManagementWidget
+    from office_system.ui.tech_support import TechSupportWidget
+    conn = db.pool.connection()
+    executor = DbExecutor()
+    employee = db.get_user_by_username(conn.execute(
+        "SELECT u.username FROM users u JOIN equipment eq ON eq.user_id = u.id GROUP BY u.id "
+        "ORDER BY COUNT(*) DESC LIMIT 1").fetchone()[0])
+    technician = db.get_user_by_username(db.get_all_technicians()[0][1])
+    screens = {}
+
+    def screen(widget_class, user):
+        if widget_class not in screens:
+            widget = widget_class(db, executor)
+            widget.resize(700, 720)
+            widget.show()
+            if user is not None:
+                widget.user_data = user
+            screens[widget_class] = widget
+        return screens[widget_class]
+
+    def load(widget_class, user=None, search='', mine=False, analytics=False):
+        def setup():
+            widget = screen(widget_class, user)
+            if widget.search_field:
+                widget.search_field.blockSignals(True)
+                widget.search_field.setText(search)
+                widget.search_field.blockSignals(False)
+            if widget_class is TechSupportWidget:
+                widget.mine_check.blockSignals(True)
+                widget.mine_check.setChecked(mine)
+                widget.mine_check.blockSignals(False)
+                widget.tabs.blockSignals(True)
+                widget.tabs.setCurrentWidget(widget.analytics_panel if analytics else widget.tabs.widget(0))
+                widget.tabs.blockSignals(False)
+            db.cache.clear()
+            return widget
+
+        def run(widget):
+            widget.load_content()
+            while widget.pending:
+                executor.thread_pool.waitForDone(1)
+                QApplication.processEvents()
+            QApplication.processEvents()
+        return setup, run
+
+    return [case(name, run, setup) for name, (setup, run) in [
+        ('EmployeeWidget', load(EmployeeWidget, employee)),
+        ('EmployeeWidget:search', load(EmployeeWidget, employee, search='пк')),
+        ('TechSupportWidget', load(TechSupportWidget, technician)),
+        ('TechSupportWidget:search', load(TechSupportWidget, technician, search=employee['username'][:4])),
+        ('TechSupportWidget:mine', load(TechSupportWidget, technician, mine=True)),
+        ('TechSupportWidget:analytics', load(TechSupportWidget, technician, analytics=True)),
+        ('TechAdminManagementWidget', load(TechAdminManagementWidget)),
+    ]], executor
+
+
+def measure(cases, repeat, only=None):
+    results = {}
+    for name, run, setup, runs in cases:
+        if only and not any(pattern in name for pattern in only):
+            continue
+        times = []
+        for _ in range(runs or repeat):
+            arg = setup()
+            started = time.perf_counter()
+            run(arg)
+            times.append((time.perf_counter() - started) * 1000)
+        times.sort()
+        results[name] = {
+            'runs': len(times),
+            'min_ms': times[0],
+            'median_ms': statistics.median(times),
+            'p95_ms': times[min(len(times) - 1, int(len(times) * 0.95))],
+        }
+        print(f"  {name:<40} {results[name]['median_ms']:>10.3f} {results[name]['p95_ms']:>10.3f}", file=sys.stderr)
+    return results
+
+
+def run_ui(path, repeat, only):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    from office_system.ui.theme import apply_theme
+    app = QApplication([])
+    apply_theme(app)
+    db = DatabaseManager(path)
+    cases, executor = ui_cases(db)
+    results = measure(cases, repeat, only)
+    executor.shutdown()
+    db.close()
+    app.quit()
+    print(json.dumps(results))
+
+
+def compare(base, new, threshold, min_ms):
+    """Prints the median of every case in both runs; returns the cases slower than threshold times the base."""
+    regressions = []
+    print(f"{'случай':<44} {'было, мс':>10} {'стало, мс':>10} {'разница':>9}")
+    for name in sorted(set(base['results']) | set(new['results'])):
+        old, cur = base['results'].get(name), new['results'].get(name)
+        if old is None or cur is None:
+            print(f"{name:<44} {'—' if old is None else format(old['median_ms'], '10.3f'):>10} "
+                  f"{'—' if cur is None else format(cur['median_ms'], '10.3f'):>10}")
+            continue
+        ratio = cur['median_ms'] / old['median_ms'] if old['median_ms'] else 1.0
+        slower = ratio > threshold and cur['median_ms'] - old['median_ms'] > min_ms
+        if slower:
+            regressions.append(name)
+        print(f"{name:<44} {old['median_ms']:>10.3f} {cur['median_ms']:>10.3f} {ratio:>8.2f}x{' !' if slower else ''}")
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], check=True, capture_output=True,
+                              text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Замеры всех методов DatabaseManager и всех путей load_content экранов; результаты в JSON")
+    parser.add_argument('--db', help="замерить копию существующей базы, например собранной benchmarks.generate")
+    parser.add_argument('--requests', type=count, default=count('100k'), help="размер синтетической базы без --db")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--only', nargs='+', help="только случаи, в названии которых есть одна из строк")
+    parser.add_argument('--no-ui', action='store_true', help="не замерять экраны")
+    parser.add_argument('--output', help="файл результатов; по умолчанию suite-<коммит>.json")
+    parser.add_argument('--compare', metavar='BASE', help="сравнить с результатами другого коммита")
+    parser.add_argument('--diff', nargs=2, metavar=('BASE', 'NEW'), help="только сравнить два файла результатов")
+    parser.add_argument('--threshold', type=float, default=1.25, help="во сколько раз медленнее считать регрессией")
+    parser.add_argument('--min-ms', type=float, default=0.05, help="меньшую разницу не считать регрессией")
+    parser.add_argument('--ui-case', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.ui_case:
+        run_ui(args.ui_case, args.repeat, args.only)
+        return
+    if args.diff:
+        with open(args.diff[0], encoding='utf-8') as f, open(args.diff[1], encoding='utf-8') as g:
+            sys.exit(1 if compare(json.load(f), json.load(g), args.threshold, args.min_ms) else 0)
+
+    # The suite writes, so it always works on a copy.
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, 'suite.db')
+    if args.db:
+        with sqlite3.connect(args.db) as source, sqlite3.connect(path) as target:
+            source.backup(target)
+    else:
+        print(f"Генерация базы на {args.requests:,} заявок...", file=sys.stderr)
+        generate_database(path, args.requests)
+    try:
+        db = DatabaseManager(path)
+        sizes = {table: db.pool.connection().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                 for table in ('users', 'equipment', 'requests')}
+        cases = db_cases(db, path, workdir)
+        covered = {name.split(':')[0] for name, _, _, _ in cases}
+        public = {name for name, value in vars(DatabaseManager).items() if callable(value) and not name.startswith('_')}
+        missing = sorted(public - covered - NOT_TIMED)
+        if missing:
+            parser.error(f"нет замеров для методов DatabaseManager: {', '.join(missing)}")
+        print("База данных (медиана, p95, мс):", file=sys.stderr)
+        results = {f"db.{name}": value for name, value in measure(cases, args.repeat, args.only).items()}
+        db.close()
+        if not args.no_ui:
+            print("Экраны (медиана, p95, мс):", file=sys.stderr)
+            done = subprocess.run([sys.executable, '-m', 'benchmarks.suite', '--ui-case', path,
+                                   '--repeat', str(min(args.repeat, 10))] + (['--only', *args.only] if args.only else []),
+                                  capture_output=True, text=True)
+            if done.returncode == 0:
+                results.update({f"ui.{name}": value
+                                for name, value in json.loads(done.stdout.strip().splitlines()[-1]).items()})
+            else:
+                error = (done.stderr.strip().splitlines() or ['?'])[-1]
+                print(f"  экраны не замерены: {error}", file=sys.stderr)
+    finally:
+        for name in os.listdir(workdir):
+            os.remove(os.path.join(workdir, name))
+        os.rmdir(workdir)
+
+    report = {
+        'commit': git_commit(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'database': sizes,
+        'repeat': args.repeat,
+        'results': results,
+    }
+    output = args.output or f"suite-{report['commit']}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    print(f"Результаты: {output}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            if compare(json.load(f), report, args.threshold, args.min_ms):
+                sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
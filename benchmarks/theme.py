@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import make_database
+from benchmarks.list_views import ACTIVE, legacy_list, model_view_list
+
+
+def themed_list(db):
+    """Те же виджеты в строках, что и в legacy_list, но оформление берется из общей таблицы стилей приложения."""
+    from PyQt6.QtCore import QSize
+    from PyQt6.QtWidgets import QHBoxLayout, QLabel, QLineEdit, QListWidget, QListWidgetItem, QPushButton, \
+        QVBoxLayout, QWidget
+    from office_system.ui.theme import font
+    view = QListWidget()
+    for req_data in db.get_all_active_requests():
+        row = QWidget()
+        main_layout, info_layout, action_layout = QVBoxLayout(row), QHBoxLayout(), QHBoxLayout()
+        info_label = QLabel(f"<b>{req_data[1]}</b>: {req_data[2]} (ID: {req_data[3]})")
+        info_label.setFont(font(11))
+        info_layout.addWidget(info_label)
+        for text, status in [("Принять", "Принята"), ("Отклонить", "Отклонена"), ("Завершить", "Завершена")]:
+            button = QPushButton(text)
+            button.setProperty('variant', 'batch')
+            button.setProperty('status', status)
+            action_layout.addWidget(button)
+        new_id_input = QLineEdit()
+        new_id_input.setProperty('role', 'input')
+        new_id_input.hide()
+        action_layout.addWidget(new_id_input)
+        main_layout.addLayout(info_layout)
+        main_layout.addLayout(action_layout)
+        item = QListWidgetItem()
+        item.setSizeHint(QSize(0, 70))
+        view.addItem(item)
+        view.setItemWidget(item, row)
+    return view
+
+
+CASES = {
+    'inline': (legacy_list, False),
+    'theme': (themed_list, True),
+    'delegate': (model_view_list, True),
+}
+
+
+def run_case(case, path):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    from office_system.db import DatabaseManager
+    from office_system.ui.theme import apply_theme
+    app = QApplication([])
+    build, themed = CASES[case]
+    if themed:
+        apply_theme(app)
+    db = DatabaseManager(path)
+    started = time.perf_counter()
+    widget = build(db)
+    widget.resize(700, 600)
+    widget.show()
+    app.processEvents()
+    print(json.dumps({'seconds': time.perf_counter() - started}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время построения списка заявок: setStyleSheet на каждом виджете "
+                                                 "против общей таблицы стилей приложения")
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--case', choices=list(CASES), help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.case:
+        run_case(args.case, args.db)
+        return
+
+    path = make_database(requests=args.rows, users=max(args.rows // 20, 1), statuses=ACTIVE)
+    print(f"{'вариант':<40} {'время, с':>9}")
+    try:
+        for case, title in [('inline', 'виджеты + setStyleSheet на каждом'), ('theme', 'виджеты + общая тема'),
+                            ('delegate', 'QListView + делегат + общая тема')]:
+            runs = []
+            for _ in range(args.repeat):
+                output = subprocess.run([sys.executable, '-m', 'benchmarks.theme', '--case', case, '--db', path],
+                                        check=True, capture_output=True, text=True).stdout
+                runs.append(json.loads(output.strip().splitlines()[-1])['seconds'])
+            print(f"{title:<40} {min(runs):>9.2f}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+import argparse
+import sys
+
+from office_system.cli import main
+
+
+if __name__ == '__main__':
+    # Kept for existing scripts; the same import is `python -m office_system.cli equipment import`.
+    parser = argparse.ArgumentParser(description="Массовый импорт оборудования сотрудника из CSV или JSONL")
+    parser.add_argument('file', help="CSV с колонками equipment_type,inventory_id или JSONL с теми же полями")
+    parser.add_argument('--user', required=True, help="имя пользователя-владельца оборудования")
+    parser.add_argument('--db', default='office_system.db')
+    parser.add_argument('--chunk-size', type=int, default=20000)
+    args = parser.parse_args()
+    sys.exit(main(['--db', args.db, 'equipment', 'import', args.user, args.file, '--chunk-size', str(args.chunk_size)]))
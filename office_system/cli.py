@@ -0,0 +1,256 @@
+import argparse
+import sys
+import time
+from datetime import date
+
+from office_system.db import EQUIPMENT_TYPES, STATUS_CODES, DatabaseManager, read_equipment_file
+from office_system.metrics import Metrics
+from office_system.protocol import RemoteError
+
+
+class CommandError(Exception):
+    pass
+
+
+def print_rows(rows):
+    for row in rows:
+        print("\t".join("" if value is None else str(value) for value in row))
+
+
+def find_user(db, username):
+    user = db.get_user_by_username(username)
+    if user is None:
+        raise CommandError(f"Пользователь '{username}' не найден.")
+    return user
+
+
+def technician_id(db, username):
+    return None if username is None else find_user(db, username)['id']
+
+
+def user_add(db, args):
+    user_id = db.create_user(args.username, args.password, args.full_name, args.email, args.role)
+    if user_id is None:
+        raise CommandError("Пользователь с таким логином или email уже существует.")
+    print(user_id)
+
+
+def user_delete(db, args):
+    if not db.delete_user(find_user(db, args.username)['id']):
+        raise CommandError(f"Не удалось удалить пользователя '{args.username}'.")
+
+
+def user_technicians(db, args):
+    print_rows(db.get_all_technicians())
+
+
+def equipment_list(db, args):
+    print_rows(db.get_user_equipment(find_user(db, args.username)['id']))
+
+
+def equipment_search(db, args):
+    print_rows(db.search_equipment(find_user(db, args.username)['id'], args.text, limit=args.limit))
+
+
+def equipment_add(db, args):
+    row = db.add_equipment(find_user(db, args.username)['id'], args.equipment_type, args.inventory_id)
+    if row is None:
+        raise CommandError(f"Оборудование с ID {args.inventory_id} уже существует.")
+    print_rows([row])
+
+
+def equipment_delete(db, args):
+    if not db.delete_equipment(args.equipment_id):
+        raise CommandError(f"Не удалось удалить оборудование {args.equipment_id}.")
+
+
+def equipment_import(db, args):
+    user_id = find_user(db, args.username)['id']
+    started = time.perf_counter()
+    imported, errors = db.import_equipment(user_id, read_equipment_file(args.file), chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - started
+    for line_no, message in errors:
+        print(f"{args.file}:{line_no}: {message}", file=sys.stderr)
+    print(f"Импортировано: {imported}, пропущено строк: {len(errors)}, {imported / elapsed if elapsed else 0:,.0f} строк/с")
+    return 1 if errors else 0
+
+
+def request_list(db, args):
+    if args.assigned_to:
+        print_rows(db.get_assigned_requests(find_user(db, args.assigned_to)['id']))
+    else:
+        print_rows(db.get_all_active_requests())
+
+
+def request_search(db, args):
+    print_rows(db.search_active_requests(args.text, limit=args.limit))
+
+
+def request_schedule(db, args):
+    print(f"Распределено заявок: {db.schedule_requests()}")
+
+
+def request_claim(db, args):
+    row = db.claim_next_request(find_user(db, args.technician)['id'])
+    if row is None:
+        raise CommandError("Свободных заявок нет.")
+    print_rows([row])
+
+
+def request_create(db, args):
+    user_id = find_user(db, args.username)['id']
+    equipment, owned = db.batch([('get_equipment', (args.equipment_id,)), ('get_user_equipment', (user_id,))])
+    if equipment not in owned:
+        raise CommandError(f"У пользователя '{args.username}' нет оборудования {args.equipment_id}.")
+    try:
+        row = db.create_replacement_request(user_id, args.equipment_id)
+    except ValueError as e:
+        raise CommandError(str(e)) from None
+    print_rows([row])
+
+
+def request_set_status(status):
+    def command(db, args):
+        try:
+            rows = db.update_request_statuses(args.request_ids, status, technician_id(db, args.technician))
+        except ValueError as e:
+            raise CommandError(str(e)) from None
+        print_rows(rows)
+    return command
+
+
+def request_resolve(db, args):
+    try:
+        row = db.resolve_request(args.request_id, args.inventory_id, technician_id(db, args.technician))
+    except ValueError as e:
+        raise CommandError(str(e)) from None
+    if row is None:
+        raise CommandError(f"Заявка {args.request_id} не найдена.")
+    print_rows([row])
+
+
+def request_export(db, args):
+    started = time.perf_counter()
+
+    def progress(exported):
+        print(f"\rВыгружено строк: {exported:,}", end='', file=sys.stderr)
+
+    try:
+        exported = db.export_request_history(args.file, args.start, args.end, args.status,
+                                             chunk_size=args.chunk_size, progress=progress)
+    except ValueError as e:
+        raise CommandError(str(e)) from None
+    elapsed = time.perf_counter() - started
+    print(file=sys.stderr)
+    print(f"Выгружено: {exported}, {exported / elapsed if elapsed else 0:,.0f} строк/с")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m office_system.cli',
+                                     description="Работа с базой офисной системы без графического интерфейса")
+    parser.add_argument('--db', default='office_system.db')
+    parser.add_argument('--server', metavar='URL', help="работать через сервер (python -m office_system.server), а не с файлом")
+    parser.add_argument('--token', help="токен сервера")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="записать время вызовов и медленные запросы: JSON или Prometheus для .prom/.txt")
+    groups = parser.add_subparsers(dest='group', required=True)
+
+    user = groups.add_parser('user', help="пользователи").add_subparsers(dest='command', required=True)
+    command = user.add_parser('add', help="создать пользователя")
+    command.add_argument('username')
+    command.add_argument('--password', required=True)
+    command.add_argument('--full-name', required=True)
+    command.add_argument('--email', required=True)
+    command.add_argument('--role', choices=['Сотрудник', 'Техник'], default='Сотрудник')
+    command.set_defaults(handler=user_add)
+    command = user.add_parser('delete', help="удалить пользователя вместе с его оборудованием и заявками")
+    command.add_argument('username')
+    command.set_defaults(handler=user_delete)
+    user.add_parser('technicians', help="список техников").set_defaults(handler=user_technicians)
+
+    equipment = groups.add_parser('equipment', help="оборудование").add_subparsers(dest='command', required=True)
+    command = equipment.add_parser('list', help="оборудование сотрудника")
+    command.add_argument('username')
+    command.set_defaults(handler=equipment_list)
+    command = equipment.add_parser('search', help="поиск по оборудованию сотрудника")
+    command.add_argument('username')
+    command.add_argument('text', help="слова запроса; последнее ищется по началу слова")
+    command.add_argument('--limit', type=int, default=50)
+    command.set_defaults(handler=equipment_search)
+    command = equipment.add_parser('add', help="добавить оборудование сотруднику")
+    command.add_argument('username')
+    command.add_argument('equipment_type', choices=EQUIPMENT_TYPES)
+    command.add_argument('inventory_id', type=int)
+    command.set_defaults(handler=equipment_add)
+    command = equipment.add_parser('delete', help="удалить оборудование и его заявки")
+    command.add_argument('equipment_id', type=int)
+    command.set_defaults(handler=equipment_delete)
+    command = equipment.add_parser('import', help="массовый импорт из CSV или JSONL")
+    command.add_argument('username', help="владелец оборудования")
+    command.add_argument('file', help="CSV с колонками equipment_type,inventory_id или JSONL с теми же полями")
+    command.add_argument('--chunk-size', type=int, default=20000)
+    command.set_defaults(handler=equipment_import)
+
+    request = groups.add_parser('request', help="заявки на замену").add_subparsers(dest='command', required=True)
+    command = request.add_parser('list', help="активные заявки")
+    command.add_argument('--assigned-to', metavar='TECHNICIAN', help="только заявки, назначенные этому технику")
+    command.set_defaults(handler=request_list)
+    command = request.add_parser('search', help="поиск активных заявок по сотруднику, email, типу или ID")
+    command.add_argument('text', help="слова запроса; последнее ищется по началу слова")
+    command.add_argument('--limit', type=int, default=50)
+    command.set_defaults(handler=request_search)
+    request.add_parser('schedule', help="распределить заявки в ожидании между техниками").set_defaults(
+        handler=request_schedule)
+    command = request.add_parser('claim', help="взять в работу следующую заявку техника или из общей очереди")
+    command.add_argument('technician')
+    command.set_defaults(handler=request_claim)
+    command = request.add_parser('create', help="создать заявку на замену оборудования")
+    command.add_argument('username')
+    command.add_argument('equipment_id', type=int)
+    command.set_defaults(handler=request_create)
+    for name, status in [('accept', 'Принята'), ('reject', 'Отклонена')]:
+        command = request.add_parser(name, help=f"перевести заявки в статус «{status}»")
+        command.add_argument('request_ids', type=int, nargs='+')
+        command.add_argument('--technician', help="техник, которому засчитать заявки")
+        command.set_defaults(handler=request_set_status(status))
+    command = request.add_parser('resolve', help="завершить заявку с новым ID оборудования")
+    command.add_argument('request_id', type=int)
+    command.add_argument('inventory_id', type=int)
+    command.add_argument('--technician', help="техник, которому засчитать заявку")
+    command.set_defaults(handler=request_resolve)
+    command = request.add_parser('export', help="выгрузить историю заявок в CSV или XLSX")
+    command.add_argument('file', help="файл выгрузки, формат по расширению: .csv или .xlsx")
+    command.add_argument('--from', dest='start', type=date.fromisoformat, help="заявки, созданные с этой даты (ГГГГ-ММ-ДД)")
+    command.add_argument('--to', dest='end', type=date.fromisoformat, help="заявки, созданные по эту дату включительно")
+    command.add_argument('--status', action='append', choices=list(STATUS_CODES),
+                         help="только заявки с этим статусом; можно указать несколько раз")
+    command.add_argument('--chunk-size', type=int, default=5000)
+    command.set_defaults(handler=request_export)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    metrics = Metrics() if args.metrics else None
+    if args.server:
+        # Only here: http.client alone would add a third to the start of every local command.
+        from office_system.remote import RemoteDatabase
+        db = RemoteDatabase(args.server, args.token, metrics=metrics)
+    else:
+        db = DatabaseManager(args.db, metrics=metrics)
+    try:
+        return args.handler(db, args) or 0
+    except CommandError as e:
+        print(e, file=sys.stderr)
+        return 1
+    except (RemoteError, ConnectionError) as e:
+        print(f"Сервер {args.server}: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+        if metrics:
+            metrics.write(args.metrics)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,1790 @@
+import csv
+import hashlib
+import hmac
+import io
+import itertools
+import json
+import os
+import sqlite3
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, timedelta
+from functools import wraps
+
+
+STATUS_PENDING, STATUS_ACCEPTED, STATUS_DONE, STATUS_REJECTED = 1, 2, 3, 4
+STATUS_NAMES = {
+    STATUS_PENDING: 'В ожидании',
+    STATUS_ACCEPTED: 'Принята',
+    STATUS_DONE: 'Завершена',
+    STATUS_REJECTED: 'Отклонена',
+}
+STATUS_CODES = {name: code for code, name in STATUS_NAMES.items()}
+ACTIVE_STATUS_CODES = f"({STATUS_PENDING}, {STATUS_ACCEPTED})"
+EQUIPMENT_COLUMNS = "eq.id, eq.equipment_type, eq.inventory_id, st.name"
+EQUIPMENT_JOINS = """
+    FROM equipment eq
+    LEFT JOIN request_statuses st ON st.code = eq.current_status
+"""
+REQUEST_COLUMNS = "r.id, u.username, eq.equipment_type, eq.inventory_id, st.name, r.request_date, a.username"
+REQUEST_JOINS = """
+    FROM requests r
+    JOIN users u ON r.user_id = u.id
+    JOIN equipment eq ON r.equipment_id = eq.id
+    JOIN request_statuses st ON st.code = r.status
+    LEFT JOIN users a ON a.id = r.assigned_to
+"""
+ACTIVE_STATUSES = (STATUS_NAMES[STATUS_PENDING], STATUS_NAMES[STATUS_ACCEPTED])
+# Where a request may go from each status; completed and rejected requests are final.
+STATUS_TRANSITIONS = {
+    STATUS_PENDING: {STATUS_ACCEPTED, STATUS_REJECTED},
+    STATUS_ACCEPTED: {STATUS_DONE},
+}
+EQUIPMENT_TYPES = ["Монитор", "ПК", "Ноутбук", "Принтер", "Телефон"]
+
+
+def read_equipment_file(path):
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        if path.lower().endswith(('.jsonl', '.ndjson')):
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, ValueError(f"некорректный JSON: {e.msg}")
+                    continue
+                if isinstance(record, dict):
+                    yield line_no, (record.get('equipment_type'), record.get('inventory_id'))
+                else:
+                    yield line_no, ValueError("ожидается объект с полями equipment_type и inventory_id")
+        else:
+            reader = csv.reader(f)
+            header = [name.strip() for name in next(reader, [])]
+            if 'equipment_type' not in header or 'inventory_id' not in header:
+                raise ValueError("в CSV нужны колонки equipment_type и inventory_id")
+            type_column, id_column = header.index('equipment_type'), header.index('inventory_id')
+            width = max(type_column, id_column)
+            for row in reader:
+                if len(row) > width:
+                    yield reader.line_num, (row[type_column], row[id_column])
+                elif row:
+                    yield reader.line_num, ValueError("не хватает колонок")
+
+
+def parse_equipment_record(record):
+    if isinstance(record, Exception):
+        raise record
+    equipment_type, inventory_id = record
+    if equipment_type not in EQUIPMENT_TYPES:
+        equipment_type = str(equipment_type or '').strip()
+        if equipment_type not in EQUIPMENT_TYPES:
+            raise ValueError(f"неизвестный тип оборудования: {equipment_type!r}")
+    try:
+        return equipment_type, int(inventory_id)
+    except (TypeError, ValueError):
+        raise ValueError("ID оборудования должен быть числом") from None
+
+
+HISTORY_COLUMNS = ["Заявка", "Статус", "Создана", "Закрыта", "Сотрудник", "ФИО", "Тип оборудования",
+                   "ID оборудования", "Техник"]
+XML_ILLEGAL_CHARS = dict.fromkeys(code for code in range(32) if code not in (9, 10, 13))
+XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Заявки" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def write_csv_rows(path, header, rows):
+    # utf-8-sig so that Excel opens the Cyrillic text without an import dialog.
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def xlsx_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c><v>{value}</v></c>'
+    text = str(value).translate(XML_ILLEGAL_CHARS).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def write_xlsx_rows(path, header, rows):
+    """Streams the sheet straight into the zip with inline strings, so no shared string table is held in memory."""
+    import zipfile  # only exports need it; importing it up front slows down every CLI start
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in XLSX_PARTS.items():
+            archive.writestr(name, content)
+        with archive.open('xl/worksheets/sheet1.xml', 'w') as part:
+            sheet = io.TextIOWrapper(part, encoding='utf-8')
+            sheet.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+            for row in itertools.chain([header], rows):
+                sheet.write(f"<row>{''.join(xlsx_cell(value) for value in row)}</row>")
+            sheet.write('</sheetData></worksheet>')
+            sheet.flush()
+            sheet.detach()
+
+
+EXPORT_WRITERS = {'.csv': write_csv_rows, '.xlsx': write_xlsx_rows}
+
+
+def is_busy_error(error):
+    return isinstance(error, sqlite3.OperationalError) and \
+        (getattr(error, 'sqlite_errorcode', 0) & 0xff) in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+
+
+def retry_on_busy(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        delay = self.retry_delay
+        for attempt in range(self.retry_attempts):
+            try:
+                return method(self, *args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if not is_busy_error(e) or self.pool.in_transaction() or attempt == self.retry_attempts - 1:
+                    raise
+                time.sleep(delay * random.uniform(0.5, 1.5))
+                delay = min(delay * 2, 1.0)
+    return wrapper
+
+
+class PasswordHasher:
+    algorithms = {'pbkdf2_sha256': 200_000, 'scrypt': 2 ** 14}
+
+    def __init__(self, algorithm='pbkdf2_sha256', cost=None):
+        if algorithm not in self.algorithms:
+            raise ValueError(f"Неизвестный алгоритм хеширования: {algorithm}")
+        self.algorithm = algorithm
+        self.cost = cost or self.algorithms[algorithm]
+
+    def derive(self, algorithm, cost, password, salt):
+        if algorithm == 'scrypt':
+            return hashlib.scrypt(password.encode(), salt=salt, n=cost, r=8, p=1, maxmem=2 * 128 * 8 * cost + 2 ** 20)
+        return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, cost)
+
+    def hash(self, password):
+        salt = os.urandom(16)
+        digest = self.derive(self.algorithm, self.cost, password, salt)
+        return f"{self.algorithm}${self.cost}${salt.hex()}${digest.hex()}"
+
+    def verify(self, password, stored):
+        parts = stored.split('$')
+        if len(parts) != 4 or parts[0] not in self.algorithms:
+            return hmac.compare_digest(stored.encode(), password.encode()), True
+        algorithm, cost, salt, digest = parts
+        try:
+            cost = int(cost)
+            derived = self.derive(algorithm, cost, password, bytes.fromhex(salt))
+        except (ValueError, OverflowError):
+            # A truncated or hand-edited hash fails like a wrong password instead of breaking the login.
+            return False, False
+        ok = hmac.compare_digest(derived.hex(), digest)
+        return ok, ok and (algorithm != self.algorithm or cost != self.cost)
+
+
+class VerificationCache:
+    def __init__(self, size=256, ttl=300.0):
+        self.size = size
+        self.ttl = ttl
+        self.secret = os.urandom(32)
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def token(self, username, password):
+        return hmac.new(self.secret, f"{username}\0{password}".encode(), 'sha256').digest()
+
+    def check(self, username, password, stored):
+        token = self.token(username, password)
+        with self.lock:
+            entry = self.entries.get(token)
+            if entry is None:
+                return False
+            cached, expires = entry
+            if expires < time.monotonic() or cached != stored:
+                del self.entries[token]
+                return False
+            self.entries.move_to_end(token)
+            return True
+
+    def put(self, username, password, stored):
+        if self.size <= 0:
+            return
+        token = self.token(username, password)
+        with self.lock:
+            self.entries[token] = (stored, time.monotonic() + self.ttl)
+            self.entries.move_to_end(token)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+
+class QueryCache:
+    def __init__(self, size=512, metrics=None):
+        self.size = size
+        self.metrics = metrics
+        self.entries = OrderedDict()
+        self.tags = {}
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, load, tags=()):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return list(self.entries[key][0])
+            self.misses += 1
+            generation = self.generation
+        if self.metrics is None:
+            rows = load()
+        else:
+            started = time.perf_counter_ns()
+            rows = load()
+            self.metrics.observe_ns(f"db.cache.{key if isinstance(key, str) else key[0]}",
+                                    time.perf_counter_ns() - started)
+        if self.size <= 0:
+            return rows
+        with self.lock:
+            # An invalidation while the query ran may mean the rows are already stale.
+            if generation == self.generation:
+                self.store(key, tuple(rows), (key, *tags))
+        return rows
+
+    def store(self, key, rows, tags):
+        self.drop(key)
+        self.entries[key] = (rows, tags)
+        for tag in tags:
+            self.tags.setdefault(tag, set()).add(key)
+        while len(self.entries) > self.size:
+            self.drop(next(iter(self.entries)))
+            self.evictions += 1
+
+    def drop(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False
+        for tag in entry[1]:
+            keys = self.tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tags[tag]
+        return True
+
+    def invalidate(self, *tags):
+        with self.lock:
+            self.generation += 1
+            for tag in tags:
+                for key in list(self.tags.get(tag, ())):
+                    self.invalidations += self.drop(key)
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.invalidations += len(self.entries)
+            self.entries.clear()
+            self.tags.clear()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self.entries),
+                'capacity': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+class ConnectionPool:
+    def __init__(self, db_name, cached_statements=256, journal_mode='WAL', synchronous='NORMAL', busy_timeout=5.0,
+                 metrics=None):
+        self.db_name = db_name
+        self.metrics = metrics
+        self.cached_statements = cached_statements
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            started = time.perf_counter()
+            conn = sqlite3.connect(self.db_name, timeout=self.busy_timeout, isolation_level=None,
+                                   check_same_thread=False, cached_statements=self.cached_statements)
+            conn.execute("PRAGMA foreign_keys = ON;")
+            if self.journal_mode:
+                conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+            conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+            if self.metrics:
+                self.metrics.observe('db.connect', time.perf_counter() - started)
+            self._local.conn = conn
+            self._local.depth = 0
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def in_transaction(self):
+        return bool(getattr(self._local, 'depth', 0))
+
+    @contextmanager
+    def transaction(self, immediate=True):
+        conn = self.connection()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        self._local.depth = 1
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._local.depth = 0
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+def create_base_schema(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            full_name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            role TEXT NOT NULL DEFAULT 'Сотрудник'
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS equipment (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            equipment_type TEXT NOT NULL,
+            inventory_id INTEGER NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+            UNIQUE (user_id, inventory_id)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS requests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            equipment_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            request_date TEXT NOT NULL,
+            resolution_date TEXT,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+            FOREIGN KEY (equipment_id) REFERENCES equipment (id) ON DELETE CASCADE
+        )
+    ''')
+    if conn.execute("SELECT id FROM users WHERE username = 'admin'").fetchone() is None:
+        conn.execute(
+            'INSERT INTO users (username, password, full_name, email, role) VALUES (?, ?, ?, ?, ?)',
+            ('admin', PasswordHasher().hash('admin'), 'Главный Техник', 'admin@example.com', 'Техник')
+        )
+
+
+INDEXES = {
+    'idx_users_role': "CREATE INDEX IF NOT EXISTS idx_users_role ON users (role)",
+    'idx_equipment_user_type': (
+        "CREATE INDEX IF NOT EXISTS idx_equipment_user_type ON equipment (user_id, equipment_type, inventory_id)"
+    ),
+    'idx_requests_equipment': "CREATE INDEX IF NOT EXISTS idx_requests_equipment ON requests (equipment_id)",
+    'idx_requests_user': "CREATE INDEX IF NOT EXISTS idx_requests_user ON requests (user_id)",
+    'idx_requests_active': (
+        "CREATE INDEX IF NOT EXISTS idx_requests_active ON requests (request_date, id, user_id, equipment_id, status) "
+        f"WHERE status IN {ACTIVE_STATUS_CODES}"
+    ),
+}
+
+
+def create_indexes(conn):
+    for sql in INDEXES.values():
+        conn.execute(sql)
+
+
+LATEST_REQUEST_SQL = "SELECT r.{column} FROM requests r WHERE r.equipment_id = {equipment_id} ORDER BY r.id DESC LIMIT 1"
+
+
+def add_current_status(conn):
+    conn.execute("ALTER TABLE equipment ADD COLUMN current_request_id INTEGER")
+    conn.execute("ALTER TABLE equipment ADD COLUMN current_status TEXT")
+    conn.execute("""
+        UPDATE equipment SET current_request_id = (
+            SELECT MAX(r.id) FROM requests r WHERE r.equipment_id = equipment.id
+        )
+    """)
+    conn.execute("""
+        UPDATE equipment SET current_status = (
+            SELECT r.status FROM requests r WHERE r.id = equipment.current_request_id
+        )
+        WHERE current_request_id IS NOT NULL
+    """)
+    create_current_status_triggers(conn)
+
+
+def create_current_status_triggers(conn):
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_current_insert AFTER INSERT ON requests
+        BEGIN
+            UPDATE equipment SET current_request_id = NEW.id, current_status = NEW.status
+            WHERE id = NEW.equipment_id AND (current_request_id IS NULL OR current_request_id < NEW.id);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_current_update AFTER UPDATE OF status ON requests
+        BEGIN
+            UPDATE equipment SET current_status = NEW.status
+            WHERE id = NEW.equipment_id AND current_request_id = NEW.id;
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_current_delete AFTER DELETE ON requests
+        BEGIN
+            UPDATE equipment SET
+                current_request_id = ({LATEST_REQUEST_SQL.format(column='id', equipment_id='OLD.equipment_id')}),
+                current_status = ({LATEST_REQUEST_SQL.format(column='status', equipment_id='OLD.equipment_id')})
+            WHERE id = OLD.equipment_id AND current_request_id = OLD.id;
+        END
+    """)
+
+
+def rebuild_active_requests_index(conn):
+    conn.execute("DROP INDEX IF EXISTS idx_requests_active")
+    conn.execute(INDEXES['idx_requests_active'])
+
+
+CHANGE_LOG_TABLES = {'requests': 'user_id', 'equipment': 'user_id', 'users': 'id'}
+CHANGE_LOG_KEEP = 10_000
+
+
+def add_change_log(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            user_id INTEGER,
+            operation TEXT NOT NULL
+        )
+    """)
+    for table, user_column in CHANGE_LOG_TABLES.items():
+        for event, row in [('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')]:
+            # A per-row trigger would slow bulk imports by a third; writers log new equipment themselves.
+            if table == 'equipment' and event == 'INSERT':
+                continue
+            # Password rehashes on login are not interesting to any view.
+            if table == 'users' and event == 'UPDATE':
+                event = 'UPDATE OF username, full_name, email, role'
+            operation = event.split()[0].lower()
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_log_{operation} AFTER {event} ON {table}
+                BEGIN
+                    INSERT INTO change_log (table_name, row_id, user_id, operation)
+                    VALUES ('{table}', {row}.id, {row}.{user_column}, '{operation}');
+                END
+            """)
+
+
+def log_change(conn, table, row_id, user_id, operation):
+    conn.execute(
+        "INSERT INTO change_log (table_name, row_id, user_id, operation) VALUES (?, ?, ?, ?)",
+        (table, row_id, user_id, operation)
+    )
+
+
+def check_transitions(conn, request_ids, status):
+    """Raises ValueError unless every existing request among request_ids may move to status, before any of them
+    changes; the analytics rollups count every move, so an illegal one would count a request twice."""
+    illegal = [
+        f"{request_id} ({STATUS_NAMES[current]})"
+        for request_id, current in conn.execute(
+            "SELECT id, status FROM requests WHERE id IN (SELECT value FROM json_each(?)) ORDER BY id",
+            (json.dumps(list(request_ids)),)
+        )
+        if status not in STATUS_TRANSITIONS.get(current, ())
+    ]
+    if illegal:
+        raise ValueError(f"Заявки нельзя перевести в статус «{STATUS_NAMES[status]}»: {', '.join(illegal)}.")
+
+
+RESOLUTION_BUCKETS = 48
+ROLLUP_PERIODS = [('daily', 'day', 10), ('monthly', 'month', 7)]
+HISTOGRAM_PERIODS = [('monthly', 'month', 7), ('yearly', 'year', 4)]
+REQUEST_EQUIPMENT_TYPE = "coalesce((SELECT equipment_type FROM equipment WHERE id = {row}.equipment_id), '')"
+# How rollups read dates and statuses: as text up to schema version 6, as epochs and status codes after it.
+TEXT_SCHEMA_SQL = {
+    'day': "substr({column}, 1, {length})",
+    'seconds': "(julianday({end}) - julianday({start})) * 86400",
+    'now': "datetime('now', 'localtime')",
+    'accepted': "'Принята'",
+    'done': "'Завершена'",
+    'rejected': "'Отклонена'",
+    'active': "('В ожидании', 'Принята')",
+}
+EPOCH_SCHEMA_SQL = {
+    'day': "substr(datetime({column}, 'unixepoch', 'localtime'), 1, {length})",
+    'seconds': "({end} - {start})",
+    'now': "CAST(strftime('%s', 'now') AS INTEGER)",
+    'accepted': str(STATUS_ACCEPTED),
+    'done': str(STATUS_DONE),
+    'rejected': str(STATUS_REJECTED),
+    'active': ACTIVE_STATUS_CODES,
+}
+
+
+def rebuild_request_analytics(conn, sql=EPOCH_SCHEMA_SQL):
+    seconds = sql['seconds'].format(start='r.request_date', end='r.resolution_date')
+    for prefix, period, length in ROLLUP_PERIODS:
+        conn.execute(f"DELETE FROM {prefix}_request_stats")
+        conn.execute(f"DELETE FROM {prefix}_technician_stats")
+        conn.execute(f"""
+            INSERT INTO {prefix}_request_stats ({period}, equipment_type, created)
+            SELECT {sql['day'].format(column='r.request_date', length=length)}, eq.equipment_type, COUNT(*)
+            FROM requests r JOIN equipment eq ON eq.id = r.equipment_id
+            GROUP BY 1, 2
+        """)
+        conn.execute(f"""
+            INSERT INTO {prefix}_request_stats ({period}, equipment_type, resolved, rejected, resolution_seconds)
+            SELECT {sql['day'].format(column='coalesce(r.resolution_date, r.request_date)', length=length)},
+                   eq.equipment_type, SUM(r.status = {sql['done']}), SUM(r.status = {sql['rejected']}),
+                   coalesce(SUM(CASE WHEN r.status = {sql['done']} THEN {seconds} END), 0)
+            FROM requests r JOIN equipment eq ON eq.id = r.equipment_id
+            WHERE r.status IN ({sql['done']}, {sql['rejected']})
+            GROUP BY 1, 2
+            ON CONFLICT ({period}, equipment_type) DO UPDATE SET
+                resolved = excluded.resolved, rejected = excluded.rejected,
+                resolution_seconds = excluded.resolution_seconds
+        """)
+        conn.execute(f"""
+            INSERT INTO {prefix}_technician_stats ({period}, technician_id, accepted, rejected, resolved)
+            SELECT {sql['day'].format(column='coalesce(r.resolution_date, r.request_date)', length=length)},
+                   r.handled_by, SUM(r.status = {sql['accepted']}), SUM(r.status = {sql['rejected']}),
+                   SUM(r.status = {sql['done']})
+            FROM requests r
+            WHERE r.handled_by IS NOT NULL AND r.status IN ({sql['accepted']}, {sql['rejected']}, {sql['done']})
+            GROUP BY 1, 2
+        """)
+    for prefix, period, length in HISTOGRAM_PERIODS:
+        conn.execute(f"DELETE FROM {prefix}_resolution_histogram")
+        conn.execute(f"""
+            INSERT INTO {prefix}_resolution_histogram ({period}, equipment_type, bucket, count)
+            SELECT period, equipment_type,
+                   coalesce((SELECT MIN(bucket) FROM resolution_buckets WHERE upper_seconds >= seconds),
+                            {RESOLUTION_BUCKETS - 1}),
+                   COUNT(*)
+            FROM (
+                SELECT {sql['day'].format(column='r.resolution_date', length=length)} AS period,
+                       eq.equipment_type, {seconds} AS seconds
+                FROM requests r JOIN equipment eq ON eq.id = r.equipment_id
+                WHERE r.status = {sql['done']} AND r.resolution_date IS NOT NULL
+            )
+            GROUP BY 1, 2, 3
+        """)
+
+
+def create_request_stats_triggers(conn, sql=EPOCH_SCHEMA_SQL):
+    event_date = "coalesce(NEW.resolution_date, {now})".format(now=sql['now'])
+    seconds = sql['seconds'].format(start='NEW.request_date', end='NEW.resolution_date')
+    new_type, old_type = REQUEST_EQUIPMENT_TYPE.format(row='NEW'), REQUEST_EQUIPMENT_TYPE.format(row='OLD')
+    created, closed, removed = [], [], []
+    for prefix, period, length in ROLLUP_PERIODS:
+        created.append(f"""
+            INSERT INTO {prefix}_request_stats ({period}, equipment_type, created)
+            VALUES ({sql['day'].format(column='NEW.request_date', length=length)}, {new_type}, 1)
+            ON CONFLICT ({period}, equipment_type) DO UPDATE SET created = created + 1;
+        """)
+        closed.append(f"""
+            INSERT INTO {prefix}_request_stats ({period}, equipment_type, resolved, rejected, resolution_seconds)
+            SELECT {sql['day'].format(column=event_date, length=length)}, {new_type},
+                   NEW.status = {sql['done']}, NEW.status = {sql['rejected']},
+                   CASE WHEN NEW.status = {sql['done']} THEN coalesce({seconds}, 0) ELSE 0 END
+            WHERE NEW.status IN ({sql['done']}, {sql['rejected']})
+            ON CONFLICT ({period}, equipment_type) DO UPDATE SET
+                resolved = resolved + excluded.resolved,
+                rejected = rejected + excluded.rejected,
+                resolution_seconds = resolution_seconds + excluded.resolution_seconds;
+
+            INSERT INTO {prefix}_technician_stats ({period}, technician_id, accepted, rejected, resolved)
+            SELECT {sql['day'].format(column=event_date, length=length)}, NEW.handled_by,
+                   NEW.status = {sql['accepted']}, NEW.status = {sql['rejected']}, NEW.status = {sql['done']}
+            WHERE NEW.handled_by IS NOT NULL AND NEW.status IN ({sql['accepted']}, {sql['rejected']}, {sql['done']})
+            ON CONFLICT ({period}, technician_id) DO UPDATE SET
+                accepted = accepted + excluded.accepted,
+                rejected = rejected + excluded.rejected,
+                resolved = resolved + excluded.resolved;
+        """)
+        removed.append(f"""
+            INSERT INTO {prefix}_request_stats ({period}, equipment_type, removed)
+            VALUES ({sql['day'].format(column=sql['now'], length=length)}, {old_type}, 1)
+            ON CONFLICT ({period}, equipment_type) DO UPDATE SET removed = removed + 1;
+        """)
+    for prefix, period, length in HISTOGRAM_PERIODS:
+        closed.append(f"""
+            INSERT INTO {prefix}_resolution_histogram ({period}, equipment_type, bucket, count)
+            SELECT {sql['day'].format(column='NEW.resolution_date', length=length)}, {new_type},
+                   coalesce((SELECT MIN(bucket) FROM resolution_buckets WHERE upper_seconds >= {seconds}),
+                            {RESOLUTION_BUCKETS - 1}),
+                   1
+            WHERE NEW.status = {sql['done']} AND NEW.resolution_date IS NOT NULL
+            ON CONFLICT ({period}, equipment_type, bucket) DO UPDATE SET count = count + 1;
+        """)
+    for name, when, body in [
+        ('insert', "AFTER INSERT ON requests", created),
+        ('update', "AFTER UPDATE OF status ON requests WHEN OLD.status IS NOT NEW.status", closed),
+        ('delete', f"AFTER DELETE ON requests WHEN OLD.status IN {sql['active']}", removed),
+    ]:
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_requests_stats_{name} {when} BEGIN {''.join(body)} END")
+
+
+def add_request_analytics(conn):
+    conn.execute("ALTER TABLE requests ADD COLUMN handled_by INTEGER REFERENCES users (id) ON DELETE SET NULL")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_requests_handled_by ON requests (handled_by) WHERE handled_by IS NOT NULL")
+    # Daily rows answer short periods exactly; monthly rows keep long periods to a few hundred rows.
+    for prefix, period, _ in ROLLUP_PERIODS:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {prefix}_request_stats (
+                {period} TEXT NOT NULL,
+                equipment_type TEXT NOT NULL,
+                created INTEGER NOT NULL DEFAULT 0,
+                resolved INTEGER NOT NULL DEFAULT 0,
+                rejected INTEGER NOT NULL DEFAULT 0,
+                removed INTEGER NOT NULL DEFAULT 0,
+                resolution_seconds REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY ({period}, equipment_type)
+            ) WITHOUT ROWID
+        """)
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {prefix}_technician_stats (
+                {period} TEXT NOT NULL,
+                technician_id INTEGER NOT NULL,
+                accepted INTEGER NOT NULL DEFAULT 0,
+                rejected INTEGER NOT NULL DEFAULT 0,
+                resolved INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY ({period}, technician_id)
+            ) WITHOUT ROWID
+        """)
+    # Percentiles come from histograms of resolution times, so they are exact only to a bucket and a month.
+    for prefix, period, _ in HISTOGRAM_PERIODS:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {prefix}_resolution_histogram (
+                {period} TEXT NOT NULL,
+                equipment_type TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY ({period}, equipment_type, bucket)
+            ) WITHOUT ROWID
+        """)
+    conn.execute("CREATE TABLE IF NOT EXISTS resolution_buckets (bucket INTEGER PRIMARY KEY, upper_seconds REAL NOT NULL)")
+    conn.executemany("INSERT OR IGNORE INTO resolution_buckets (bucket, upper_seconds) VALUES (?, ?)",
+                     [(bucket, 60 * 2 ** (bucket / 2)) for bucket in range(RESOLUTION_BUCKETS)])
+    rebuild_request_analytics(conn, TEXT_SCHEMA_SQL)
+    create_request_stats_triggers(conn, TEXT_SCHEMA_SQL)
+
+
+MIGRATION_CHUNK_SIZE = 50_000
+EPOCH_TABLES = {
+    'equipment': ("""
+        CREATE TABLE IF NOT EXISTS equipment_v7 (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            equipment_type TEXT NOT NULL,
+            inventory_id INTEGER NOT NULL,
+            current_request_id INTEGER,
+            current_status INTEGER REFERENCES request_statuses (code),
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+            UNIQUE (user_id, inventory_id)
+        )
+    """, """
+        INSERT INTO equipment_v7 (id, user_id, equipment_type, inventory_id, current_request_id, current_status)
+        SELECT src.id, src.user_id, src.equipment_type, src.inventory_id, src.current_request_id, st.code
+        FROM equipment src
+        LEFT JOIN request_statuses st ON st.name = src.current_status
+    """),
+    'requests': ("""
+        CREATE TABLE IF NOT EXISTS requests_v7 (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            equipment_id INTEGER NOT NULL,
+            status INTEGER NOT NULL REFERENCES request_statuses (code),
+            request_date INTEGER NOT NULL,
+            resolution_date INTEGER,
+            handled_by INTEGER REFERENCES users (id) ON DELETE SET NULL,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+            FOREIGN KEY (equipment_id) REFERENCES equipment (id) ON DELETE CASCADE
+        )
+    """, """
+        INSERT INTO requests_v7 (id, user_id, equipment_id, status, request_date, resolution_date, handled_by)
+        SELECT src.id, src.user_id, src.equipment_id, st.code,
+               CAST(strftime('%s', src.request_date, 'utc') AS INTEGER),
+               CAST(strftime('%s', src.resolution_date, 'utc') AS INTEGER),
+               src.handled_by
+        FROM requests src
+        LEFT JOIN request_statuses st ON st.name = src.status
+    """),
+}
+
+
+def convert_to_epoch_and_status_codes(db, chunk_size=MIGRATION_CHUNK_SIZE):
+    """Rewrites requests and equipment with epoch dates and status codes, a chunk per transaction.
+
+    The copies are built next to the live tables, so the application keeps working and an interrupted
+    run resumes where it stopped; rows written meanwhile are found through change_log at the swap.
+    """
+    with db.transaction() as conn:
+        if db.schema_version() > 6:
+            return
+        conn.execute("CREATE TABLE IF NOT EXISTS request_statuses (code INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL)")
+        conn.executemany("INSERT OR IGNORE INTO request_statuses (code, name) VALUES (?, ?)", STATUS_NAMES.items())
+        conn.execute("CREATE TABLE IF NOT EXISTS migration_state (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        conn.execute("INSERT OR IGNORE INTO migration_state (name, value) "
+                     "VALUES ('change_log_seq', (SELECT coalesce(MAX(seq), 0) FROM change_log))")
+        for create, _ in EPOCH_TABLES.values():
+            conn.execute(create)
+
+    def copy_chunk(conn, table, limit=-1):
+        insert = EPOCH_TABLES[table][1]
+        return conn.execute(f"{insert} WHERE src.id > (SELECT coalesce(MAX(id), 0) FROM {table}_v7) "
+                            f"ORDER BY src.id LIMIT ?", (limit,)).rowcount
+
+    for table in EPOCH_TABLES:
+        while True:
+            with db.transaction() as conn:
+                if db.schema_version() > 6:
+                    return
+                if copy_chunk(conn, table, chunk_size) < chunk_size:
+                    break
+
+    # The swap briefly leaves requests pointing at a dropped table, which foreign_keys would refuse.
+    conn = db.pool.connection()
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        with db.transaction() as conn:
+            if db.schema_version() > 6:
+                return
+            start = conn.execute("SELECT value FROM migration_state WHERE name = 'change_log_seq'").fetchone()[0]
+            oldest = conn.execute("SELECT MIN(seq) FROM change_log").fetchone()[0]
+            if oldest is not None and oldest > start + 1:
+                # The log was pruned past the start, so the rows changed meanwhile are unknown: copy all again.
+                for table in EPOCH_TABLES:
+                    conn.execute(f"DELETE FROM {table}_v7")
+            for table, (_, insert) in EPOCH_TABLES.items():
+                copy_chunk(conn, table)
+                changed = json.dumps([row[0] for row in conn.execute(
+                    "SELECT DISTINCT row_id FROM change_log WHERE seq > ? AND table_name = ?", (start, table)
+                )])
+                conn.execute(f"DELETE FROM {table}_v7 WHERE id IN (SELECT value FROM json_each(?))", (changed,))
+                conn.execute(f"{insert} WHERE src.id IN (SELECT value FROM json_each(?))", (changed,))
+                conn.execute("UPDATE sqlite_sequence SET seq = max(seq, (SELECT seq FROM sqlite_sequence WHERE name = ?)) "
+                             "WHERE name = ?", (table, f"{table}_v7"))
+            for table in EPOCH_TABLES:
+                conn.execute(f"DROP TABLE {table}")
+            for table in EPOCH_TABLES:
+                conn.execute(f"ALTER TABLE {table}_v7 RENAME TO {table}")
+            create_indexes(conn)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_requests_handled_by ON requests (handled_by) "
+                         "WHERE handled_by IS NOT NULL")
+            create_current_status_triggers(conn)
+            add_change_log(conn)
+            create_request_stats_triggers(conn)
+            broken = conn.execute("PRAGMA foreign_key_check").fetchone()
+            if broken:
+                raise sqlite3.IntegrityError(f"нарушение внешнего ключа после миграции: {tuple(broken)}")
+            conn.execute("DROP TABLE migration_state")
+            conn.execute("PRAGMA user_version = 7")
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON")
+
+
+SEARCH_COLUMNS = "username, full_name, email, equipment_type, inventory_id"
+SEARCH_PREFIX_LENGTHS = range(1, 8)
+SEARCH_WORD = re.compile(r'[^\W_]+')
+# Imported rows are indexed once the import has sent no chunk for this long, in slices of SEARCH_INDEX_SLICE rows.
+SEARCH_INDEX_DELAY = 0.5
+SEARCH_INDEX_SLICE = 20000
+
+
+def search_query(text):
+    """Turns typed text into an FTS5 query in which every word must match.
+
+    Words are split the way the index tokenizer splits them, so "ivanov@corp" is two words. The last word
+    is still being typed and matches as a prefix, and so do earlier words short enough for a prefix index.
+    A longer finished word matches whole: FTS5 answers a prefix without its own index by merging the
+    postings of every term it expands to, which on a common word costs tens of milliseconds.
+    """
+    words = SEARCH_WORD.findall(text)
+    return ' '.join(
+        f'"{word}"*' if i == len(words) - 1 or len(word) <= SEARCH_PREFIX_LENGTHS[-1] else f'"{word}"'
+        for i, word in enumerate(words)
+    ) or None
+
+
+def index_equipment(conn, where, params=()):
+    conn.execute(f"""
+        INSERT INTO equipment_search (rowid, {SEARCH_COLUMNS})
+        SELECT eq.id, u.username, u.full_name, u.email, eq.equipment_type, eq.inventory_id
+        FROM equipment eq
+        JOIN users u ON u.id = eq.user_id
+        WHERE {where}
+    """, params)
+
+
+def add_search_index(conn):
+    # One row per piece of equipment with its owner's names, so a query can mix a person and an inventory ID.
+    # Prefixes up to a typical word's length get their own index, see search_query(). Searches never need
+    # word positions, and leaving them out halves both the index and the time to build it.
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS equipment_search
+        USING fts5({SEARCH_COLUMNS}, detail=none, prefix='{' '.join(map(str, SEARCH_PREFIX_LENGTHS))}')
+    """)
+    index_equipment(conn, "1")
+    # FTS5 flushes its pending terms at every statement savepoint, so a per-row insert trigger made bulk imports
+    # ten times slower; like change_log, writers index new equipment themselves with index_equipment(), and
+    # imports leave theirs to DatabaseManager._index_search_backlog().
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_equipment_search_update
+        AFTER UPDATE OF user_id, equipment_type, inventory_id ON equipment
+        BEGIN
+            DELETE FROM equipment_search WHERE rowid = OLD.id;
+            INSERT INTO equipment_search (rowid, {SEARCH_COLUMNS})
+            SELECT NEW.id, u.username, u.full_name, u.email, NEW.equipment_type, NEW.inventory_id
+            FROM users u WHERE u.id = NEW.user_id;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_equipment_search_delete AFTER DELETE ON equipment
+        BEGIN
+            DELETE FROM equipment_search WHERE rowid = OLD.id;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_users_search_update AFTER UPDATE OF username, full_name, email ON users
+        BEGIN
+            UPDATE equipment_search SET username = NEW.username, full_name = NEW.full_name, email = NEW.email
+            WHERE rowid IN (SELECT id FROM equipment WHERE user_id = NEW.id);
+        END
+    """)
+
+
+ASSIGNMENT_INDEXES = {
+    # A technician's own queue and load; also serves the ON DELETE SET NULL lookup when a technician is removed.
+    'idx_requests_assigned': (
+        "CREATE INDEX IF NOT EXISTS idx_requests_assigned ON requests (assigned_to, status, request_date, id) "
+        "WHERE assigned_to IS NOT NULL"
+    ),
+    'idx_requests_unassigned': (
+        "CREATE INDEX IF NOT EXISTS idx_requests_unassigned ON requests (request_date, id, equipment_id) "
+        f"WHERE status = {STATUS_PENDING} AND assigned_to IS NULL"
+    ),
+    # Replaces the plain handled_by index, so equipment-type affinity reads only the recent resolutions.
+    'idx_requests_handled_by': (
+        "CREATE INDEX IF NOT EXISTS idx_requests_handled_by ON requests (handled_by, resolution_date) "
+        "WHERE handled_by IS NOT NULL"
+    ),
+}
+
+
+def add_request_assignment(conn):
+    conn.execute("ALTER TABLE requests ADD COLUMN assigned_to INTEGER REFERENCES users (id) ON DELETE SET NULL")
+    # An accepted request already belongs to whoever accepted it.
+    conn.execute(f"UPDATE requests SET assigned_to = handled_by WHERE status = {STATUS_ACCEPTED}")
+    conn.execute("DROP INDEX IF EXISTS idx_requests_handled_by")
+    for sql in ASSIGNMENT_INDEXES.values():
+        conn.execute(sql)
+
+
+def add_search_backlog(conn):
+    # Id ranges of imported equipment that equipment_search does not cover yet.
+    conn.execute("CREATE TABLE IF NOT EXISTS search_backlog (first_id INTEGER NOT NULL, last_id INTEGER NOT NULL)")
+
+
+def add_request_date_index(conn):
+    # History exports pick a date range across every status; the other request indexes are partial.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_requests_date ON requests (request_date)")
+
+
+MIGRATIONS = [
+    create_base_schema,
+    create_indexes,
+    add_current_status,
+    rebuild_active_requests_index,
+    add_change_log,
+    add_request_analytics,
+    convert_to_epoch_and_status_codes,
+    add_search_index,
+    add_request_assignment,
+    add_search_backlog,
+    add_request_date_index,
+]
+# These take the DatabaseManager and commit as they go instead of running inside migrate()'s transaction.
+CHUNKED_MIGRATIONS = {convert_to_epoch_and_status_codes}
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+class RequestAnalytics:
+    def __init__(self, pool, daily_limit=92):
+        self.pool = pool
+        self.daily_limit = daily_limit
+        self.bounds = None
+
+    def start_day(self, days):
+        return '' if days is None else (date.today() - timedelta(days=days - 1)).isoformat()
+
+    def rollup(self, table, columns, start):
+        """Rows of a rollup from start on: daily rows up to the next month, monthly rows after it."""
+        next_month = ''
+        if start:
+            year, month = int(start[:4]), int(start[5:7])
+            next_month = f"{year + month // 12:04d}-{month % 12 + 1:02d}"
+        return f"""
+            SELECT {columns} FROM daily_{table} WHERE day >= ? AND day < ?
+            UNION ALL
+            SELECT {columns} FROM monthly_{table} WHERE month >= ?
+        """, (start, next_month + '-01' if next_month else '', next_month)
+
+    def histogram_rollup(self, start):
+        next_year = f"{int(start[:4]) + 1:04d}" if start else ''
+        return """
+            SELECT equipment_type, bucket, count FROM monthly_resolution_histogram WHERE month >= ? AND month < ?
+            UNION ALL
+            SELECT equipment_type, bucket, count FROM yearly_resolution_histogram WHERE year >= ?
+        """, (start[:7], next_year + '-01' if next_year else '', next_year)
+
+    def bucket_bounds(self):
+        if self.bounds is None:
+            self.bounds = [row[0] for row in self.pool.connection().execute(
+                "SELECT upper_seconds FROM resolution_buckets ORDER BY bucket"
+            )]
+        return self.bounds
+
+    def percentile(self, counts, fraction):
+        bounds = self.bucket_bounds()
+        target = fraction * sum(count for _, count in counts)
+        seen = 0
+        for bucket, count in counts:
+            if seen + count >= target:
+                lower = bounds[bucket - 1] if bucket else 0
+                return lower + (bounds[bucket] - lower) * (target - seen) / count
+            seen += count
+        return None
+
+    def resolution_times(self, days=None, percentiles=(0.5, 0.9)):
+        start = self.start_day(days)
+        conn = self.pool.connection()
+        histograms = {}
+        # Percentiles are taken over whole months, the mean over exactly the requested days.
+        sql, params = self.histogram_rollup(start)
+        for equipment_type, bucket, count in conn.execute(f"""
+            SELECT equipment_type, bucket, SUM(count)
+            FROM ({sql})
+            GROUP BY equipment_type, bucket
+            ORDER BY equipment_type, bucket
+        """, params):
+            histograms.setdefault(equipment_type, []).append((bucket, count))
+        sql, params = self.rollup('request_stats', "equipment_type, resolved, resolution_seconds", start)
+        return [
+            (equipment_type, resolved, seconds / resolved,
+             *(self.percentile(histograms.get(equipment_type, []), fraction) for fraction in percentiles))
+            for equipment_type, resolved, seconds in conn.execute(f"""
+                SELECT equipment_type, SUM(resolved), SUM(resolution_seconds)
+                FROM ({sql})
+                WHERE equipment_type != ''
+                GROUP BY equipment_type
+                HAVING SUM(resolved) > 0
+                ORDER BY equipment_type
+            """, params)
+        ]
+
+    def backlog(self, days=None):
+        conn = self.pool.connection()
+        start = self.start_day(days)
+        delta = "SUM(created - resolved - rejected - removed)"
+        if days is None or days > self.daily_limit:
+            return conn.execute(f"""
+                SELECT month, backlog FROM (
+                    SELECT month, SUM({delta}) OVER (ORDER BY month) AS backlog
+                    FROM monthly_request_stats
+                    GROUP BY month
+                )
+                WHERE month >= ?
+                ORDER BY month
+            """, (start[:7],)).fetchall()
+        backlog = conn.execute(f"""
+            SELECT coalesce((SELECT {delta} FROM monthly_request_stats WHERE month < ?), 0)
+                 + coalesce((SELECT {delta} FROM daily_request_stats WHERE day >= ? AND day < ?), 0)
+        """, (start[:7], start[:7] + '-01', start)).fetchone()[0]
+        series = []
+        for day, change in conn.execute(f"""
+            SELECT day, {delta} FROM daily_request_stats WHERE day >= ? GROUP BY day ORDER BY day
+        """, (start,)):
+            backlog += change
+            series.append((day, backlog))
+        return series
+
+    def technician_throughput(self, days=None):
+        sql, params = self.rollup('technician_stats', "technician_id, accepted, rejected, resolved",
+                                  self.start_day(days))
+        return self.pool.connection().execute(f"""
+            SELECT coalesce(u.full_name, 'Удаленный техник'), s.accepted, s.rejected, s.resolved
+            FROM (
+                SELECT technician_id, SUM(accepted) AS accepted, SUM(rejected) AS rejected, SUM(resolved) AS resolved
+                FROM ({sql})
+                GROUP BY technician_id
+            ) s
+            LEFT JOIN users u ON u.id = s.technician_id
+            ORDER BY s.resolved DESC, s.accepted DESC
+        """, params).fetchall()
+
+    def summary(self, days=None):
+        return {
+            'resolution_times': self.resolution_times(days),
+            'backlog': self.backlog(days),
+            'technicians': self.technician_throughput(days),
+        }
+
+
+class RequestScheduler:
+    """Spreads pending requests over technicians: the oldest first, each to the least loaded technician.
+
+    A technician who has recently resolved much of a type counts as up to affinity_weight requests less
+    loaded for it. The bonus halves once a request has waited aging_hours, so an old request goes to
+    whoever is free rather than waiting for a specialist. Nobody is given more than max_load active requests;
+    the rest stay in the shared queue for claim_next_request().
+    """
+
+    def __init__(self, max_load=10, affinity_weight=3.0, aging_hours=24.0, affinity_days=90):
+        self.max_load = max_load
+        self.affinity_weight = affinity_weight
+        self.aging_hours = aging_hours
+        self.affinity_days = affinity_days
+
+    def plan(self, requests, loads, affinity, now):
+        """Takes (request_id, equipment_type, request_date) oldest first, the active request count per technician
+        and {(technician_id, equipment_type): share of resolved}; returns (request_id, technician_id) pairs."""
+        loads = dict(loads)
+        assignments = []
+        for request_id, equipment_type, request_date in requests:
+            free = [technician_id for technician_id, load in loads.items() if load < self.max_load]
+            if not free:
+                break
+            weight = self.affinity_weight * self.aging_hours / (self.aging_hours + max(now - request_date, 0) / 3600)
+            technician_id = min(free, key=lambda t: (loads[t] - weight * affinity.get((t, equipment_type), 0), t))
+            loads[technician_id] += 1
+            assignments.append((request_id, technician_id))
+        return assignments
+
+
+# Not timed when metrics are on, see DatabaseManager.__init__: these are answered from the query cache, and the
+# change feed polls data_version and latest_change several times a second whether or not anything changed.
+UNTIMED_METHODS = {
+    'get_user_equipment', 'get_all_active_requests', 'get_active_requests_page', 'get_assigned_requests',
+    'get_all_technicians', 'data_version', 'latest_change',
+}
+
+
+class DatabaseManager:
+    def __init__(self, db_name='office_system.db', retry_attempts=6, retry_delay=0.02, password_hasher=None,
+                 auth_cache_size=256, auth_cache_ttl=300.0, kdf_workers=None, query_cache_size=512, scheduler=None,
+                 metrics=None, **pool_options):
+        self.db_name = db_name
+        self.retry_attempts = retry_attempts
+        self.retry_delay = retry_delay
+        self.hasher = password_hasher or PasswordHasher()
+        self.auth_cache = VerificationCache(auth_cache_size, auth_cache_ttl)
+        self.cache = QueryCache(query_cache_size, metrics)
+        self.kdf_pool = ThreadPoolExecutor(max_workers=kdf_workers or os.cpu_count() or 1,
+                                           thread_name_prefix='kdf')
+        self.search_indexer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='search-index')
+        self._index_lock = threading.Lock()
+        self._index_due = None
+        self._closing = threading.Event()
+        self.metrics = metrics
+        self.pool = ConnectionPool(db_name, metrics=metrics, **pool_options)
+        self.analytics = RequestAnalytics(self.pool)
+        self.scheduler = scheduler or RequestScheduler()
+        self.migrate()
+        self.prune_changes()
+        if self.pool.connection().execute("SELECT 1 FROM search_backlog LIMIT 1").fetchone():
+            # Left by an import that was running when the previous process died.
+            self._schedule_search_index()
+        if metrics:
+            # These calls are most of all calls and take microseconds, so timing them would cost more than they
+            # do; the cache times the queries it runs on a miss instead.
+            metrics.instrument(self, 'db.', self.pool, skip=UNTIMED_METHODS)
+            metrics.instrument(self.analytics, 'db.analytics.', self.pool)
+
+    def transaction(self, immediate=True):
+        return self.pool.transaction(immediate)
+
+    def close(self):
+        # Indexes what is left of the backlog without waiting out the delay.
+        self._closing.set()
+        self.search_indexer.shutdown()
+        self.kdf_pool.shutdown()
+        self.pool.close()
+
+    def cache_stats(self):
+        return self.cache.stats()
+
+    def batch(self, calls):
+        """Runs (method name, args) pairs in order; RemoteDatabase.batch sends the same calls in one request."""
+        results = []
+        for method, args in calls:
+            target, _, attribute = method.rpartition('.')
+            results.append(getattr(self.analytics if target == 'analytics' else self, attribute)(*args))
+        return results
+
+    @retry_on_busy
+    def rebuild_analytics(self):
+        with self.transaction() as conn:
+            rebuild_request_analytics(conn)
+
+    def data_version(self):
+        return self.pool.connection().execute("PRAGMA data_version").fetchone()[0]
+
+    def latest_change(self):
+        return self.pool.connection().execute("SELECT MAX(seq) FROM change_log").fetchone()[0] or 0
+
+    def changes_since(self, seq, limit=1000):
+        conn = self.pool.connection()
+        oldest, latest = conn.execute(
+            "SELECT (SELECT MIN(seq) FROM change_log), (SELECT MAX(seq) FROM change_log)"
+        ).fetchone()
+        if latest is None or latest == seq:
+            return seq, []
+        # The log was pruned past seq, or there is more to replay than a reload costs.
+        if latest < seq or oldest > seq + 1 or latest - seq > limit:
+            return latest, None
+        return latest, conn.execute(
+            "SELECT seq, table_name, row_id, user_id, operation FROM change_log WHERE seq > ? AND seq <= ? ORDER BY seq",
+            (seq, latest)
+        ).fetchall()
+
+    def forget_changes(self, changes):
+        if changes is None:
+            self.cache.clear()
+            return
+        tags = set()
+        for _, table, _, user_id, _ in changes:
+            if table == 'equipment':
+                tags.add(('user_equipment', user_id))
+            elif table == 'users':
+                tags.add('technicians')
+            tags.add('active_requests')
+        if tags:
+            self.cache.invalidate(*tags)
+
+    @retry_on_busy
+    def prune_changes(self, keep=CHANGE_LOG_KEEP):
+        conn = self.pool.connection()
+        oldest, latest = conn.execute(
+            "SELECT (SELECT MIN(seq) FROM change_log), (SELECT MAX(seq) FROM change_log)"
+        ).fetchone()
+        if latest is None or latest - oldest < 2 * keep:
+            return 0
+        with self.transaction() as conn:
+            return conn.execute("DELETE FROM change_log WHERE seq <= ?", (latest - keep,)).rowcount
+
+    def equipment_owners(self, conn, equipment_ids):
+        return [('user_equipment', row[0]) for row in conn.execute(
+            "SELECT DISTINCT user_id FROM equipment WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(list(equipment_ids)),)
+        )]
+
+    def request_owners(self, conn, where, params):
+        return [('user_equipment', row[0]) for row in conn.execute(f"""
+            SELECT DISTINCT eq.user_id
+            FROM requests r
+            JOIN equipment eq ON eq.id = r.equipment_id
+            WHERE {where}
+        """, params)]
+
+    def schema_version(self):
+        return self.pool.connection().execute("PRAGMA user_version").fetchone()[0]
+
+    @retry_on_busy
+    def migrate(self):
+        if self.schema_version() >= SCHEMA_VERSION:
+            return
+        while self.schema_version() < SCHEMA_VERSION:
+            migration = MIGRATIONS[self.schema_version()]
+            if migration in CHUNKED_MIGRATIONS:
+                migration(self)
+                continue
+            with self.transaction() as conn:
+                version = self.schema_version()
+                while version < SCHEMA_VERSION and MIGRATIONS[version] not in CHUNKED_MIGRATIONS:
+                    MIGRATIONS[version](conn)
+                    version += 1
+                    conn.execute(f"PRAGMA user_version = {version}")
+        self.cache.clear()
+
+    def create_user(self, username, password, full_name, email, role='Сотрудник'):
+        password_hash = self.kdf_pool.submit(self.hasher.hash, password).result()
+        return self.insert_user(username, password_hash, full_name, email, role)
+
+    @retry_on_busy
+    def insert_user(self, username, password_hash, full_name, email, role):
+        try:
+            with self.transaction() as conn:
+                cursor = conn.execute(
+                    'INSERT INTO users (username, password, full_name, email, role) VALUES (?, ?, ?, ?, ?)',
+                    (username, password_hash, full_name, email, role)
+                )
+            if role == 'Техник':
+                self.cache.invalidate('technicians')
+            return cursor.lastrowid
+        except sqlite3.IntegrityError:
+            return None
+
+    def get_user_by_username(self, username):
+        cursor = self.pool.connection().cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute('SELECT * FROM users WHERE username = ?', (username,))
+        return cursor.fetchone()
+
+    def authenticate_user(self, username, password, rehash=None):
+        """rehash(user_id, old_hash, new_hash), if given, stores an upgraded hash instead of update_password_hash(),
+        for callers that keep writes on a thread of their own; the returned row then still has the old hash."""
+        user = self.get_user_by_username(username)
+        if user is None:
+            return None
+        if self.auth_cache.check(username, password, user['password']):
+            return user
+        ok, needs_rehash = self.kdf_pool.submit(self.hasher.verify, password, user['password']).result()
+        if not ok:
+            return None
+        if needs_rehash:
+            new_hash = self.kdf_pool.submit(self.hasher.hash, password).result()
+            if rehash is not None:
+                rehash(user['id'], user['password'], new_hash)
+            elif self.update_password_hash(user['id'], user['password'], new_hash):
+                user = self.get_user_by_username(username)
+        self.auth_cache.put(username, password, user['password'])
+        return user
+
+    @retry_on_busy
+    def update_password_hash(self, user_id, old_hash, new_hash):
+        with self.transaction() as conn:
+            return conn.execute(
+                "UPDATE users SET password = ? WHERE id = ? AND password = ?", (new_hash, user_id, old_hash)
+            ).rowcount == 1
+
+    @retry_on_busy
+    def add_equipment(self, user_id, equipment_type, inventory_id):
+        try:
+            with self.transaction() as conn:
+                cursor = conn.execute(
+                    "INSERT INTO equipment (user_id, equipment_type, inventory_id) VALUES (?, ?, ?)",
+                    (user_id, equipment_type, inventory_id)
+                )
+                log_change(conn, 'equipment', cursor.lastrowid, user_id, 'insert')
+                index_equipment(conn, "eq.id = ?", (cursor.lastrowid,))
+            self.cache.invalidate(('user_equipment', user_id))
+            return self.get_equipment(cursor.lastrowid)
+        except sqlite3.IntegrityError:
+            return None
+
+    def get_equipment(self, equipment_id):
+        return self.pool.connection().execute(
+            f"SELECT {EQUIPMENT_COLUMNS} {EQUIPMENT_JOINS} WHERE eq.id = ?", (equipment_id,)
+        ).fetchone()
+
+    def get_equipment_rows(self, equipment_ids):
+        return self.pool.connection().execute(f"""
+            SELECT {EQUIPMENT_COLUMNS}
+            {EQUIPMENT_JOINS}
+            WHERE eq.id IN (SELECT value FROM json_each(?))
+        """, (json.dumps(list(equipment_ids)),)).fetchall()
+
+    def get_user_equipment(self, user_id):
+        return self.cache.get(('user_equipment', user_id), lambda: self.pool.connection().execute(f"""
+            SELECT {EQUIPMENT_COLUMNS}
+            {EQUIPMENT_JOINS}
+            WHERE eq.user_id = ?
+            ORDER BY eq.equipment_type
+        """, (user_id,)).fetchall())
+
+    @retry_on_busy
+    def create_replacement_request(self, user_id, equipment_id):
+        with self.transaction() as conn:
+            # As in the employee screen: only the equipment's latest request can be active.
+            current = conn.execute("SELECT current_status FROM equipment WHERE id = ?", (equipment_id,)).fetchone()
+            if current is None:
+                raise ValueError(f"Оборудование {equipment_id} не найдено.")
+            if current[0] in (STATUS_PENDING, STATUS_ACCEPTED):
+                raise ValueError(f"На оборудование {equipment_id} уже есть активная заявка.")
+            conn.execute(
+                "INSERT INTO requests (user_id, equipment_id, status, request_date) VALUES (?, ?, ?, ?)",
+                (user_id, equipment_id, STATUS_PENDING, int(time.time()))
+            )
+            owners = self.equipment_owners(conn, [equipment_id])
+        self.cache.invalidate('active_requests', *owners)
+        return self.get_equipment(equipment_id)
+
+    def get_request(self, request_id):
+        return self.pool.connection().execute(f"""
+            SELECT {REQUEST_COLUMNS}
+            {REQUEST_JOINS}
+            WHERE r.id = ?
+        """, (request_id,)).fetchone()
+
+    def get_all_active_requests(self):
+        return self.cache.get('active_requests', lambda: self.pool.connection().execute(f"""
+            SELECT {REQUEST_COLUMNS}
+            {REQUEST_JOINS}
+            WHERE r.status IN {ACTIVE_STATUS_CODES}
+            ORDER BY r.request_date, r.id
+        """).fetchall())
+
+    def get_active_requests_page(self, after=None, limit=200):
+        if after is None:
+            after = (0, 0)
+        key = ('active_requests_page', tuple(after), limit)
+        return self.cache.get(key, lambda: self.pool.connection().execute(f"""
+            SELECT {REQUEST_COLUMNS}
+            {REQUEST_JOINS}
+            WHERE r.status IN {ACTIVE_STATUS_CODES} AND (r.request_date, r.id) > (?, ?)
+            ORDER BY r.request_date, r.id
+            LIMIT ?
+        """, (*after, limit)).fetchall(), tags=('active_requests',))
+
+    def search_equipment(self, user_id, text, limit=50):
+        query = search_query(text)
+        if query is None:
+            return []
+        # The user's own equipment is the outer loop, each row is then looked up in the index by rowid.
+        return self.pool.connection().execute(f"""
+            SELECT {EQUIPMENT_COLUMNS}
+            {EQUIPMENT_JOINS}
+            CROSS JOIN equipment_search ON equipment_search.rowid = eq.id
+            WHERE eq.user_id = ? AND equipment_search MATCH ?
+            ORDER BY eq.equipment_type
+            LIMIT ?
+        """, (user_id, query, limit)).fetchall()
+
+    def search_active_requests(self, text, limit=50):
+        query = search_query(text)
+        if query is None:
+            return []
+        # Matches are walked in index order and stop at the limit; only the equipment's latest request can be active.
+        # An ORDER BY in SQL would have to see every match first, so the few rows found are sorted here instead.
+        rows = self.pool.connection().execute(f"""
+            SELECT {REQUEST_COLUMNS}
+            FROM equipment_search
+            CROSS JOIN equipment eq ON eq.id = equipment_search.rowid
+            JOIN requests r ON r.id = eq.current_request_id
+            JOIN users u ON u.id = r.user_id
+            JOIN request_statuses st ON st.code = r.status
+            LEFT JOIN users a ON a.id = r.assigned_to
+            WHERE equipment_search MATCH ? AND eq.current_status IN {ACTIVE_STATUS_CODES}
+            LIMIT ?
+        """, (query, limit)).fetchall()
+        return sorted(rows, key=lambda row: (row[5], row[0]))
+
+    def get_assigned_requests(self, technician_id):
+        return self.cache.get(('assigned_requests', technician_id), lambda: self.pool.connection().execute(f"""
+            SELECT {REQUEST_COLUMNS}
+            {REQUEST_JOINS}
+            WHERE r.assigned_to = ? AND r.status IN {ACTIVE_STATUS_CODES}
+            ORDER BY r.request_date, r.id
+        """, (technician_id,)).fetchall(), tags=('active_requests',))
+
+    def technician_loads(self, conn, technician_ids):
+        return {technician_id: conn.execute(
+            f"SELECT COUNT(*) FROM requests WHERE assigned_to = ? AND status IN {ACTIVE_STATUS_CODES}",
+            (technician_id,)
+        ).fetchone()[0] for technician_id in technician_ids}
+
+    def technician_affinity(self, conn, technician_ids, since):
+        resolved = {}
+        for technician_id, equipment_type, count in conn.execute(f"""
+            SELECT r.handled_by, eq.equipment_type, COUNT(*)
+            FROM requests r
+            JOIN equipment eq ON eq.id = r.equipment_id
+            WHERE r.handled_by IN (SELECT value FROM json_each(?)) AND r.status = {STATUS_DONE}
+              AND r.resolution_date >= ?
+            GROUP BY r.handled_by, eq.equipment_type
+        """, (json.dumps(list(technician_ids)), since)):
+            resolved.setdefault(technician_id, {})[equipment_type] = count
+        return {(technician_id, equipment_type): count / sum(counts.values())
+                for technician_id, counts in resolved.items() for equipment_type, count in counts.items()}
+
+    @retry_on_busy
+    def schedule_requests(self):
+        """Assigns pending unassigned requests to technicians with RequestScheduler; returns how many were assigned."""
+        technician_ids = [row[0] for row in self.get_all_technicians()]
+        if not technician_ids:
+            return 0
+        now = int(time.time())
+        scheduler = self.scheduler
+        # Affinity changes slowly, so it is read before taking the write lock.
+        since = now - scheduler.affinity_days * 86400
+        affinity = self.technician_affinity(self.pool.connection(), technician_ids, since)
+        with self.transaction() as conn:
+            loads = self.technician_loads(conn, technician_ids)
+            capacity = sum(max(scheduler.max_load - load, 0) for load in loads.values())
+            if not capacity:
+                return 0
+            requests = conn.execute(f"""
+                SELECT r.id, eq.equipment_type, r.request_date
+                FROM requests r
+                JOIN equipment eq ON eq.id = r.equipment_id
+                WHERE r.status = {STATUS_PENDING} AND r.assigned_to IS NULL
+                ORDER BY r.request_date, r.id
+                LIMIT ?
+            """, (capacity,)).fetchall()
+            if not requests:
+                return 0
+            assignments = scheduler.plan(requests, loads, affinity, now)
+            conn.executemany("UPDATE requests SET assigned_to = ? WHERE id = ?",
+                             [(technician_id, request_id) for request_id, technician_id in assignments])
+            owners = self.request_owners(conn, "r.id IN (SELECT value FROM json_each(?))",
+                                         (json.dumps([request_id for request_id, _ in assignments]),))
+        self.cache.invalidate('active_requests', *owners)
+        return len(assignments)
+
+    @retry_on_busy
+    def claim_next_request(self, technician_id):
+        """Accepts the oldest request assigned to the technician, or else the oldest unassigned one.
+
+        BEGIN IMMEDIATE holds the write lock from the first read, so two technicians, in this process or another,
+        never see the same request as free; the loser of a race simply waits and takes the next one.
+        """
+        with self.transaction() as conn:
+            row = conn.execute(f"""
+                SELECT id FROM requests
+                WHERE assigned_to = ? AND status = {STATUS_PENDING}
+                ORDER BY request_date, id
+                LIMIT 1
+            """, (technician_id,)).fetchone() or conn.execute(f"""
+                SELECT id FROM requests
+                WHERE status = {STATUS_PENDING} AND assigned_to IS NULL
+                ORDER BY request_date, id
+                LIMIT 1
+            """).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE requests SET status = ?, resolution_date = ?, handled_by = ?, assigned_to = ? WHERE id = ?",
+                (STATUS_ACCEPTED, int(time.time()), technician_id, technician_id, row[0])
+            )
+            owners = self.request_owners(conn, "r.id = ?", (row[0],))
+        self.cache.invalidate('active_requests', *owners)
+        return self.get_request(row[0])
+
+    def get_requests(self, request_ids):
+        return self.pool.connection().execute(f"""
+            SELECT {REQUEST_COLUMNS}
+            {REQUEST_JOINS}
+            WHERE r.id IN (SELECT value FROM json_each(?))
+        """, (json.dumps(list(request_ids)),)).fetchall()
+
+    def update_request_status(self, request_id, new_status, technician_id=None):
+        rows = self.update_request_statuses([request_id], new_status, technician_id)
+        return rows[0] if rows else None
+
+    @retry_on_busy
+    def update_request_statuses(self, request_ids, new_status, technician_id=None):
+        status, date = STATUS_CODES[new_status], int(time.time())
+        # Accepting a request makes the technician its owner, whoever it was assigned to before.
+        assignee = technician_id if status == STATUS_ACCEPTED else None
+        with self.transaction() as conn:
+            check_transitions(conn, request_ids, status)
+            conn.executemany(
+                "UPDATE requests SET status = ?, resolution_date = ?, handled_by = coalesce(?, handled_by), "
+                "assigned_to = coalesce(?, assigned_to) WHERE id = ?",
+                [(status, date, technician_id, assignee, request_id) for request_id in request_ids]
+            )
+            owners = self.request_owners(conn, "r.id IN (SELECT value FROM json_each(?))",
+                                         (json.dumps(list(request_ids)),))
+        self.cache.invalidate('active_requests', *owners)
+        return self.get_requests(request_ids)
+
+    def resolve_request(self, request_id, new_inventory_id, technician_id=None):
+        rows = self.resolve_requests([(request_id, new_inventory_id)], technician_id)
+        return rows[0] if rows else None
+
+    @retry_on_busy
+    def resolve_requests(self, resolutions, technician_id=None):
+        new_ids = dict(resolutions)
+        with self.transaction() as conn:
+            equipment = conn.execute(
+                "SELECT id, equipment_id FROM requests WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(list(new_ids)),)
+            ).fetchall()
+            if not equipment:
+                return []
+            check_transitions(conn, new_ids, STATUS_DONE)
+            for request_id, equipment_id in equipment:
+                try:
+                    conn.execute("UPDATE equipment SET inventory_id = ? WHERE id = ?", (new_ids[request_id], equipment_id))
+                except sqlite3.IntegrityError:
+                    raise ValueError(
+                        f"Заявка {request_id}: у сотрудника уже есть оборудование с ID {new_ids[request_id]}."
+                    ) from None
+            date = int(time.time())
+            conn.executemany(
+                "UPDATE requests SET status = ?, resolution_date = ?, handled_by = coalesce(?, handled_by) WHERE id = ?",
+                [(STATUS_DONE, date, technician_id, request_id) for request_id, _ in equipment]
+            )
+            owners = self.equipment_owners(conn, [equipment_id for _, equipment_id in equipment])
+        self.cache.invalidate('active_requests', *owners)
+        return self.get_requests(request_id for request_id, _ in equipment)
+
+    def import_equipment(self, user_id, records, chunk_size=20000, progress=None):
+        imported, errors, chunk = 0, [], []
+        for line_no, record in records:
+            try:
+                equipment_type, inventory_id = parse_equipment_record(record)
+            except ValueError as e:
+                errors.append((line_no, str(e)))
+                continue
+            chunk.append((line_no, equipment_type, inventory_id))
+            if len(chunk) >= chunk_size:
+                count, conflicts = self.insert_equipment_chunk(user_id, chunk)
+                imported += count
+                errors.extend(conflicts)
+                chunk = []
+                if progress:
+                    progress(imported, len(errors))
+        if chunk:
+            count, conflicts = self.insert_equipment_chunk(user_id, chunk)
+            imported += count
+            errors.extend(conflicts)
+        errors.sort()
+        return imported, errors
+
+    @retry_on_busy
+    def insert_equipment_chunk(self, user_id, chunk):
+        rows, conflicts = [], []
+        with self.transaction() as conn:
+            existing = {row[0] for row in conn.execute(
+                "SELECT inventory_id FROM equipment WHERE user_id = ? AND inventory_id IN (SELECT value FROM json_each(?))",
+                (user_id, json.dumps([inventory_id for _, _, inventory_id in chunk]))
+            )}
+            for line_no, equipment_type, inventory_id in chunk:
+                if inventory_id in existing:
+                    conflicts.append((line_no, f"оборудование с ID {inventory_id} уже существует"))
+                    continue
+                existing.add(inventory_id)
+                rows.append((user_id, equipment_type, inventory_id))
+            last_id = conn.execute("SELECT coalesce(MAX(id), 0) FROM equipment").fetchone()[0]
+            conn.executemany("INSERT INTO equipment (user_id, equipment_type, inventory_id) VALUES (?, ?, ?)", rows)
+            if rows:
+                log_change(conn, 'equipment', 0, user_id, 'import')
+                conn.execute("INSERT INTO search_backlog (first_id, last_id) SELECT ?, MAX(id) FROM equipment",
+                             (last_id + 1,))
+        self.cache.invalidate(('user_equipment', user_id))
+        if rows:
+            self._schedule_search_index()
+        return len(rows), conflicts
+
+    def _schedule_search_index(self):
+        with self._index_lock:
+            queued = self._index_due is not None
+            self._index_due = time.monotonic() + SEARCH_INDEX_DELAY
+        if not queued:
+            self.search_indexer.submit(self._index_search_backlog)
+
+    def _index_search_backlog(self):
+        """Adds imported equipment to the search index on the indexer thread, after the import has finished.
+
+        Indexing costs more than the import itself, so doing it chunk by chunk halved import speed. Until the
+        backlog is empty, searches do not find the newest imported rows.
+        """
+        while True:
+            with self._index_lock:
+                wait = self._index_due - time.monotonic()
+                if wait <= 0 or self._closing.is_set():
+                    self._index_due = None
+                    break
+            self._closing.wait(wait)
+        while self._index_search_slice():
+            pass
+
+    @retry_on_busy
+    def _index_search_slice(self):
+        # One transaction per slice, so other writers get the lock in between.
+        with self.transaction() as conn:
+            backlog = conn.execute("SELECT rowid, first_id, last_id FROM search_backlog ORDER BY rowid LIMIT 1").fetchone()
+            if backlog is None:
+                return False
+            rowid, first_id, last_id = backlog
+            end = min(last_id, first_id + SEARCH_INDEX_SLICE - 1)
+            # A row edited since the import is already in the index through trg_equipment_search_update.
+            conn.execute("DELETE FROM equipment_search WHERE rowid BETWEEN ? AND ?", (first_id, end))
+            index_equipment(conn, "eq.id BETWEEN ? AND ?", (first_id, end))
+            if end == last_id:
+                conn.execute("DELETE FROM search_backlog WHERE rowid = ?", (rowid,))
+            else:
+                conn.execute("UPDATE search_backlog SET first_id = ? WHERE rowid = ?", (end + 1, rowid))
+        return True
+
+    def iter_request_history(self, start=None, end=None, statuses=None, chunk_size=5000):
+        """Yields request history rows in chunks of chunk_size, read from one snapshot in order of creation."""
+        where, params = [], []
+        if start is not None:
+            where.append("r.request_date >= ?")
+            params.append(int(time.mktime(start.timetuple())))
+        if end is not None:
+            where.append("r.request_date < ?")
+            params.append(int(time.mktime((end + timedelta(days=1)).timetuple())))
+        if statuses is not None:
+            where.append("r.status IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps([STATUS_CODES[status] for status in statuses]))
+        with self.transaction(immediate=False) as conn:
+            cursor = conn.execute(f"""
+                SELECT r.id, st.name, datetime(r.request_date, 'unixepoch', 'localtime'),
+                       datetime(r.resolution_date, 'unixepoch', 'localtime'), u.username, u.full_name,
+                       eq.equipment_type, eq.inventory_id, h.username
+                {REQUEST_JOINS}
+                LEFT JOIN users h ON h.id = r.handled_by
+                WHERE {' AND '.join(where) or 1}
+                ORDER BY r.request_date, r.id
+            """, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+
+    def export_request_history(self, path, start=None, end=None, statuses=None, chunk_size=5000, progress=None):
+        writer = EXPORT_WRITERS.get(os.path.splitext(path)[1].lower())
+        if writer is None:
+            raise ValueError(f"неподдерживаемый формат выгрузки: {os.path.basename(path)}")
+        exported = 0
+
+        def rows():
+            nonlocal exported
+            for chunk in self.iter_request_history(start, end, statuses, chunk_size):
+                yield from chunk
+                exported += len(chunk)
+                if progress:
+                    progress(exported)
+
+        # A half-written file must not be mistaken for a finished export.
+        partial = path + '.part'
+        try:
+            writer(partial, HISTORY_COLUMNS, rows())
+            os.replace(partial, path)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        return exported
+
+    def check_current_status(self):
+        return self.pool.connection().execute(f"""
+            SELECT eq.id, eq.current_request_id, eq.current_status, latest.id, latest.status
+            FROM equipment eq
+            LEFT JOIN requests latest ON latest.id = ({LATEST_REQUEST_SQL.format(column='id', equipment_id='eq.id')})
+            WHERE eq.current_request_id IS NOT latest.id OR eq.current_status IS NOT latest.status
+        """).fetchall()
+
+    @retry_on_busy
+    def repair_current_status(self):
+        with self.transaction() as conn:
+            mismatches = self.check_current_status()
+            conn.executemany(
+                "UPDATE equipment SET current_request_id = ?, current_status = ? WHERE id = ?",
+                [(request_id, status, equipment_id) for equipment_id, _, _, request_id, status in mismatches]
+            )
+            owners = self.equipment_owners(conn, [row[0] for row in mismatches])
+        self.cache.invalidate(*owners)
+        return len(mismatches)
+
+    def get_all_technicians(self):
+        return self.cache.get('technicians', lambda: self.pool.connection().execute(
+            "SELECT id, username, full_name, email FROM users WHERE role = 'Техник' AND username != 'admin'"
+        ).fetchall())
+
+    @retry_on_busy
+    def delete_user(self, user_id):
+        try:
+            with self.transaction() as conn:
+                owners = self.request_owners(conn, "r.user_id = ?", (user_id,))
+                conn.execute("DELETE FROM users WHERE id = ?", (user_id,))
+            self.cache.invalidate('technicians', 'active_requests', ('user_equipment', user_id), *owners)
+            return True
+        except sqlite3.Error as e:
+            if is_busy_error(e):
+                raise
+            print(f"Ошибка при удалении пользователя: {e}")
+            return False
+
+    @retry_on_busy
+    def delete_equipment(self, equipment_id):
+        try:
+            with self.transaction() as conn:
+                owners = self.equipment_owners(conn, [equipment_id])
+                conn.execute("DELETE FROM requests WHERE equipment_id = ?", (equipment_id,))
+                conn.execute("DELETE FROM equipment WHERE id = ?", (equipment_id,))
+            self.cache.invalidate('active_requests', *owners)
+            return True
+        except sqlite3.Error as e:
+            if is_busy_error(e):
+                raise
+            print(f"Ошибка при удалении оборудования: {e}")
+            return False
@@ -0,0 +1,256 @@
+import inspect
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+# Upper bounds of the histogram buckets in seconds: 10 µs doubling up to about 21 s. Bucket k holds times below
+# 10 µs * 2**k, so its index is the bit length of the time in units of 10 µs; index len(BUCKETS) is +Inf.
+BUCKETS = tuple(10e-6 * 2 ** k for k in range(22))
+BUCKET_NS = 10_000
+SKIPPED_STATEMENTS = re.compile(r'\s*(--|BEGIN|COMMIT|ROLLBACK|PRAGMA|SAVEPOINT|RELEASE)', re.I)
+NOT_INSTRUMENTED = {'transaction', 'close'}
+
+
+class Shard(threading.local):
+    """One thread's bucket counts followed by its sum in nanoseconds; each thread writes only its own, so no lock
+    is taken."""
+
+    def __init__(self, shards):
+        self.counts = [0] * (len(BUCKETS) + 2)
+        shards.append(self.counts)
+
+
+# Code of the wrappers made by Metrics.timed(); all wrappers share it.
+WRAPPER_CODES = set()
+
+
+def nested():
+    """Tells whether the calling wrapper runs inside another timed call on this thread."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_code in WRAPPER_CODES:
+            return True
+        frame = frame.f_back
+    return False
+
+
+class Histogram:
+    def __init__(self):
+        self.shards = []
+        self._shard = Shard(self.shards)
+
+    def observe(self, seconds):
+        self.observe_ns(int(seconds * 1e9))
+
+    def observe_ns(self, elapsed):
+        counts = self._shard.counts
+        bucket = (elapsed // BUCKET_NS).bit_length()
+        counts[bucket if bucket < len(BUCKETS) else len(BUCKETS)] += 1
+        counts[-1] += elapsed
+
+    def merged(self):
+        """Returns (bucket counts, sum in seconds, count) over all threads."""
+        counts = [0] * (len(BUCKETS) + 2)
+        for shard in list(self.shards):
+            for i, n in enumerate(shard):
+                counts[i] += n
+        return counts[:-1], counts[-1] / 1e9, sum(counts[:-1])
+
+    @staticmethod
+    def quantile(counts, fraction):
+        target = fraction * sum(counts)
+        seen = 0
+        for i, count in enumerate(counts):
+            seen += count
+            if count and seen >= target:
+                return BUCKETS[min(i, len(BUCKETS) - 1)]
+        return None
+
+
+class Metrics:
+    """Opt-in timing of DatabaseManager calls, screen reloads and event-loop stalls.
+
+    Every timed call only lands in a histogram. A call slower than slow_ms is logged, and the next call of the
+    same method runs with a statement trace so that the log can show its queries and their plans; tracing
+    every call would cost more than the timing itself.
+    """
+
+    def __init__(self, slow_ms=100, slow_log_size=200, plan_interval=60.0):
+        self.slow_ns = slow_ms * 1_000_000
+        self.plan_interval = plan_interval
+        self.histograms = {}
+        self.slow_calls = deque(maxlen=slow_log_size)
+        self.plans = {}
+        self.capture = set()
+        self.started = time.time()
+        self.lock = threading.Lock()
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(name, Histogram())
+        return histogram
+
+    def observe(self, name, seconds):
+        self.observe_ns(name, int(seconds * 1e9))
+
+    def observe_ns(self, name, elapsed):
+        self.histogram(name).observe_ns(elapsed)
+        if elapsed >= self.slow_ns:
+            self.slow_call(name, elapsed)
+
+    def stall(self, seconds):
+        self.histogram('ui.stall').observe(seconds)
+        self.slow_calls.append({'name': 'ui.stall', 'ms': round(seconds * 1000, 3), 'at': time.time()})
+
+    def instrument(self, obj, prefix, pool=None, skip=()):
+        """Times the public methods of obj, other than those in skip, on this instance only.
+
+        The wrappers live in a subclass made for obj: set on the instance itself, they would leave it too many
+        attributes for the interpreter's fast attribute lookup, and every method of obj would pay for that.
+        """
+        cls = type(obj)
+        wrappers = {
+            name: self.timed(f"{prefix}{name}", member, pool)
+            for name, member in inspect.getmembers(cls, inspect.isfunction)
+            if not name.startswith('_') and name not in NOT_INSTRUMENTED and name not in skip
+        }
+        obj.__class__ = type(cls.__name__, (cls,), {'__module__': cls.__module__, **wrappers})
+
+    def timed(self, name, fn, pool=None):
+        histogram = self.histogram(name)
+        shard = histogram._shard
+        capture = self.capture
+        slow_ns = self.slow_ns
+        clock = time.perf_counter_ns
+
+        if inspect.isgeneratorfunction(fn):
+            @wraps(fn)
+            def generator(*args, **kwargs):
+                # Time to drain, including the consumer's work between chunks.
+                started = clock()
+                try:
+                    yield from fn(*args, **kwargs)
+                finally:
+                    histogram.observe_ns(clock() - started)
+            return generator
+
+        # Runs on every instrumented call, so it does no more than read the clock twice and bump a bucket; whether
+        # the call is nested in another one only matters for the rare slow or traced call and is looked up then.
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if capture and pool is not None and name in capture and not nested():
+                return self.traced(name, fn, pool, args, kwargs)
+            started = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = clock() - started
+                if elapsed < BUCKET_NS:
+                    counts = shard.counts
+                    counts[0] += 1
+                    counts[-1] += elapsed
+                else:
+                    histogram.observe_ns(elapsed)
+                    # Nested calls are part of the outer one's entry.
+                    if elapsed >= slow_ns and not nested():
+                        self.slow_call(name, elapsed, pool)
+        WRAPPER_CODES.add(wrapper.__code__)
+        return wrapper
+
+    def traced(self, name, fn, pool, args, kwargs):
+        """Runs one call with a statement trace and keeps the plans of its queries; see slow_call()."""
+        statements = []
+        conn = pool.connection()
+        conn.set_trace_callback(lambda sql: len(statements) < 50 and statements.append(sql))
+        self.capture.discard(name)
+        started = time.perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter_ns() - started
+            conn.set_trace_callback(None)
+            self.histogram(name).observe_ns(elapsed)
+            if statements:
+                self.explain(name, conn, statements)
+            else:
+                # Answered from the query cache; try again on the next call.
+                self.capture.add(name)
+            if elapsed >= self.slow_ns:
+                self.slow_call(name, elapsed)
+
+    def slow_call(self, name, elapsed, pool=None):
+        self.slow_calls.append({'name': name, 'ms': round(elapsed / 1e6, 3), 'at': time.time()})
+        if pool is not None and time.time() - self.plans.get(name, {}).get('at', 0) > self.plan_interval:
+            self.capture.add(name)
+
+    def explain(self, name, conn, statements):
+        queries = []
+        for sql in dict.fromkeys(statements):
+            if SKIPPED_STATEMENTS.match(sql):
+                continue
+            try:
+                plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+            except Exception as e:
+                plan = [f"не удалось получить план: {e}"]
+            queries.append({'sql': ' '.join(sql.split()), 'plan': plan})
+        self.plans[name] = {'at': time.time(), 'queries': queries}
+
+    def snapshot(self):
+        with self.lock:
+            histograms = dict(self.histograms)
+        result = {}
+        for name, histogram in sorted(histograms.items()):
+            counts, total, count = histogram.merged()
+            if not count:
+                continue
+            result[name] = {
+                'count': count,
+                'sum_seconds': total,
+                'p50_seconds': histogram.quantile(counts, 0.5),
+                'p99_seconds': histogram.quantile(counts, 0.99),
+                'buckets': {('+Inf' if i == len(BUCKETS) else repr(BUCKETS[i])): n for i, n in enumerate(counts) if n},
+            }
+        return result
+
+    def to_json(self):
+        return json.dumps({
+            'started': self.started,
+            'written': time.time(),
+            'histograms': self.snapshot(),
+            'slow_calls': list(self.slow_calls),
+            'plans': self.plans,
+        }, ensure_ascii=False, indent=1)
+
+    def to_prometheus(self):
+        lines = [
+            "# HELP office_system_call_seconds Duration of database calls, screen reloads and event-loop stalls.",
+            "# TYPE office_system_call_seconds histogram",
+        ]
+        with self.lock:
+            histograms = sorted(self.histograms.items())
+        for name, histogram in histograms:
+            counts, total, count = histogram.merged()
+            if not count:
+                continue
+            cumulative = 0
+            for bound, n in zip(BUCKETS + ('+Inf',), counts):
+                cumulative += n
+                lines.append(f'office_system_call_seconds_bucket{{name="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'office_system_call_seconds_sum{{name="{name}"}} {total}')
+            lines.append(f'office_system_call_seconds_count{{name="{name}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Writes JSON, or Prometheus text format for a .prom or .txt path; readers never see a partial file."""
+        text = self.to_prometheus() if path.lower().endswith(('.prom', '.txt')) else self.to_json()
+        partial = path + '.part'
+        with open(partial, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(partial, path)
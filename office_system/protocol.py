@@ -0,0 +1,50 @@
+import json
+import sqlite3
+from datetime import date
+
+# What office_system.server and office_system.remote agree on. Kept apart from both, so a client does not import
+# asyncio and the CLI imports neither until it talks to a server.
+DEFAULT_PORT = 8765
+# Only what the desktop client and the CLI call; maintenance such as migrate or repair stays local to the server.
+READ_METHODS = {
+    'authenticate_user', 'get_user_by_username', 'get_all_technicians', 'schema_version',
+    'get_equipment', 'get_equipment_rows', 'get_user_equipment', 'search_equipment',
+    'get_request', 'get_requests', 'get_all_active_requests', 'get_active_requests_page', 'search_active_requests',
+    'get_assigned_requests', 'latest_change', 'changes_since', 'analytics.summary',
+}
+WRITE_METHODS = {
+    'create_user', 'delete_user', 'add_equipment', 'delete_equipment', 'insert_equipment_chunk',
+    'create_replacement_request', 'update_request_status', 'update_request_statuses', 'resolve_request',
+    'resolve_requests', 'schedule_requests', 'claim_next_request',
+}
+STREAMED_METHODS = {'iter_request_history'}
+API_METHODS = READ_METHODS | WRITE_METHODS
+
+
+class RemoteError(Exception):
+    pass
+
+
+def encode(value):
+    if isinstance(value, sqlite3.Row):
+        # Password hashes never leave the server.
+        return {key: value[key] for key in value.keys() if key != 'password'}
+    if isinstance(value, date):
+        return {'$date': value.isoformat()}
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"{type(value).__name__} не передается через API")
+
+
+def decode(obj):
+    if obj.keys() == {'$date'}:
+        return date.fromisoformat(obj['$date'])
+    return obj
+
+
+def dumps(value):
+    return json.dumps(value, default=encode, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def loads(data):
+    return json.loads(data, object_hook=decode)
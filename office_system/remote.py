@@ -0,0 +1,158 @@
+import http.client
+import threading
+import time
+from urllib.parse import urlsplit
+
+from office_system.db import DatabaseManager
+from office_system.protocol import API_METHODS, DEFAULT_PORT, RemoteError, dumps, loads
+
+# Exceptions the caller may handle by type are raised as themselves; anything else becomes RemoteError.
+ERRORS = {error.__name__: error for error in (ValueError, TypeError, KeyError, LookupError, PermissionError)}
+
+
+def restore(value):
+    """Turns JSON arrays back into what DatabaseManager returns: rows hold only scalars, so an array of arrays
+    was a list of rows and any other array a tuple."""
+    if isinstance(value, list):
+        if all(isinstance(item, list) for item in value):
+            return list(map(tuple, value))
+        return tuple(restore(item) for item in value)
+    if isinstance(value, dict):
+        return {key: restore(item) for key, item in value.items()}
+    return value
+
+
+def raise_error(error):
+    raise ERRORS.get(error['type'], RemoteError)(error['message'])
+
+
+class RemoteAnalytics:
+    def __init__(self, remote):
+        self.remote = remote
+
+    def summary(self, days=None):
+        return self.remote.call('analytics.summary', days)
+
+
+class RemoteDatabase:
+    """Stands in for DatabaseManager when the database is owned by office_system.server.
+
+    Each thread keeps its own keep-alive connection. User rows come back as dicts without the password hash;
+    everything else has the manager's shape. batch() sends several calls in one round trip.
+    """
+
+    def __init__(self, url, token=None, timeout=60.0, metrics=None):
+        parts = urlsplit(url if '//' in url else f"http://{url}")
+        self.url = url
+        self.host = parts.hostname
+        self.port = parts.port or DEFAULT_PORT
+        self.timeout = timeout
+        self.metrics = metrics
+        self.headers = {'Content-Type': 'application/json'}
+        if token:
+            self.headers['Authorization'] = f"Bearer {token}"
+        self.analytics = RemoteAnalytics(self)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def __getattr__(self, name):
+        if name not in API_METHODS:
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+        method.__name__ = name
+        return method
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def send(self, path, payload):
+        conn = self.connection()
+        reused = conn.sock is not None
+        body = dumps(payload)
+        try:
+            conn.request('POST', path, body, self.headers)
+            return conn.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            # The server drops idle connections only between requests, so this one was never read; send it again.
+            if not reused:
+                raise
+            conn.request('POST', path, body, self.headers)
+            return conn.getresponse()
+
+    def post(self, path, payload):
+        response = self.send(path, payload)
+        data = response.read()
+        if response.status != 200:
+            raise RemoteError(f"{response.status} {response.reason}: {loads(data).get('message', '')}")
+        return loads(data)
+
+    def call(self, method, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            reply = self.post('/call', {'method': method, 'args': args, 'kwargs': kwargs})
+        finally:
+            if self.metrics:
+                self.metrics.observe(f"remote.{method}", time.perf_counter() - started)
+        if 'error' in reply:
+            raise_error(reply['error'])
+        return restore(reply['result'])
+
+    def batch(self, calls):
+        """Runs (method name, args) pairs on the server in one request; raises the first error in call order."""
+        reply = self.post('/batch', {'calls': [{'method': method, 'args': args} for method, args in calls]})
+        for result in reply['results']:
+            if 'error' in result:
+                raise_error(result['error'])
+        return [restore(result['result']) for result in reply['results']]
+
+    def iter_request_history(self, start=None, end=None, statuses=None, chunk_size=5000):
+        response = self.send('/stream', {'method': 'iter_request_history', 'args': (start, end, statuses, chunk_size)})
+        if response.status != 200:
+            raise RemoteError(f"{response.status} {response.reason}: {loads(response.read()).get('message', '')}")
+        finished = False
+        try:
+            for line in response:
+                item = loads(line)
+                if 'error' in item:
+                    finished = True
+                    response.read()
+                    raise_error(item['error'])
+                if 'done' in item:
+                    finished = True
+                    response.read()
+                    return
+                yield restore(item['rows'])
+            raise RemoteError("сервер прервал выгрузку")
+        finally:
+            if not finished:
+                # Unread chunks are still on the wire; the connection cannot carry another request.
+                self.connection().close()
+
+    # Files are read and written on the client; only their rows cross the network.
+    import_equipment = DatabaseManager.import_equipment
+    export_request_history = DatabaseManager.export_request_history
+
+    def data_version(self):
+        # Also moves on this client's own writes, unlike PRAGMA data_version; the watcher then refetches its own rows.
+        return self.call('latest_change')
+
+    def forget_changes(self, changes):
+        # The query cache lives in the server, which sees every write.
+        pass
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
@@ -0,0 +1,282 @@
+import argparse
+import asyncio
+import functools
+import hmac
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from office_system.db import DatabaseManager
+from office_system.metrics import Metrics
+from office_system.protocol import API_METHODS, DEFAULT_PORT, STREAMED_METHODS, WRITE_METHODS, dumps, loads
+
+MAX_BODY = 64 * 1024 * 1024
+IDLE_TIMEOUT = 60.0
+REASONS = {200: 'OK', 400: 'Bad Request', 401: 'Unauthorized', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large'}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_request(body):
+    try:
+        request = loads(body)
+    except ValueError as e:
+        raise ApiError(400, f"некорректный JSON: {e}") from None
+    if not isinstance(request, dict):
+        raise ApiError(400, "тело запроса должно быть объектом JSON")
+    return request
+
+
+def error_body(e):
+    return {'error': {'type': type(e).__name__, 'message': str(e)}}
+
+
+class ApiServer:
+    """HTTP/JSON front of one DatabaseManager for desktop clients on other machines.
+
+    Writes run on a single thread, so they never wait on each other's locks; reads run on `readers` threads,
+    each with its own connection from the manager's pool. Connections are kept alive between requests.
+    """
+
+    def __init__(self, db, readers=4, token=None, metrics=None):
+        self.db = db
+        self.token = token
+        self.metrics = metrics
+        self.readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix='reader')
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='writer')
+
+    def close(self):
+        self.readers.shutdown()
+        self.writer.shutdown()
+
+    def method(self, name):
+        if name == 'authenticate_user':
+            # Checked on a reader, as the hash takes long; only the rare upgrade of an old hash is a write.
+            return functools.partial(self.db.authenticate_user, rehash=self.rehash)
+        target, _, attribute = name.rpartition('.')
+        return getattr(self.db.analytics if target == 'analytics' else self.db, attribute)
+
+    def rehash(self, user_id, old_hash, new_hash):
+        # Not waited for: the login is already decided, and a lost update only means another rehash next time.
+        self.writer.submit(self.db.update_password_hash, user_id, old_hash, new_hash)
+
+    async def call(self, name, args=(), kwargs=None):
+        if name not in API_METHODS:
+            raise ApiError(404, f"неизвестный метод: {name}")
+        started = time.perf_counter()
+        fn = functools.partial(self.method(name), *args, **(kwargs or {}))
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.writer if name in WRITE_METHODS else self.readers, fn)
+        finally:
+            if self.metrics:
+                self.metrics.observe(f"api.{name}", time.perf_counter() - started)
+
+    async def batch(self, calls):
+        # In order, so a read after a write in the same batch sees it.
+        results = []
+        for call in calls:
+            try:
+                results.append({'result': await self.call(call['method'], call.get('args', ()), call.get('kwargs'))})
+            except Exception as e:
+                results.append(error_body(e))
+        return results
+
+    async def stream(self, writer, name, args, kwargs):
+        """Sends a chunked generator as one JSON line per chunk; the last line is {"done": true} or an error."""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=4)
+        cancelled = threading.Event()
+
+        def produce():
+            put = lambda item: asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+            chunks = None
+            try:
+                # The generator holds a read transaction on this thread's connection, so it must end here too.
+                chunks = self.method(name)(*args, **kwargs)
+                for chunk in chunks:
+                    if cancelled.is_set():
+                        break
+                    put({'rows': chunk})
+                put({'done': True})
+            except Exception as e:
+                put(error_body(e))
+            finally:
+                # Also after bad arguments, so that stream() always gets its final None.
+                if chunks is not None:
+                    chunks.close()
+                put(None)
+
+        producer = loop.run_in_executor(self.readers, produce)
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nTransfer-Encoding: chunked\r\n\r\n")
+        item = None
+        try:
+            while (item := await queue.get()) is not None:
+                line = dumps(item) + b"\n"
+                writer.write(b"%x\r\n%s\r\n" % (len(line), line))
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        finally:
+            if item is not None:
+                # The client went away; let the producer finish its current chunk and stop.
+                cancelled.set()
+                while item is not None:
+                    item = await queue.get()
+            await producer
+
+    async def dispatch(self, verb, path, body):
+        if path == '/health' and verb == 'GET':
+            return 200, dumps({'status': 'ok', 'schema_version': self.db.schema_version()}), 'application/json'
+        if path == '/metrics' and verb == 'GET':
+            if not self.metrics:
+                raise ApiError(404, "метрики не включены")
+            return 200, self.metrics.to_prometheus().encode(), 'text/plain; version=0.0.4'
+        if verb != 'POST':
+            raise ApiError(405, f"{verb} не поддерживается")
+        request = parse_request(body)
+        if path == '/call':
+            try:
+                payload = {'result': await self.call(request['method'], request.get('args', ()), request.get('kwargs'))}
+            except ApiError:
+                raise
+            except Exception as e:
+                payload = error_body(e)
+            return 200, dumps(payload), 'application/json'
+        if path == '/batch':
+            calls = request['calls']
+            if not isinstance(calls, list) or not all(isinstance(call, dict) for call in calls):
+                raise ApiError(400, "calls должен быть списком объектов JSON")
+            return 200, dumps({'results': await self.batch(calls)}), 'application/json'
+        raise ApiError(404, f"нет такого адреса: {path}")
+
+    def authorized(self, headers):
+        if self.token is None:
+            return True
+        return hmac.compare_digest(headers.get('authorization', ''), f"Bearer {self.token}")
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                # Until the whole request is read, an error leaves the rest of it on the wire, so the reply closes.
+                keep_alive = False
+                try:
+                    try:
+                        request_line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+                    except asyncio.TimeoutError:
+                        break
+                    if not request_line.strip():
+                        break
+                    try:
+                        verb, path, version = request_line.decode('latin-1').split()
+                    except ValueError:
+                        raise ApiError(400, "некорректная строка запроса") from None
+                    headers = {}
+                    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        name, _, value = line.decode('latin-1').partition(':')
+                        headers[name.strip().lower()] = value.strip()
+                    length = headers.get('content-length', '0')
+                    if not (length.isascii() and length.isdigit()):
+                        raise ApiError(400, f"некорректная длина запроса: {length!r}")
+                    length = int(length)
+                    if length > MAX_BODY:
+                        raise ApiError(413, "слишком большой запрос")
+                    body = await reader.readexactly(length) if length else b""
+                    keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                    if not self.authorized(headers):
+                        raise ApiError(401, "неверный токен")
+                    if path == '/stream' and verb == 'POST':
+                        request = parse_request(body)
+                        if request.get('method') not in STREAMED_METHODS:
+                            raise ApiError(404, f"метод не передается потоком: {request.get('method')}")
+                        await self.stream(writer, request['method'], request.get('args', ()), request.get('kwargs') or {})
+                    else:
+                        status, payload, content_type = await self.dispatch(verb, path, body)
+                        await self.respond(writer, status, payload, content_type, keep_alive)
+                except (ApiError, KeyError, TypeError, ValueError) as e:
+                    # ValueError also covers a request or header line over the reader's limit.
+                    status = e.status if isinstance(e, ApiError) else 400
+                    await self.respond(writer, status, dumps({'message': str(e)}), keep_alive=keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload, content_type='application/json', keep_alive=True):
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+            .encode('latin-1') + payload
+        )
+        await writer.drain()
+
+    async def watch_stalls(self, interval=0.05, threshold=0.1):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(interval)
+            late = loop.time() - started - interval
+            if late >= threshold:
+                self.metrics.stall(late)
+
+    async def serve(self, host='127.0.0.1', port=DEFAULT_PORT, ready=None):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        if ready:
+            ready(server.sockets[0].getsockname()[1])
+        watcher = asyncio.ensure_future(self.watch_stalls()) if self.metrics else None
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if watcher:
+                watcher.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m office_system.server',
+                                     description="Сервер базы офисной системы для клиентов в сети")
+    parser.add_argument('--db', default='office_system.db')
+    parser.add_argument('--host', default='127.0.0.1', help="0.0.0.0, чтобы принимать подключения из сети")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--readers', type=int, default=4, help="потоков чтения")
+    parser.add_argument('--token', help="токен, без которого запросы отклоняются")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="записывать время вызовов и медленные запросы: JSON или Prometheus для .prom/.txt")
+    args = parser.parse_args(argv)
+
+    metrics = Metrics() if args.metrics else None
+    db = DatabaseManager(args.db, metrics=metrics)
+    server = ApiServer(db, args.readers, args.token, metrics)
+
+    async def run():
+        if metrics:
+            async def export():
+                while True:
+                    await asyncio.sleep(10)
+                    metrics.write(args.metrics)
+            asyncio.ensure_future(export())
+        await server.serve(args.host, args.port, ready=lambda port: print(
+            f"Сервер слушает {args.host}:{port}, база {args.db}", file=sys.stderr))
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        db.close()
+        if metrics:
+            metrics.write(args.metrics)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
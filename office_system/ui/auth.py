@@ -0,0 +1,175 @@
+from PyQt6.QtWidgets import QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QHBoxLayout, QFrame, QStackedWidget
+from PyQt6.QtGui import QCursor
+from PyQt6.QtCore import Qt, pyqtSignal
+
+from office_system.ui.theme import font
+
+
+class AuthWidget(QWidget):
+    login_successful = pyqtSignal(dict);
+    admin_login_successful = pyqtSignal();
+    registration_successful = pyqtSignal(str)
+
+    def __init__(self, db, executor):
+        super().__init__();
+        self.db = db;
+        self.executor = executor;
+        self.init_ui()
+
+    def init_ui(self):
+        self.setProperty('screen', 'auth')
+        self.stacked_widget = QStackedWidget(self)
+        self.stacked_widget.addWidget(self.create_login_window())
+        self.stacked_widget.addWidget(self.create_register_window())
+        layout = QHBoxLayout(self);
+        layout.addWidget(self.stacked_widget);
+        layout.setContentsMargins(0, 0, 0, 0)
+
+    def create_input_field(self, placeholder, is_password=False):
+        field = QLineEdit();
+        field.setPlaceholderText(placeholder);
+        field.setFixedHeight(45)
+        if is_password: field.setEchoMode(QLineEdit.EchoMode.Password)
+        field.setProperty('role', 'auth-field')
+        return field
+
+    def create_card(self, title, widgets, switch_text, switch_callback, height=450):
+        card = QFrame();
+        card.setProperty('role', 'card');
+        card.setFixedSize(380, height)
+        layout = QVBoxLayout(card);
+        layout.setContentsMargins(35, 30, 35, 30);
+        layout.setSpacing(15);
+        layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        title_label = QLabel(title);
+        title_label.setFont(font(18, bold=True));
+        title_label.setProperty('role', 'card-title');
+        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(title_label);
+        layout.addSpacing(20)
+        for widget in widgets: layout.addWidget(widget)
+        layout.addStretch()
+        switch_label = QLabel(f'<a href="#" style="color: #555; text-decoration: none;">{switch_text}</a>');
+        switch_label.setAlignment(Qt.AlignmentFlag.AlignCenter);
+        switch_label.mousePressEvent = switch_callback
+        layout.addWidget(switch_label)
+        return card
+
+    def create_login_window(self):
+        window = QWidget();
+        layout = QVBoxLayout(window);
+        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.login_info_label = QLabel("");
+        self.login_info_label.setProperty('role', 'notice');
+        self.login_info_label.setProperty('tone', 'success');
+        self.login_info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.login_username = self.create_input_field("Имя пользователя");
+        self.login_password = self.create_input_field("Пароль", True)
+        self.login_error_label = QLabel("");
+        self.login_error_label.setProperty('role', 'notice');
+        self.login_error_label.setProperty('tone', 'error');
+        self.login_error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.login_btn = QPushButton("Войти");
+        self.login_btn.setFixedHeight(45);
+        self.login_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor));
+        self.login_btn.setProperty('variant', 'login');
+        self.login_btn.clicked.connect(self.handle_login)
+        card = self.create_card("Вход в систему", [self.login_info_label, self.login_username, self.login_password,
+                                                   self.login_error_label, self.login_btn],
+                                "Нет аккаунта? <b>Зарегистрироваться</b>", self.show_register)
+        layout.addWidget(card);
+        return window
+
+    def create_register_window(self):
+        window = QWidget();
+        layout = QVBoxLayout(window);
+        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.reg_fullname = self.create_input_field("ФИО");
+        self.reg_email = self.create_input_field("Электронная почта");
+        self.reg_username = self.create_input_field("Имя пользователя");
+        self.reg_password = self.create_input_field("Пароль", True);
+        self.reg_confirm = self.create_input_field("Подтвердите пароль", True)
+        self.register_error_label = QLabel("");
+        self.register_error_label.setProperty('role', 'notice');
+        self.register_error_label.setProperty('tone', 'error');
+        self.register_error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.register_btn = QPushButton("Зарегистрироваться");
+        self.register_btn.setFixedHeight(45);
+        self.register_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor));
+        self.register_btn.setProperty('variant', 'register');
+        self.register_btn.clicked.connect(self.handle_register)
+        card = self.create_card("Регистрация", [self.reg_fullname, self.reg_email, self.reg_username, self.reg_password,
+                                                self.reg_confirm, self.register_error_label, self.register_btn],
+                                "Уже есть аккаунт? <b>Войти</b>", self.show_login, height=550)
+        layout.addWidget(card);
+        return window
+
+    def clear_input_fields(self):
+        self.login_username.clear();
+        self.login_password.clear();
+        self.login_info_label.clear();
+        self.login_error_label.clear();
+        self.reg_fullname.clear();
+        self.reg_email.clear();
+        self.reg_username.clear();
+        self.reg_password.clear();
+        self.reg_confirm.clear();
+        self.register_error_label.clear()
+
+    def show_login_with_message(self, message):
+        self.clear_input_fields();
+        self.login_info_label.setText(message);
+        self.stacked_widget.setCurrentIndex(0)
+
+    def show_login(self, event=None):
+        self.clear_input_fields();
+        self.stacked_widget.setCurrentIndex(0)
+
+    def show_register(self, event=None):
+        self.clear_input_fields();
+        self.stacked_widget.setCurrentIndex(1)
+
+    def handle_login(self):
+        self.login_error_label.setText("");
+        self.login_info_label.setText("")
+        username = self.login_username.text().strip();
+        password = self.login_password.text()
+        if not username or not password: self.login_error_label.setText("Пожалуйста, заполните все поля."); return
+        if username == 'admintx' and password == 'admintx': self.admin_login_successful.emit(); return
+        self.login_btn.setEnabled(False);
+        self.login_info_label.setText("Выполняется вход...")
+        task = self.executor.submit(self.db.authenticate_user, username, password)
+        task.finished.connect(self.login_finished)
+        task.failed.connect(lambda e: self.login_error_label.setText(f"Ошибка базы данных: {e}"))
+        task.done.connect(lambda: self.login_btn.setEnabled(True))
+
+    def login_finished(self, user_data):
+        self.login_info_label.setText("")
+        if user_data:
+            self.login_successful.emit(dict(user_data))
+        else:
+            self.login_error_label.setText("Неверное имя пользователя или пароль.")
+
+    def handle_register(self):
+        self.register_error_label.setText("")
+        full_name = self.reg_fullname.text().strip();
+        email = self.reg_email.text().strip();
+        username = self.reg_username.text().strip();
+        password = self.reg_password.text();
+        confirm_password = self.reg_confirm.text()
+        if not all([full_name, email, username, password, confirm_password]): self.register_error_label.setText(
+            "Пожалуйста, заполните все поля."); return
+        if password != confirm_password: self.register_error_label.setText("Пароли не совпадают."); return
+        if len(password) < 1: self.register_error_label.setText("Пароль должен быть не менее 4 символов."); return
+        if '@' not in email or '.' not in email: self.register_error_label.setText("Введите корректный email."); return
+        self.register_btn.setEnabled(False)
+        task = self.executor.submit(self.db.create_user, username, password, full_name, email)
+        task.finished.connect(self.register_finished)
+        task.failed.connect(lambda e: self.register_error_label.setText(f"Ошибка базы данных: {e}"))
+        task.done.connect(lambda: self.register_btn.setEnabled(True))
+
+    def register_finished(self, user_id):
+        if user_id:
+            self.registration_successful.emit("Регистрация успешна! Теперь вы можете войти.")
+        else:
+            self.register_error_label.setText("Это имя пользователя или email уже заняты.")
@@ -0,0 +1,139 @@
+import time
+
+from PyQt6.QtWidgets import (
+    QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QListView, QMessageBox, QAbstractItemView
+)
+from PyQt6.QtGui import QCursor
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+
+from office_system.ui.theme import font
+
+
+class BaseWidget(QWidget):
+    logout_requested = pyqtSignal()
+    search_delay = 200
+
+    def __init__(self, db, executor):
+        super().__init__()
+        self.setProperty('screen', 'main')
+        self.db = db
+        self.executor = executor
+        self.user_data = None
+        self.pending = set()
+        self.keyed_tasks = {}
+        self.search_field = None
+        self.metrics = db.metrics
+        if self.metrics and hasattr(self, 'load_content'):
+            self.load_content = self.metrics.timed(f"ui.load_content.{type(self).__name__}", self.load_content)
+
+        self.main_layout = QVBoxLayout(self)
+        self.main_layout.setContentsMargins(25, 25, 25, 25);
+        self.main_layout.setSpacing(20)
+        self.title_label = QLabel("Добро пожаловать!");
+        self.title_label.setObjectName("screenTitle");
+        self.title_label.setFont(font(22, bold=True));
+        self.title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.loading_label = QLabel("Загрузка...");
+        self.loading_label.setObjectName("loadingLabel");
+        self.loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter);
+        self.loading_label.setFixedHeight(15);
+        self.loading_label.setVisible(False)
+        self.content_widget = QWidget()
+        logout_btn = QPushButton("Выйти");
+        logout_btn.setFixedHeight(45);
+        logout_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor));
+        logout_btn.setProperty('variant', 'logout');
+        logout_btn.clicked.connect(self.logout_requested.emit)
+
+        self.main_layout.addWidget(self.title_label)
+        self.main_layout.addWidget(self.loading_label)
+        self.main_layout.addWidget(self.content_widget, 1)
+        self.main_layout.addWidget(logout_btn)
+
+    def run(self, fn, *args, on_result=None, on_error=None, on_progress=None, key=None):
+        if key is not None and key in self.keyed_tasks:
+            self.keyed_tasks.pop(key).cancel()
+        task = self.executor.submit(fn, *args, report_progress=on_progress is not None)
+        self.pending.add(task)
+        if key is not None:
+            self.keyed_tasks[key] = task
+        if self.metrics:
+            on_result = self.timed_task(task, getattr(fn, '__name__', 'task'), on_result)
+        if on_result:
+            task.finished.connect(on_result)
+        if on_progress:
+            task.progressed.connect(on_progress)
+        task.failed.connect(on_error or self.show_error)
+        task.done.connect(lambda: self.task_done(task, key))
+        self.loading_label.setVisible(True)
+        return task
+
+    def timed_task(self, task, name, on_result):
+        # From submission to delivery on the GUI thread, so time spent waiting for a free worker counts too;
+        # cancelled tasks are not counted.
+        started = time.perf_counter()
+        task.finished.connect(lambda result: self.metrics.observe(f"ui.task.{name}", time.perf_counter() - started))
+        return on_result and self.metrics.timed(f"ui.result.{name}", on_result)
+
+    def task_done(self, task, key):
+        self.pending.discard(task)
+        if key is not None and self.keyed_tasks.get(key) is task:
+            del self.keyed_tasks[key]
+        self.loading_label.setVisible(bool(self.pending))
+
+    def cancel_pending(self):
+        for task in self.pending:
+            task.cancel()
+        self.pending.clear()
+        self.keyed_tasks.clear()
+        self.loading_label.setVisible(False)
+        if self.search_field:
+            self.search_timer.stop()
+
+    def apply_changes(self, changes):
+        pass
+
+    def show_error(self, error):
+        QMessageBox.critical(self, "Ошибка", f"Ошибка базы данных: {error}")
+
+    def create_list_view(self, model, delegate_class, selection_mode=QAbstractItemView.SelectionMode.NoSelection):
+        view = QListView()
+        view.setObjectName("rowList")
+        view.setModel(model)
+        delegate = delegate_class(view)
+        view.setItemDelegate(delegate)
+        view.setUniformItemSizes(True)
+        view.setMouseTracking(True)
+        view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        view.setSelectionMode(selection_mode)
+        delegate.button_clicked.connect(self.handle_row_action)
+        return view
+
+    def create_search_field(self, placeholder):
+        self.search_field = QLineEdit()
+        self.search_field.setPlaceholderText(placeholder)
+        self.search_field.setClearButtonEnabled(True)
+        self.search_field.setProperty('role', 'input')
+        # Queries go out once typing pauses; a newer query cancels the one still running under the same key.
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.search_delay)
+        self.search_timer.timeout.connect(self.search_changed)
+        self.search_field.textChanged.connect(lambda text: self.search_timer.start())
+        return self.search_field
+
+    def search_text(self):
+        return self.search_field.text().strip() if self.search_field else ""
+
+    def search_changed(self):
+        self.load_content()
+
+    def set_user_data(self, user_data):
+        self.user_data = user_data
+        if self.search_field:
+            self.search_timer.stop()
+            self.search_field.blockSignals(True)
+            self.search_field.clear()
+            self.search_field.blockSignals(False)
+        self.title_label.setText(f"Добро пожаловать, {self.user_data['username']}!")
+        if hasattr(self, 'load_content'): self.load_content()
@@ -0,0 +1,167 @@
+from PyQt6.QtWidgets import (
+    QLabel, QLineEdit, QPushButton, QVBoxLayout, QHBoxLayout, QFrame, QComboBox, QMessageBox, QFileDialog
+)
+from PyQt6.QtGui import QCursor
+from PyQt6.QtCore import Qt
+
+from office_system.db import ACTIVE_STATUSES, EQUIPMENT_TYPES, read_equipment_file
+from office_system.ui.lists import RowListModel, RowDelegate
+from office_system.ui.base import BaseWidget
+from office_system.ui.theme import font, set_tone
+
+
+class EquipmentDelegate(RowDelegate):
+    def info(self, row):
+        return "", f"{row[1]} - ID: {row[2]}"
+
+    def status(self, row):
+        return row[3]
+
+    def buttons(self, row):
+        return [("request", "Запросить замену", "#34495e", row[3] not in ACTIVE_STATUSES),
+                ("delete", "Удалить", "#e74c3c", True)]
+
+
+class EmployeeWidget(BaseWidget):
+    def __init__(self, db, executor):
+        super().__init__(db, executor)
+        self.setup_content_ui()
+
+    def setup_content_ui(self):
+        content_layout = QVBoxLayout(self.content_widget)
+        content_layout.setContentsMargins(0, 0, 0, 0);
+        content_layout.setSpacing(15)
+        add_frame = QFrame();
+        add_frame.setProperty('role', 'panel')
+        add_layout = QVBoxLayout(add_frame)
+        add_label = QLabel("Добавить новое оборудование:");
+        add_label.setFont(font(12, bold=True));
+        add_label.setProperty('role', 'caption')
+        input_layout = QHBoxLayout()
+        self.type_combo = QComboBox();
+        self.type_combo.addItems(EQUIPMENT_TYPES);
+        self.type_combo.setProperty('role', 'input')
+        self.id_input = QLineEdit();
+        self.id_input.setPlaceholderText("Инвентарный ID");
+        self.id_input.setProperty('role', 'input')
+        add_btn = QPushButton("Добавить");
+        add_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor));
+        add_btn.setProperty('variant', 'add');
+        add_btn.clicked.connect(self.handle_add_equipment)
+        import_btn = QPushButton("Импорт...");
+        import_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor));
+        import_btn.setProperty('variant', 'import');
+        import_btn.clicked.connect(self.handle_import_equipment)
+        input_layout.addWidget(self.type_combo, 1);
+        input_layout.addWidget(self.id_input, 2);
+        input_layout.addWidget(add_btn, 1);
+        input_layout.addWidget(import_btn, 1)
+        self.message_label = QLabel("");
+        self.message_label.setAlignment(Qt.AlignmentFlag.AlignCenter);
+        self.message_label.setProperty('tone', 'info');
+        self.message_label.setFixedHeight(20)
+        add_layout.addWidget(add_label);
+        add_layout.addLayout(input_layout);
+        add_layout.addWidget(self.message_label)
+        list_label = QLabel("Мое оборудование и заявки:");
+        list_label.setFont(font(12, bold=True));
+        list_label.setProperty('role', 'caption')
+        self.equipment_model = RowListModel("У вас пока нет добавленного оборудования", self)
+        self.equipment_list = self.create_list_view(self.equipment_model, EquipmentDelegate)
+        search_field = self.create_search_field("Поиск по типу или инвентарному ID")
+        content_layout.addWidget(add_frame);
+        content_layout.addWidget(list_label);
+        content_layout.addWidget(search_field);
+        content_layout.addWidget(self.equipment_list)
+
+    def load_content(self):
+        if not self.user_data: self.equipment_model.set_rows([]); return
+        text = self.search_text()
+        if text:
+            self.equipment_model.empty_text = "Ничего не найдено"
+            self.run(self.db.search_equipment, self.user_data['id'], text, on_result=self.equipment_model.set_rows,
+                     key='load')
+            return
+        self.equipment_model.empty_text = "У вас пока нет добавленного оборудования"
+        self.run(self.db.get_user_equipment, self.user_data['id'], on_result=self.equipment_model.set_rows, key='load')
+
+    def handle_row_action(self, action, item_data):
+        if action == "request":
+            self.handle_add_request(item_data[0])
+        elif action == "delete":
+            self.handle_delete_equipment(item_data[0])
+
+    def handle_add_equipment(self):
+        inventory_id_str = self.id_input.text().strip()
+        if not inventory_id_str: set_tone(self.message_label, 'warning'); self.message_label.setText(
+            "Пожалуйста, введите инвентарный ID."); return
+        try:
+            inventory_id = int(inventory_id_str)
+        except ValueError:
+            set_tone(self.message_label, 'error');
+            self.message_label.setText(
+                "ID оборудования должен быть числом.");
+            return
+        self.run(self.db.add_equipment, self.user_data['id'], self.type_combo.currentText(), inventory_id,
+                 on_result=self.equipment_added)
+
+    def equipment_added(self, row):
+        if row:
+            set_tone(self.message_label, 'success');
+            self.message_label.setText("Оборудование успешно добавлено!");
+            self.id_input.clear();
+            self.equipment_model.merge_row(row, sort_key=lambda item: item[1])
+        else:
+            set_tone(self.message_label, 'error');
+            self.message_label.setText(
+                "Ошибка: Оборудование с таким ID уже существует.")
+
+    def handle_import_equipment(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Импорт оборудования", "",
+                                              "CSV или JSONL (*.csv *.jsonl *.ndjson);;Все файлы (*)")
+        if not path: return
+        set_tone(self.message_label, 'info');
+        self.message_label.setText("Импорт...")
+        self.run(self.db.import_equipment, self.user_data['id'], read_equipment_file(path),
+                 on_result=self.equipment_imported)
+
+    def equipment_imported(self, result):
+        imported, errors = result
+        set_tone(self.message_label, 'success' if not errors else 'warning');
+        self.message_label.setText(f"Импортировано: {imported}, пропущено строк: {len(errors)}")
+        if errors:
+            details = "\n".join(f"Строка {line_no}: {message}" for line_no, message in errors[:20])
+            if len(errors) > 20: details += f"\n... и еще {len(errors) - 20}"
+            QMessageBox.warning(self, "Импорт оборудования", details)
+        self.load_content()
+
+    def apply_changes(self, changes):
+        if not self.user_data: return
+        changes = [change for change in changes if change[1] == 'equipment' and change[3] == self.user_data['id']]
+        # Search results are simply asked for again: a changed row may have stopped or started matching.
+        if changes and self.search_text() or any(operation == 'import' for _, _, _, _, operation in changes):
+            self.load_content()
+            return
+        equipment_ids = {row_id for _, _, row_id, _, _ in changes}
+        if equipment_ids:
+            self.run(self.db.get_equipment_rows, equipment_ids,
+                     on_result=lambda rows: self.merge_equipment(equipment_ids, rows))
+
+    def merge_equipment(self, equipment_ids, rows):
+        for row in rows:
+            self.equipment_model.merge_row(row, sort_key=lambda item: item[1])
+        self.equipment_model.remove_rows(set(equipment_ids) - {row[0] for row in rows})
+
+    def handle_add_request(self, equipment_id):
+        self.run(self.db.create_replacement_request, self.user_data['id'], equipment_id,
+                 on_result=self.equipment_model.update_row)
+
+    def handle_delete_equipment(self, equipment_id):
+        self.run(self.db.delete_equipment, equipment_id,
+                 on_result=lambda deleted: self.equipment_deleted(equipment_id, deleted))
+
+    def equipment_deleted(self, equipment_id, deleted):
+        if deleted:
+            self.equipment_model.remove_row(equipment_id)
+        else:
+            QMessageBox.critical(self, "Ошибка", "Не удалось удалить оборудование.")
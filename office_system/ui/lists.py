@@ -0,0 +1,286 @@
+from bisect import bisect_right
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt6.QtGui import QFont, QCursor, QPainter, QFontMetrics
+from PyQt6.QtCore import Qt, QSize, QRect, QRectF, QEvent, QModelIndex, QAbstractListModel, pyqtSignal
+
+from office_system.ui.theme import color, status_color
+
+
+class RowListModel(QAbstractListModel):
+    def __init__(self, empty_text, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        self.positions = None
+        self.empty_text = empty_text
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows) or 1
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if not self.rows:
+            return self.empty_text if role == Qt.ItemDataRole.DisplayRole else None
+        if role == Qt.ItemDataRole.UserRole:
+            return self.rows[index.row()]
+        return None
+
+    def flags(self, index):
+        if not self.rows:
+            return Qt.ItemFlag.NoItemFlags
+        return super().flags(index)
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = list(rows)
+        self.positions = None
+        self.endResetModel()
+
+    def position(self, key):
+        if self.positions is None:
+            self.positions = {row[0]: i for i, row in enumerate(self.rows)}
+        return self.positions.get(key)
+
+    def update_row(self, row):
+        i = self.position(row[0])
+        if i is None:
+            return
+        self.rows[i] = row
+        index = self.index(i)
+        self.dataChanged.emit(index, index)
+
+    def remove_row(self, key):
+        i = self.position(key)
+        if i is None:
+            return
+        if len(self.rows) == 1:
+            self.set_rows([])
+            return
+        self.beginRemoveRows(QModelIndex(), i, i)
+        del self.rows[i]
+        del self.positions[key]
+        if i != len(self.rows):
+            self.positions = None
+        self.endRemoveRows()
+
+    def remove_rows(self, keys):
+        keys = set(keys)
+        if len(keys) == 1:
+            self.remove_row(next(iter(keys)))
+        elif keys:
+            self.set_rows([row for row in self.rows if row[0] not in keys])
+
+    def insert_row(self, row, sort_key=None):
+        if not self.rows:
+            self.set_rows([row])
+            return
+        i = len(self.rows) if sort_key is None else bisect_right(self.rows, sort_key(row), key=sort_key)
+        self.beginInsertRows(QModelIndex(), i, i)
+        self.rows.insert(i, row)
+        if i == len(self.rows) - 1 and self.positions is not None:
+            self.positions[row[0]] = i
+        else:
+            self.positions = None
+        self.endInsertRows()
+
+    def merge_row(self, row, sort_key=None):
+        if self.position(row[0]) is None:
+            self.insert_row(row, sort_key)
+        else:
+            self.update_row(row)
+
+
+class PagedRowListModel(RowListModel):
+    def __init__(self, empty_text, fetch_page, page_key, run, page_size=200, parent=None):
+        super().__init__(empty_text, parent)
+        self.fetch_page = fetch_page
+        self.page_key = page_key
+        self.run = run
+        self.page_size = page_size
+        self.has_more = False
+        self.fetching = False
+        self.generation = 0
+        # Key of the last loaded row; kept apart from the rows, which batch actions and the change feed may empty.
+        self.cursor = None
+
+    def reload(self):
+        self.run(self.fetch_page, None, self.page_size, key='load', on_result=self.start_reload())
+
+    def start_reload(self):
+        """Starts a reload whose first page the caller fetches, e.g. in a batch; returns where the rows go."""
+        self.generation += 1
+        self.fetching = True
+        generation = self.generation
+        return lambda rows: self.set_first_page(rows, generation)
+
+    def set_first_page(self, rows, generation):
+        if generation != self.generation:
+            return
+        self.fetching = False
+        self.has_more = len(rows) == self.page_size
+        self.cursor = self.page_key(rows[-1]) if rows else None
+        self.set_rows(rows)
+
+    def start_results(self):
+        """Like start_reload, for one unpaged result set, such as search matches, that stands until the next reload."""
+        self.generation += 1
+        self.fetching = True
+        generation = self.generation
+        return lambda rows: self.set_results(rows, generation)
+
+    def set_results(self, rows, generation):
+        if generation != self.generation:
+            return
+        self.fetching = False
+        self.has_more = False
+        self.cursor = None
+        self.set_rows(rows)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.has_more and not self.fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self.has_more or self.fetching:
+            return
+        self.fetching = True
+        generation = self.generation
+        self.run(self.fetch_page, self.cursor, self.page_size, key='page',
+                 on_result=lambda rows: self.append_page(rows, generation))
+
+    def merge_row(self, row, sort_key=None):
+        # Rows past the loaded range arrive with a later page instead.
+        if self.position(row[0]) is None and self.has_more and self.page_key(row) > self.cursor:
+            return
+        super().merge_row(row, self.page_key)
+
+    def append_page(self, rows, generation):
+        if generation != self.generation:
+            return
+        self.fetching = False
+        self.has_more = len(rows) == self.page_size
+        if not rows:
+            return
+        self.cursor = self.page_key(rows[-1])
+        if not self.rows:
+            self.set_rows(rows)
+            return
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(rows) - 1)
+        self.rows.extend(rows)
+        self.positions = None
+        self.endInsertRows()
+
+
+class RowDelegate(QStyledItemDelegate):
+    button_clicked = pyqtSignal(str, object)
+    row_height = 44
+    button_height = 28
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        view.viewport().installEventFilter(self)
+        self.font = QFont()
+        self.font.setPointSize(11)
+        self.bold_font = QFont(self.font)
+        self.bold_font.setBold(True)
+        self.button_font = QFont()
+        self.bold_metrics = QFontMetrics(self.bold_font)
+        self.button_metrics = QFontMetrics(self.button_font)
+
+    def info(self, row):
+        return "", ""
+
+    def status(self, row):
+        return None
+
+    def buttons(self, row):
+        return []
+
+    def info_rect(self, rect):
+        return rect.adjusted(10, 0, 0, 0)
+
+    def buttons_rect(self, rect):
+        return rect.adjusted(0, 0, -8, 0)
+
+    def button_rects(self, rect, row):
+        area = self.buttons_rect(rect)
+        right = area.right()
+        top = area.top() + (area.height() - self.button_height) // 2
+        result = []
+        for key, text, fill, enabled in reversed(self.buttons(row)):
+            width = self.button_metrics.horizontalAdvance(text) + 20
+            result.append((key, QRect(right - width, top, width, self.button_height), text, fill, enabled))
+            right -= width + 6
+        return list(reversed(result))
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.row_height)
+
+    def paint(self, painter, option, index):
+        row = index.data(Qt.ItemDataRole.UserRole)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, color("#d6eaf8"))
+        if row is None:
+            painter.setFont(self.font)
+            painter.setPen(color("#7f8c8d"))
+            painter.drawText(self.info_rect(option.rect), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                             index.data(Qt.ItemDataRole.DisplayRole))
+            painter.restore()
+            return
+
+        buttons = self.button_rects(option.rect, row)
+        text_rect = self.info_rect(option.rect)
+        bold, rest = self.info(row)
+        painter.setPen(color("#000000"))
+        if bold:
+            painter.setFont(self.bold_font)
+            painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, bold)
+            text_rect = text_rect.adjusted(self.bold_metrics.horizontalAdvance(bold), 0, 0, 0)
+        painter.setFont(self.font)
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, rest)
+
+        status = self.status(row)
+        if status and buttons:
+            status_rect = QRect(option.rect.left(), option.rect.top(), buttons[0][1].left() - option.rect.left() - 10,
+                                option.rect.height())
+            painter.setFont(self.bold_font)
+            painter.setPen(status_color(status))
+            painter.drawText(status_rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, status)
+
+        painter.setFont(self.button_font)
+        for key, rect, text, fill, enabled in buttons:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(color(fill if enabled else "#95a5a6"))
+            painter.drawRoundedRect(QRectF(rect), 3, 3)
+            painter.setPen(color("white" if enabled else "#bdc3c7"))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        painter.restore()
+
+    def button_at(self, rect, index, pos):
+        row = index.data(Qt.ItemDataRole.UserRole)
+        if row is None:
+            return None
+        for key, button_rect, text, fill, enabled in self.button_rects(rect, row):
+            if enabled and button_rect.contains(pos):
+                return key
+        return None
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.MouseMove:
+            pos = event.position().toPoint()
+            index = self.view.indexAt(pos)
+            over_button = index.isValid() and self.button_at(self.view.visualRect(index), index, pos)
+            obj.setCursor(QCursor(Qt.CursorShape.PointingHandCursor if over_button else Qt.CursorShape.ArrowCursor))
+        return False
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            key = self.button_at(option.rect, index, event.position().toPoint())
+            if key:
+                self.button_clicked.emit(key, index.data(Qt.ItemDataRole.UserRole))
+                return True
+        return super().editorEvent(event, model, option, index)
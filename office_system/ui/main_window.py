@@ -0,0 +1,88 @@
+import importlib
+import time
+
+from PyQt6.QtWidgets import QStackedWidget, QMainWindow
+
+from office_system.ui.tasks import ChangeWatcher
+from office_system.ui.auth import AuthWidget
+
+# Screens are imported and built on first navigation, so the login form does not wait for them.
+SCREENS = {
+    'employee': ('office_system.ui.employee', 'EmployeeWidget'),
+    'tech_support': ('office_system.ui.tech_support', 'TechSupportWidget'),
+    'tech_admin': ('office_system.ui.tech_admin', 'TechAdminManagementWidget'),
+}
+
+
+class MainWindow(QMainWindow):
+    def __init__(self, db, executor):
+        super().__init__()
+        self.db = db
+        self.executor = executor
+        self.setWindowTitle("Система 'Учет'")
+        self.stacked_widget = QStackedWidget()
+        self.setCentralWidget(self.stacked_widget)
+        self.auth_widget = AuthWidget(db, executor)
+        self.stacked_widget.addWidget(self.auth_widget)
+        self.screens = {}
+        self.auth_widget.login_successful.connect(self.handle_successful_login)
+        self.auth_widget.admin_login_successful.connect(self.show_admin_panel)
+        self.auth_widget.registration_successful.connect(self.handle_successful_registration)
+        self.watcher = ChangeWatcher(db, parent=self)
+        self.watcher.changed.connect(self.dispatch_changes)
+        self.watcher.reset.connect(self.reload_current)
+        self.handle_logout()
+
+    def screen(self, name):
+        widget = self.screens.get(name)
+        if widget is None:
+            module, class_name = SCREENS[name]
+            started = time.perf_counter()
+            widget = getattr(importlib.import_module(module), class_name)(self.db, self.executor)
+            if self.db.metrics:
+                self.db.metrics.observe(f"ui.build.{name}", time.perf_counter() - started)
+            widget.logout_requested.connect(self.handle_logout)
+            self.stacked_widget.addWidget(widget)
+            self.screens[name] = widget
+        return widget
+
+    def handle_successful_login(self, user_data):
+        self.auth_widget.clear_input_fields()
+        if user_data['role'] == 'Техник':
+            widget = self.screen('tech_support')
+            self.setFixedSize(700, 720);
+        else:
+            widget = self.screen('employee')
+            self.setFixedSize(700, 650);
+        widget.set_user_data(user_data);
+        self.stacked_widget.setCurrentWidget(widget)
+        self.watcher.start()
+
+    def show_admin_panel(self):
+        widget = self.screen('tech_admin')
+        self.auth_widget.clear_input_fields();
+        self.setFixedSize(700, 750);
+        widget.load_content();
+        self.stacked_widget.setCurrentWidget(widget)
+        self.watcher.start()
+
+    def dispatch_changes(self, changes):
+        widget = self.stacked_widget.currentWidget()
+        if widget is not self.auth_widget:
+            widget.apply_changes(changes)
+
+    def reload_current(self):
+        widget = self.stacked_widget.currentWidget()
+        if widget is not self.auth_widget:
+            widget.load_content()
+
+    def handle_successful_registration(self, message):
+        self.auth_widget.show_login_with_message(message)
+
+    def handle_logout(self):
+        self.watcher.stop()
+        for widget in self.screens.values():
+            widget.cancel_pending()
+        self.auth_widget.clear_input_fields();
+        self.setFixedSize(450, 600);
+        self.stacked_widget.setCurrentWidget(self.auth_widget)
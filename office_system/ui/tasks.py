@@ -0,0 +1,166 @@
+import time
+
+from PyQt6.QtCore import QObject, QThreadPool, QTimer, Qt, pyqtSignal
+
+
+class DbTask(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    done = pyqtSignal()
+    progressed = pyqtSignal(object)
+    completed = pyqtSignal(bool, object)
+    reported = pyqtSignal(object)
+
+    def __init__(self, fn, args, kwargs):
+        super().__init__()
+        self.fn, self.args, self.kwargs = fn, args, kwargs
+        self.cancelled = False
+        self.completed.connect(self.deliver)
+        self.reported.connect(self.deliver_progress)
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        if self.cancelled:
+            self.completed.emit(False, None)
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.completed.emit(False, e)
+        else:
+            self.completed.emit(True, result)
+
+    def deliver(self, ok, value):
+        if not self.cancelled:
+            (self.finished if ok else self.failed).emit(value)
+        self.done.emit()
+
+    def deliver_progress(self, value):
+        if not self.cancelled:
+            self.progressed.emit(value)
+
+
+class DbExecutor(QObject):
+    def __init__(self, max_threads=2, parent=None):
+        super().__init__(parent)
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max_threads)
+        self.thread_pool.setExpiryTimeout(-1)
+        self.tasks = set()
+
+    def submit(self, fn, *args, report_progress=False, **kwargs):
+        task = DbTask(fn, args, kwargs)
+        if report_progress:
+            task.kwargs['progress'] = task.reported.emit
+        self.tasks.add(task)
+        task.done.connect(lambda: self.tasks.discard(task))
+        self.thread_pool.start(task.run)
+        return task
+
+    def shutdown(self):
+        for task in self.tasks:
+            task.cancel()
+        self.thread_pool.waitForDone()
+
+
+class ChangeWatcher(QObject):
+    changed = pyqtSignal(object)
+    reset = pyqtSignal()
+
+    def __init__(self, db, interval=250, parent=None):
+        super().__init__(parent)
+        self.db = db
+        # Polls stay off the GUI thread, on one thread of their own: PRAGMA data_version is counted per connection
+        # and the pool gives each thread its own. That thread never writes, so every commit of the app moves it.
+        self.executor = DbExecutor(max_threads=1, parent=self)
+        self.seq = None
+        self.version = None
+        self.task = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.check)
+
+    def start(self):
+        # seq and version survive a logout: the first poll after the next login catches up on what other processes
+        # committed meanwhile, so their changes reach forget_changes() and the query cache forgets them.
+        self.stop()
+        self.timer.start()
+        self.check()
+
+    def stop(self):
+        self.timer.stop()
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def shutdown(self):
+        self.stop()
+        self.executor.shutdown()
+
+    def check(self):
+        if self.task is not None:
+            return
+        self.task = self.executor.submit(self.poll, self.seq, self.version)
+        self.task.finished.connect(self.deliver)
+        self.task.failed.connect(self.poll_failed)
+        task = self.task
+        self.task.done.connect(lambda: self.task_done(task))
+
+    def poll(self, seq, version):
+        # PRAGMA data_version only moves when another connection commits, so an idle tick costs one pragma.
+        current = self.db.data_version()
+        if seq is None:
+            # The very first poll: the screens have just loaded, so only what is committed from now on is news.
+            return self.db.latest_change(), current, []
+        if current == version:
+            return seq, version, []
+        latest, changes = self.db.changes_since(seq)
+        self.db.forget_changes(changes)
+        return latest, current, changes
+
+    def poll_failed(self, error):
+        # Neither seq nor the version moved, so the next tick asks for the same changes again; while the server is
+        # unreachable, that is one failed request per tick and the screens keep what they show.
+        pass
+
+    def task_done(self, task):
+        if self.task is task:
+            self.task = None
+
+    def deliver(self, result):
+        self.seq, self.version, changes = result
+        if changes is None:
+            self.reset.emit()
+        elif changes:
+            self.changed.emit(changes)
+
+
+class StallDetector(QObject):
+    """Records how late a steady heartbeat fires; a late tick means the GUI thread was busy for that long."""
+
+    def __init__(self, metrics, interval=50, threshold=0.1, parent=None):
+        super().__init__(parent)
+        self.metrics = metrics
+        self.interval = interval / 1000
+        self.threshold = threshold
+        self.last = None
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        self.last = time.perf_counter()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def tick(self):
+        now = time.perf_counter()
+        late = now - self.last - self.interval
+        self.last = now
+        if late >= self.threshold:
+            self.metrics.stall(late)
@@ -0,0 +1,121 @@
+from PyQt6.QtWidgets import QLabel, QLineEdit, QPushButton, QVBoxLayout, QFrame, QMessageBox
+from PyQt6.QtGui import QCursor
+from PyQt6.QtCore import Qt
+
+from office_system.ui.lists import RowListModel, RowDelegate
+from office_system.ui.base import BaseWidget
+from office_system.ui.theme import font, set_tone
+
+
+class TechUserDelegate(RowDelegate):
+    def info(self, row):
+        return row[2], f" ({row[1]}) - {row[3]}"
+
+    def buttons(self, row):
+        return [("delete", "Удалить", "#c0392b", True)]
+
+
+class TechAdminManagementWidget(BaseWidget):
+    def __init__(self, db, executor):
+        super().__init__(db, executor)
+        self.title_label.setText("Администрирование техников")
+        self.setup_content_ui()
+
+    def setup_content_ui(self):
+        content_layout = QVBoxLayout(self.content_widget)
+        content_layout.setContentsMargins(0, 0, 0, 0);
+        content_layout.setSpacing(15)
+        creation_frame = QFrame();
+        creation_frame.setProperty('role', 'panel')
+        creation_layout = QVBoxLayout(creation_frame)
+        title = QLabel("Создание учетной записи техника");
+        title.setFont(font(14, bold=True));
+        title.setProperty('role', 'caption');
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.username_edit = QLineEdit();
+        self.username_edit.setPlaceholderText("Логин");
+        self.username_edit.setProperty('role', 'form-input')
+        self.password_edit = QLineEdit();
+        self.password_edit.setPlaceholderText("Пароль");
+        self.password_edit.setEchoMode(QLineEdit.EchoMode.Password);
+        self.password_edit.setProperty('role', 'form-input')
+        self.fullname_edit = QLineEdit();
+        self.fullname_edit.setPlaceholderText("ФИО");
+        self.fullname_edit.setProperty('role', 'form-input')
+        self.email_edit = QLineEdit();
+        self.email_edit.setPlaceholderText("Электронная почта");
+        self.email_edit.setProperty('role', 'form-input')
+        self.message_label = QLabel("");
+        self.message_label.setProperty('role', 'message');
+        self.message_label.setProperty('tone', 'info');
+        self.message_label.setAlignment(Qt.AlignmentFlag.AlignCenter);
+        self.message_label.setFixedHeight(20)
+        create_btn = QPushButton("Создать пользователя");
+        create_btn.setFixedHeight(45);
+        create_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor));
+        create_btn.setProperty('variant', 'create');
+        create_btn.clicked.connect(self.create_tech_user)
+        creation_layout.addWidget(title);
+        creation_layout.addWidget(self.fullname_edit);
+        creation_layout.addWidget(self.email_edit);
+        creation_layout.addWidget(self.username_edit);
+        creation_layout.addWidget(self.password_edit);
+        creation_layout.addWidget(create_btn);
+        creation_layout.addWidget(self.message_label)
+        list_label = QLabel("Существующие техники:");
+        list_label.setFont(font(12, bold=True));
+        list_label.setProperty('role', 'caption');
+        list_label.setContentsMargins(0, 10, 0, 0)
+        self.tech_model = RowListModel("Нет созданных техников", self)
+        self.tech_list = self.create_list_view(self.tech_model, TechUserDelegate)
+        content_layout.addWidget(creation_frame);
+        content_layout.addWidget(list_label);
+        content_layout.addWidget(self.tech_list)
+
+    def load_content(self):
+        self.run(self.db.get_all_technicians, on_result=self.tech_model.set_rows, key='load')
+
+    def apply_changes(self, changes):
+        if any(table == 'users' for _, table, _, _, _ in changes):
+            self.load_content()
+
+    def handle_row_action(self, action, tech_data):
+        if action == "delete":
+            self.delete_user(tech_data[0])
+
+    def delete_user(self, tech_id):
+        reply = QMessageBox.question(self, 'Подтверждение', f"Вы уверены, что хотите удалить этого техника?",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                     QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes:
+            self.run(self.db.delete_user, tech_id, on_result=lambda deleted: self.user_deleted(tech_id, deleted))
+
+    def user_deleted(self, tech_id, deleted):
+        if deleted:
+            self.tech_model.remove_row(tech_id)
+        else:
+            QMessageBox.critical(self, "Ошибка", "Не удалось удалить пользователя.")
+
+    def create_tech_user(self):
+        username = self.username_edit.text().strip();
+        password = self.password_edit.text();
+        full_name = self.fullname_edit.text().strip();
+        email = self.email_edit.text().strip()
+        if not all([username, password, full_name, email]): set_tone(
+            self.message_label, 'warning'); self.message_label.setText("Пожалуйста, заполните все поля."); return
+        self.run(self.db.create_user, username, password, full_name, email, 'Техник',
+                 on_result=lambda user_id: self.tech_user_created(user_id, username, full_name, email))
+
+    def tech_user_created(self, user_id, username, full_name, email):
+        if user_id:
+            self.tech_model.merge_row((user_id, username, full_name, email))
+            set_tone(self.message_label, 'success');
+            self.message_label.setText(f"Пользователь '{username}' успешно создан!")
+            self.username_edit.clear();
+            self.password_edit.clear();
+            self.fullname_edit.clear();
+            self.email_edit.clear()
+        else:
+            set_tone(self.message_label, 'error');
+            self.message_label.setText(
+                f"Имя пользователя или email уже заняты.")
@@ -0,0 +1,434 @@
+import os
+from PyQt6.QtWidgets import (
+    QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QComboBox, QMessageBox, QInputDialog, QAbstractItemView,
+    QFileDialog, QTabWidget, QCheckBox, QDateEdit
+)
+from PyQt6.QtGui import QCursor, QPainter, QPolygonF
+from PyQt6.QtCore import Qt, QDate, QRect, QRectF, QPointF, pyqtSignal
+
+from office_system.db import ACTIVE_STATUSES, EXPORT_WRITERS, STATUS_NAMES
+from office_system.ui.lists import PagedRowListModel, RowDelegate
+from office_system.ui.base import BaseWidget
+from office_system.ui.theme import color, font, set_tone
+
+
+class RequestDelegate(RowDelegate):
+    row_height = 70
+
+    def info(self, row):
+        return row[1], f": {row[2]} (ID: {row[3]})" + (f" → {row[6]}" if row[6] else "")
+
+    def info_rect(self, rect):
+        return QRect(rect.left() + 10, rect.top(), rect.width() - 10, rect.height() // 2)
+
+    def buttons_rect(self, rect):
+        return QRect(rect.left(), rect.top() + rect.height() // 2, rect.width() - 8, rect.height() // 2)
+
+    def buttons(self, row):
+        if row[4] == 'Принята':
+            return [("complete", "Завершить", "#2980b9", True)]
+        return [("accept", "Принять", "#27ae60", True), ("reject", "Отклонить", "#c0392b", True)]
+
+
+class BacklogChart(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.points = []
+        self.setMinimumHeight(120)
+
+    def set_points(self, points):
+        self.points = points
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillRect(self.rect(), color("#ecf0f1"))
+        area = QRectF(self.rect().adjusted(40, 10, -10, -20))
+        if not self.points:
+            painter.setPen(color("#7f8c8d"))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "Нет данных за период")
+            return
+        top = max(max(value for _, value in self.points), 1)
+        step = area.width() / max(len(self.points) - 1, 1)
+        polygon = QPolygonF([QPointF(area.left() + i * step, area.bottom() - area.height() * max(value, 0) / top)
+                             for i, (_, value) in enumerate(self.points)])
+        painter.setPen(color("#7f8c8d"))
+        painter.drawText(QRectF(0, area.top() - 6, 36, 12), Qt.AlignmentFlag.AlignRight, str(top))
+        painter.drawText(QRectF(0, area.bottom() - 6, 36, 12), Qt.AlignmentFlag.AlignRight, "0")
+        painter.drawText(QRectF(area.left(), area.bottom() + 4, area.width(), 14), Qt.AlignmentFlag.AlignLeft,
+                         self.points[0][0])
+        painter.drawText(QRectF(area.left(), area.bottom() + 4, area.width(), 14), Qt.AlignmentFlag.AlignRight,
+                         self.points[-1][0])
+        painter.setPen(color("#2980b9"))
+        painter.drawPolyline(polygon)
+
+
+class AnalyticsPanel(QWidget):
+    period_changed = pyqtSignal(object)
+    periods = [("7 дней", 7), ("30 дней", 30), ("90 дней", 90), ("Год", 365), ("Все время", None)]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 10, 0, 0);
+        layout.setSpacing(8)
+        period_layout = QHBoxLayout()
+        period_label = QLabel("Период:");
+        period_label.setProperty('role', 'caption')
+        self.period_combo = QComboBox();
+        self.period_combo.addItems([title for title, _ in self.periods]);
+        self.period_combo.setCurrentIndex(1);
+        self.period_combo.setProperty('role', 'filter')
+        self.period_combo.currentIndexChanged.connect(lambda i: self.period_changed.emit(self.periods[i][1]))
+        period_layout.addWidget(period_label);
+        period_layout.addWidget(self.period_combo);
+        period_layout.addStretch()
+        self.resolution_label = self.create_table_label()
+        self.backlog_chart = BacklogChart()
+        self.technicians_label = self.create_table_label()
+        layout.addLayout(period_layout)
+        for title, widget in [("Время решения по типам оборудования", self.resolution_label),
+                              ("Активные заявки", self.backlog_chart),
+                              ("Работа техников", self.technicians_label)]:
+            label = QLabel(title);
+            label.setFont(font(11, bold=True));
+            label.setProperty('role', 'caption')
+            layout.addWidget(label);
+            layout.addWidget(widget)
+        layout.addStretch()
+
+    def create_table_label(self):
+        label = QLabel();
+        label.setTextFormat(Qt.TextFormat.RichText);
+        label.setProperty('role', 'table')
+        return label
+
+    def days(self):
+        return self.periods[self.period_combo.currentIndex()][1]
+
+    def table(self, header, rows):
+        if not rows:
+            return "<i>Нет данных за период</i>"
+        cells = "".join(f"<th align='left'>{title}</th>" for title in header)
+        body = "".join("<tr>" + "".join(f"<td>{value}</td>" for value in row) + "</tr>" for row in rows)
+        return f"<table cellspacing='0' cellpadding='3' width='100%'><tr>{cells}</tr>{body}</table>"
+
+    def show_summary(self, summary):
+        def hours(seconds):
+            return "—" if seconds is None else f"{seconds / 3600:.1f} ч"
+
+        self.resolution_label.setText(self.table(
+            ["Тип", "Завершено", "Среднее", "Медиана", "90%"],
+            [(equipment_type, resolved, hours(mean), hours(p50), hours(p90))
+             for equipment_type, resolved, mean, p50, p90 in summary['resolution_times']]))
+        self.backlog_chart.set_points(summary['backlog'])
+        self.technicians_label.setText(self.table(
+            ["Техник", "Принято", "Отклонено", "Завершено"], summary['technicians']))
+
+
+class ExportPanel(QWidget):
+    export_requested = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 10, 0, 0);
+        layout.setSpacing(10)
+        title = QLabel("Выгрузка истории заявок в CSV или XLSX");
+        title.setFont(font(11, bold=True));
+        title.setProperty('role', 'caption')
+        date_layout = QHBoxLayout()
+        self.all_time_check = QCheckBox("За все время");
+        self.all_time_check.setProperty('role', 'caption');
+        self.all_time_check.setChecked(True)
+        date_layout.addWidget(self.all_time_check)
+        self.date_edits = []
+        for text, value in [("с", QDate.currentDate().addMonths(-1)), ("по", QDate.currentDate())]:
+            label = QLabel(text);
+            label.setProperty('role', 'caption')
+            edit = QDateEdit(value);
+            edit.setCalendarPopup(True);
+            edit.setEnabled(False);
+            edit.setProperty('role', 'filter')
+            date_layout.addWidget(label);
+            date_layout.addWidget(edit)
+            self.date_edits.append(edit)
+        date_layout.addStretch()
+        self.all_time_check.toggled.connect(lambda checked: [edit.setEnabled(not checked) for edit in self.date_edits])
+        status_layout = QHBoxLayout()
+        self.status_checks = {}
+        for status in STATUS_NAMES.values():
+            check = QCheckBox(status);
+            check.setProperty('role', 'caption');
+            check.setChecked(True)
+            status_layout.addWidget(check)
+            self.status_checks[status] = check
+        status_layout.addStretch()
+        self.export_btn = QPushButton("Выгрузить...");
+        self.export_btn.setFixedHeight(35);
+        self.export_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor));
+        self.export_btn.setProperty('variant', 'export')
+        self.export_btn.clicked.connect(self.export_requested.emit)
+        self.progress_label = QLabel("");
+        self.progress_label.setProperty('tone', 'muted')
+        for item in [title, date_layout, status_layout, self.export_btn, self.progress_label]:
+            if isinstance(item, QHBoxLayout):
+                layout.addLayout(item)
+            else:
+                layout.addWidget(item)
+        layout.addStretch()
+
+    def filters(self):
+        start = end = None
+        if not self.all_time_check.isChecked():
+            start, end = (edit.date().toPyDate() for edit in self.date_edits)
+        statuses = [status for status, check in self.status_checks.items() if check.isChecked()]
+        return start, end, None if len(statuses) == len(self.status_checks) else statuses
+
+    def show_progress(self, exported):
+        set_tone(self.progress_label, 'muted')
+        self.progress_label.setText(f"Выгружено строк: {exported:,}".replace(",", " "))
+
+    def show_result(self, text, ok=True):
+        set_tone(self.progress_label, 'success' if ok else 'error')
+        self.progress_label.setText(text)
+
+
+class TechSupportWidget(BaseWidget):
+    def __init__(self, db, executor):
+        super().__init__(db, executor)
+        self.analytics_generation = 0
+        self.setup_content_ui()
+
+    def setup_content_ui(self):
+        queue_tab = QWidget()
+        content_layout = QVBoxLayout(queue_tab)
+        content_layout.setContentsMargins(0, 10, 0, 0);
+        content_layout.setSpacing(15)
+        requests_label = QLabel("Активные заявки на замену:");
+        requests_label.setFont(font(14, bold=True));
+        requests_label.setProperty('role', 'caption')
+        self.requests_model = PagedRowListModel("Нет активных заявок", self.db.get_active_requests_page,
+                                                page_key=lambda row: (row[5], row[0]), run=self.run,
+                                                parent=self)
+        self.requests_list = self.create_list_view(
+            self.requests_model, RequestDelegate,
+            selection_mode=QAbstractItemView.SelectionMode.ExtendedSelection)
+        batch_layout = QHBoxLayout()
+        batch_label = QLabel("С выбранными:");
+        batch_label.setProperty('role', 'caption')
+        batch_layout.addWidget(batch_label)
+        batch_layout.addStretch()
+        for text, status, handler in [("Принять", "Принята", self.accept_selected),
+                                      ("Отклонить", "Отклонена", self.reject_selected),
+                                      ("Завершить", "Завершена", self.complete_selected)]:
+            button = QPushButton(text);
+            button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor));
+            button.setProperty('variant', 'batch');
+            button.setProperty('status', status);
+            button.clicked.connect(handler)
+            batch_layout.addWidget(button)
+        queue_layout = QHBoxLayout()
+        self.mine_check = QCheckBox("Только мои");
+        self.mine_check.setProperty('role', 'caption');
+        self.mine_check.toggled.connect(lambda checked: self.load_requests())
+        queue_layout.addWidget(self.mine_check)
+        queue_layout.addStretch()
+        for text, handler in [("Взять следующую", self.claim_next), ("Распределить", self.schedule_requests)]:
+            button = QPushButton(text);
+            button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor));
+            button.setProperty('variant', 'queue');
+            button.clicked.connect(handler)
+            queue_layout.addWidget(button)
+        search_field = self.create_search_field("Поиск по сотруднику, email, типу или инвентарному ID")
+        content_layout.addWidget(requests_label);
+        content_layout.addLayout(queue_layout);
+        content_layout.addWidget(search_field);
+        content_layout.addLayout(batch_layout);
+        content_layout.addWidget(self.requests_list)
+        self.analytics_panel = AnalyticsPanel()
+        self.analytics_panel.period_changed.connect(lambda days: self.load_analytics())
+        self.tabs = QTabWidget()
+        self.tabs.setObjectName("sectionTabs")
+        self.tabs.addTab(queue_tab, "Очередь")
+        self.tabs.addTab(self.analytics_panel, "Аналитика")
+        self.export_panel = ExportPanel()
+        self.export_panel.export_requested.connect(self.handle_export)
+        self.tabs.addTab(self.export_panel, "Выгрузка")
+        self.tabs.currentChanged.connect(lambda index: self.load_analytics())
+        tabs_layout = QVBoxLayout(self.content_widget)
+        tabs_layout.setContentsMargins(0, 0, 0, 0)
+        tabs_layout.addWidget(self.tabs)
+
+    def load_content(self):
+        if not self.analytics_shown():
+            self.load_requests()
+            return
+        # The list and the summary in one round trip when the database is a server.
+        call, show_rows = self.requests_call()
+        self.run_with_analytics(call, show_rows)
+
+    def requests_call(self):
+        """Starts a reload of the request list; returns the (method name, args) call that fills it and its rows' handler."""
+        text = self.search_text()
+        if text:
+            self.requests_model.empty_text = "Ничего не найдено"
+            return ('search_active_requests', (text,)), self.requests_model.start_results()
+        if self.mine_check.isChecked():
+            self.requests_model.empty_text = "Вам не назначено заявок"
+            return ('get_assigned_requests', (self.user_data['id'],)), self.requests_model.start_results()
+        self.requests_model.empty_text = "Нет активных заявок"
+        return ('get_active_requests_page', (None, self.requests_model.page_size)), self.requests_model.start_reload()
+
+    def load_requests(self):
+        (method, args), show_rows = self.requests_call()
+        self.run(getattr(self.db, method), *args, key='load', on_result=show_rows)
+
+    def search_changed(self):
+        self.load_requests()
+
+    def analytics_shown(self):
+        return self.tabs.currentWidget() is self.analytics_panel
+
+    def start_analytics(self):
+        # A summary from an older period or load must not replace a newer one; batches are not cancelled by key.
+        self.analytics_generation += 1
+        generation = self.analytics_generation
+
+        def show_summary(summary):
+            if generation == self.analytics_generation:
+                self.analytics_panel.show_summary(summary)
+        return show_summary
+
+    def load_analytics(self):
+        if not self.analytics_shown(): return
+        self.run(self.db.analytics.summary, self.analytics_panel.days(), key='analytics',
+                 on_result=self.start_analytics())
+
+    def run_with_analytics(self, call, on_result):
+        show_summary = self.start_analytics()
+        self.run(self.db.batch, [call, ('analytics.summary', (self.analytics_panel.days(),))],
+                 on_result=lambda results: (on_result(results[0]), show_summary(results[1])))
+
+    def handle_export(self):
+        start, end, statuses = self.export_panel.filters()
+        if statuses == []: QMessageBox.information(self, "Выгрузка", "Выберите хотя бы один статус."); return
+        if start and end and start > end: QMessageBox.warning(self, "Выгрузка", "Начало периода позже конца."); return
+        path, selected = QFileDialog.getSaveFileName(self, "Выгрузка истории заявок", "requests.xlsx",
+                                                     "Excel (*.xlsx);;CSV (*.csv)")
+        if not path: return
+        if os.path.splitext(path)[1].lower() not in EXPORT_WRITERS:
+            path += '.csv' if selected.startswith('CSV') else '.xlsx'
+        self.export_panel.show_progress(0)
+        self.run(self.db.export_request_history, path, start, end, statuses, key='export',
+                 on_progress=self.export_panel.show_progress,
+                 on_result=lambda exported: self.export_panel.show_result(
+                     f"Готово: {exported:,} строк в {os.path.basename(path)}".replace(",", " ")),
+                 on_error=lambda error: self.export_panel.show_result(f"Ошибка выгрузки: {error}", ok=False))
+
+    def handle_row_action(self, action, request_data):
+        if action == "accept":
+            self.accept_request(request_data[0])
+        elif action == "reject":
+            self.reject_request(request_data[0])
+        elif action == "complete":
+            self.complete_request(request_data[0])
+
+    def apply_request_change(self, request_id, row):
+        if row and row[4] in ACTIVE_STATUSES:
+            self.requests_model.update_row(row)
+        else:
+            self.requests_model.remove_row(request_id)
+
+    def apply_request_changes(self, request_ids, rows):
+        active = [row for row in rows if row[4] in ACTIVE_STATUSES]
+        for row in active:
+            self.requests_model.merge_row(row)
+        self.requests_model.remove_rows(set(request_ids) - {row[0] for row in active})
+
+    def apply_changes(self, changes):
+        request_ids = {row_id for _, table, row_id, _, _ in changes if table == 'requests'}
+        if request_ids:
+            if self.search_text() or self.mine_check.isChecked():
+                self.load_content()
+                return
+            merge = lambda rows: self.apply_request_changes(request_ids, rows)
+            if self.analytics_shown():
+                self.run_with_analytics(('get_requests', (request_ids,)), merge)
+            else:
+                self.run(self.db.get_requests, request_ids, on_result=merge)
+
+    def claim_next(self):
+        self.run(self.db.claim_next_request, self.user_data['id'], on_result=self.show_claimed)
+
+    def show_claimed(self, row):
+        if row is None: QMessageBox.information(self, "Заявки", "Свободных заявок нет."); return
+        if self.search_text() or self.mine_check.isChecked():
+            self.load_requests()
+        else:
+            self.requests_model.merge_row(row)
+
+    def schedule_requests(self):
+        self.run(self.db.schedule_requests, on_result=lambda assigned: QMessageBox.information(
+            self, "Заявки", f"Распределено заявок: {assigned}." if assigned else "Нечего распределять."))
+
+    def selected_requests(self, status):
+        rows = (index.data(Qt.ItemDataRole.UserRole) for index in self.requests_list.selectionModel().selectedIndexes())
+        return [row for row in rows if row and row[4] == status]
+
+    def set_selected_status(self, new_status):
+        request_ids = [row[0] for row in self.selected_requests('В ожидании')]
+        if not request_ids: QMessageBox.information(self, "Заявки", "Выберите заявки в ожидании."); return
+        self.run(self.db.update_request_statuses, request_ids, new_status, self.user_data['id'],
+                 on_result=lambda rows: self.apply_request_changes(request_ids, rows))
+
+    def accept_selected(self):
+        self.set_selected_status("Принята")
+
+    def reject_selected(self):
+        self.set_selected_status("Отклонена")
+
+    def complete_selected(self):
+        selected = self.selected_requests('Принята')
+        if not selected: QMessageBox.information(self, "Заявки", "Выберите принятые заявки."); return
+        text, ok = QInputDialog.getMultiLineText(
+            self, "Завершение заявок", "Укажите новый ID оборудования для каждой заявки (номер заявки = новый ID):",
+            "\n".join(f"{row[0]} = " for row in selected))
+        if not ok: return
+        allowed = {row[0] for row in selected}
+        resolutions = []
+        for line in text.splitlines():
+            if not line.strip(): continue
+            request_part, _, new_id_part = line.partition("=")
+            try:
+                request_id, new_id = int(request_part), int(new_id_part)
+            except ValueError:
+                QMessageBox.warning(self, "Ошибка", f"Некорректная строка: {line.strip()}");
+                return
+            if request_id in allowed: resolutions.append((request_id, new_id))
+        if not resolutions: return
+        request_ids = [request_id for request_id, _ in resolutions]
+        self.run(self.db.resolve_requests, resolutions, self.user_data['id'],
+                 on_result=lambda rows: self.apply_request_changes(request_ids, rows))
+
+    def accept_request(self, request_id):
+        self.run(self.db.update_request_status, request_id, "Принята", self.user_data['id'],
+                 on_result=lambda row: self.apply_request_change(request_id, row))
+
+    def reject_request(self, request_id):
+        self.run(self.db.update_request_status, request_id, "Отклонена", self.user_data['id'],
+                 on_result=lambda row: self.apply_request_change(request_id, row))
+
+    def complete_request(self, request_id):
+        new_id_str, ok = QInputDialog.getText(self, "Завершение заявки", "Введите новый ID")
+        if not ok: return
+        new_id_str = new_id_str.strip()
+        if not new_id_str: QMessageBox.warning(self, "Ошибка", "Поле нового ID не может быть пустым."); return
+        try:
+            new_id = int(new_id_str)
+        except ValueError:
+            QMessageBox.warning(self, "Ошибка", "ID оборудования должен быть числом.");
+            return
+        self.run(self.db.resolve_request, request_id, new_id, self.user_data['id'],
+                 on_result=lambda row: self.apply_request_change(request_id, row))
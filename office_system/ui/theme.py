@@ -0,0 +1,85 @@
+from functools import lru_cache
+
+from PyQt6.QtGui import QColor, QFont
+
+STATUS_COLORS = {"В ожидании": "#e67e22", "Принята": "#27ae60", "Отклонена": "#c0392b", "Завершена": "#2980b9"}
+
+# One stylesheet for the whole application. Widgets pick their look through object names and the
+# `role`, `variant`, `status` and `tone` properties, so Qt parses the rules once instead of once per widget.
+APP_STYLESHEET = """
+QWidget[screen="auth"] { background-color: #f2f3f5; }
+QFrame[role="card"] { background: white; border-radius: 12px; }
+QLabel[role="card-title"] { color: #333; }
+QLabel[role="notice"] { font-size: 9pt; }
+QWidget[screen="auth"] QLabel[tone="success"] { color: #27ae60; }
+QLineEdit[role="auth-field"] { background: #fff; border: 1px solid #ddd; border-radius: 8px; padding: 10px 12px; font-size: 11pt; color: #000000; }
+QLineEdit[role="auth-field"]:focus { border: 1px solid #4A90E2; }
+
+QWidget[screen="main"] { background-color: #2c3e50; }
+QLabel#screenTitle { color: #ecf0f1; }
+QLabel#loadingLabel { color: #bdc3c7; font-size: 9pt; }
+QFrame[role="panel"] { background-color: #34495e; border-radius: 8px; padding: 15px; }
+QLabel[role="caption"], QCheckBox[role="caption"] { color: #ecf0f1; background: transparent; }
+QLabel[role="message"] { font-size: 10pt; background: transparent; }
+QLabel[role="table"] { background-color: #ecf0f1; color: #000000; border-radius: 8px; padding: 8px; }
+QListView#rowList { background-color: #ecf0f1; border-radius: 8px; padding: 10px; }
+QLineEdit[role="input"], QComboBox[role="input"] { font-size: 11pt; padding: 5px; color: #000000; background-color: #ffffff; border-radius: 3px; }
+QLineEdit[role="form-input"] { font-size: 11pt; padding: 10px; border-radius: 5px; color: #000000; background-color: #ffffff; }
+QComboBox[role="filter"], QDateEdit[role="filter"] { font-size: 10pt; padding: 3px; color: #000000; background-color: #ffffff; border-radius: 3px; }
+QTabWidget#sectionTabs::pane { border: none; }
+QTabWidget#sectionTabs QTabBar::tab { background: #34495e; color: #ecf0f1; padding: 6px 16px; border-radius: 3px; margin-right: 4px; }
+QTabWidget#sectionTabs QTabBar::tab:selected { background: #2980b9; }
+
+QLabel[tone="info"] { color: #ecf0f1; }
+QLabel[tone="muted"] { color: #bdc3c7; }
+QLabel[tone="success"] { color: #2ecc71; }
+QLabel[tone="warning"] { color: #f1c40f; }
+QLabel[tone="error"] { color: #e74c3c; }
+
+QPushButton[variant] { color: white; border: none; }
+QPushButton[variant]:disabled { background-color: #95a5a6; }
+QPushButton[variant="login"], QPushButton[variant="register"], QPushButton[variant="create"], QPushButton[variant="logout"] { font-weight: bold; border-radius: 8px; font-size: 12pt; }
+QPushButton[variant="login"] { background-color: #4A90E2; }
+QPushButton[variant="login"]:hover { background-color: #357ABD; }
+QPushButton[variant="register"] { background-color: #5cb85c; }
+QPushButton[variant="register"]:hover { background-color: #4cae4c; }
+QPushButton[variant="create"] { background-color: #2ecc71; }
+QPushButton[variant="create"]:hover { background-color: #27ae60; }
+QPushButton[variant="logout"] { background-color: #e74c3c; font-size: 14pt; }
+QPushButton[variant="logout"]:hover { background-color: #c0392b; }
+QPushButton[variant="add"], QPushButton[variant="import"] { padding: 8px; border-radius: 5px; }
+QPushButton[variant="add"] { background-color: #2980b9; }
+QPushButton[variant="import"] { background-color: #16a085; }
+QPushButton[variant="export"] { background-color: #2980b9; font-weight: bold; border-radius: 5px; }
+QPushButton[variant="batch"] { padding: 5px 12px; border-radius: 3px; }
+QPushButton[variant="queue"] { background-color: #16a085; padding: 5px 12px; border-radius: 3px; }
+QPushButton[variant="queue"]:hover { background-color: #138d75; }
+QPushButton[variant="batch"][status="Принята"] { background-color: #27ae60; }
+QPushButton[variant="batch"][status="Отклонена"] { background-color: #c0392b; }
+QPushButton[variant="batch"][status="Завершена"] { background-color: #2980b9; }
+"""
+
+
+def apply_theme(app):
+    app.setStyleSheet(APP_STYLESHEET)
+
+
+@lru_cache(maxsize=None)
+def font(size, bold=False):
+    return QFont("Segoe UI", size, QFont.Weight.Bold if bold else QFont.Weight.Normal)
+
+
+@lru_cache(maxsize=None)
+def color(name):
+    return QColor(name)
+
+
+def status_color(status):
+    return color(STATUS_COLORS.get(status, "#000000"))
+
+
+def set_tone(label, tone):
+    """Switches a message label's colour; only this widget is re-polished, not the whole window."""
+    label.setProperty('tone', tone)
+    label.style().unpolish(label)
+    label.style().polish(label)